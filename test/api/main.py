@@ -1,14 +1,17 @@
-from fastapi import FastAPI, HTTPException
+import time
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from datetime import datetime
+from fastapi.responses import JSONResponse, PlainTextResponse
 import os
 from dotenv import load_dotenv
 
 from api.routes import analysis, patients, auth
 from api.models.schemas import HealthCheckResponse
-from api.services.analyzer import PostureAnalyzerService
-from api.services.database import DatabaseService
+from api.services.batch_jobs import BatchJobManager
+from api.services.health import HealthMonitor
+from api.services.batching import MicroBatcher
+from api.services.inference_pool import InferenceExecutor
+from api.services.metrics import Metrics
 
 load_dotenv()
 
@@ -26,11 +29,41 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    started = time.perf_counter()
+    response = await call_next(request)
+    # Label by route template (/api/analysis/jobs/{job_id}), not the raw path, to keep cardinality bounded
+    route = request.scope.get("route")
+    Metrics().request_seconds.observe(
+        time.perf_counter() - started,
+        method=request.method,
+        route=getattr(route, "path", "unmatched"),
+        status=response.status_code
+    )
+    return response
+
+
 app.include_router(analysis.router)
 app.include_router(patients.router)
 app.include_router(auth.router)
 
 
+@app.on_event("startup")
+async def start_background_services():
+    # Do not wait for the model: uvicorn binds immediately and /ready flips once workers are warm
+    InferenceExecutor().start_in_background()
+    HealthMonitor().start()
+    BatchJobManager().start()
+
+
+@app.on_event("shutdown")
+async def stop_background_services():
+    BatchJobManager().stop()
+    HealthMonitor().stop()
+    InferenceExecutor().shutdown()
+
+
 @app.get("/", response_model=dict)
 async def root():
     return {
@@ -41,22 +74,56 @@ async def root():
     }
 
 
-@app.get("/health", response_model=HealthCheckResponse)
-async def health_check():
-    analyzer = PostureAnalyzerService()
-    db = DatabaseService()
+@app.get("/live")
+async def liveness():
+    return {"status": "alive"}
 
-    model_loaded = analyzer.is_model_loaded()
-    db_connected = db.health_check()
 
-    return HealthCheckResponse(
-        status="healthy" if (model_loaded and db_connected) else "degraded",
-        timestamp=datetime.now(),
-        model_loaded=model_loaded,
-        database_connected=db_connected
+@app.get("/ready")
+async def readiness():
+    monitor = HealthMonitor()
+    snapshot = monitor.snapshot()
+    return JSONResponse(
+        status_code=200 if monitor.ready else 503,
+        content={
+            "ready": monitor.ready,
+            "model_state": snapshot["model_state"],
+            "database_connected": snapshot["database_connected"]
+        }
     )
 
 
+@app.get("/health", response_model=HealthCheckResponse)
+async def health_check():
+    return HealthCheckResponse(**HealthMonitor().snapshot())
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus text format: per-stage and per-route latency histograms plus current capacity gauges."""
+    executor = InferenceExecutor()
+    batcher = MicroBatcher()
+    cache = executor.cache.stats()
+    gauges = [
+        ("posture_model_ready", "gauge", "1 once inference workers are loaded and warm.", int(executor.model_loaded), {}),
+        ("posture_model_load_seconds", "gauge", "Time it took to load and warm up the model.", executor.model_load_seconds, {}),
+        ("posture_inference_workers", "gauge", "Configured inference worker processes.", executor.workers, {}),
+        ("posture_batch_jobs_active", "gauge", "Background batch jobs currently running.", BatchJobManager().active_jobs, {}),
+        ("posture_database_connected", "gauge", "1 if the last database check succeeded.", int(HealthMonitor().database_connected), {}),
+        ("posture_microbatch_queue_depth", "gauge", "Images waiting to be flushed to the inference pool.", batcher.queue_depth, {}),
+        ("posture_microbatch_in_flight", "gauge", "Images currently being analyzed by the inference pool.", batcher.in_flight, {}),
+        ("posture_microbatch_batches_total", "counter", "Micro-batches sent to the inference pool.", batcher.batches_run, {}),
+        ("posture_microbatch_images_total", "counter", "Images sent through the micro-batcher.", batcher.images_run, {}),
+        ("posture_inference_cache_hits_total", "counter", "Inference cache hits by level.", cache["memory_hits"], {"level": "memory"}),
+        ("posture_inference_cache_hits_total", "counter", "Inference cache hits by level.", cache["disk_hits"], {"level": "disk"}),
+        ("posture_inference_cache_misses_total", "counter", "Inference cache misses.", cache["misses"], {}),
+        ("posture_inference_cache_evictions_total", "counter", "Inference cache evictions (memory and disk).", cache["evictions"], {}),
+        ("posture_inference_cache_hit_ratio", "gauge", "Share of cache lookups served without running the model.", cache["hit_rate"], {}),
+        ("posture_inference_cache_memory_bytes", "gauge", "Bytes held by the in-memory cache level.", cache["memory_bytes"], {}),
+    ]
+    return PlainTextResponse(Metrics().render(gauges), media_type="text/plain; version=0.0.4")
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     return JSONResponse(
@@ -77,13 +77,18 @@ class AnalysisResult(BaseModel):
     keypoints: Optional[Dict]
     conversion_ratio: Optional[float]
     actual_height_mm: Optional[float]
-    skeleton_image: Optional[str] = None
+    skeleton_image_id: Optional[str] = None
+    skeleton_image_url: Optional[str] = None
+    trace: Optional[List[Dict]] = None
+    person_index: Optional[int] = None
+    bbox: Optional[Dict] = None
 
 
 class AnalysisResponse(BaseModel):
     success: bool
     message: str
     data: Optional[AnalysisResult] = None
+    profile: Optional[Dict] = None
 
 
 class BatchAnalysisRequest(BaseModel):
@@ -99,6 +104,25 @@ class BatchAnalysisResponse(BaseModel):
     results: List[AnalysisResult]
 
 
+class GroupAnalysisResponse(BaseModel):
+    success: bool
+    message: str
+    total_people: int
+    skeleton_image_id: Optional[str] = None
+    skeleton_image_url: Optional[str] = None
+    results: List[AnalysisResult]
+
+
+class SessionResponse(BaseModel):
+    success: bool
+    message: str
+    session_id: str
+    patient_name: str
+    created_at: datetime
+    summary: Optional[Dict] = None
+    views: Dict[str, AnalysisResult]
+
+
 class ErrorResponse(BaseModel):
     success: bool = False
     message: str
@@ -109,4 +133,6 @@ class HealthCheckResponse(BaseModel):
     status: str
     timestamp: datetime
     model_loaded: bool
+    model_state: Optional[str] = None
+    model_load_seconds: Optional[float] = None
     database_connected: bool
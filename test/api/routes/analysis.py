@@ -1,26 +1,62 @@
-from fastapi import APIRouter, File, UploadFile, Form, HTTPException
-from fastapi.responses import JSONResponse
-from typing import List
-import os
-import uuid
-from datetime import datetime
-import shutil
-import tempfile
+import asyncio
+import json
+from fastapi import APIRouter, File, UploadFile, Form, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
+from typing import Dict, List, Optional
 
 
 from api.models.schemas import (
     AnalysisResponse,
     AnalysisResult,
-    ErrorResponse
+    ErrorResponse,
+    GroupAnalysisResponse,
+    SessionResponse
 )
-from api.services.analyzer import PostureAnalyzerService
+from api.services.analyzer import ImageDecodeError
+from api.services.artifacts import ArtifactStore
+from api.services.batch_jobs import BatchJobManager
+from api.services.batching import MicroBatcher
 from api.services.database import DatabaseService
+from api.services.inference_pool import InferenceExecutor, ModelNotReadyError
+from api.services.metrics import Metrics, timed
+from api.utils.results import ANALYSIS_PREFIX, analysis_result, artifact_url
 
 
-router = APIRouter(prefix="/api/analysis", tags=["Analysis"])
+router = APIRouter(prefix=ANALYSIS_PREFIX, tags=["Analysis"])
 
-analyzer_service = PostureAnalyzerService()
+inference_executor = InferenceExecutor()
+micro_batcher = MicroBatcher()
 db_service = DatabaseService()
+artifact_store = ArtifactStore()
+batch_jobs = BatchJobManager()
+metrics = Metrics()
+
+
+def _get_or_create_patient(patient_name: str, height_cm: float) -> Dict:
+    patient = db_service.get_patient_by_name(patient_name)
+    if not patient:
+        patient = db_service.create_patient(patient_name, height_cm)
+    return patient
+
+
+def _store_analysis(patient_id: str, analysis_data: Dict, record_metrics: bool = True) -> Dict:
+    timings = analysis_data.setdefault('timings', {})
+    with timed(timings, 'db'):
+        analysis_record = db_service.create_analysis(patient_id, analysis_data)
+
+        if analysis_data.get('keypoints'):
+            db_service.save_keypoints(analysis_record["id"], analysis_data['keypoints'])
+
+    if record_metrics:
+        metrics.stage_seconds.observe(timings['db'], stage='db')
+    return analysis_record
+
+
+def _observe_serialize(seconds: float, analyses: int):
+    """Record the time spent building a multi-analysis response, split evenly per analysis."""
+    for _ in range(analyses):
+        metrics.stage_seconds.observe(seconds / analyses, stage='serialize')
 
 
 @router.post("/analyze", response_model=AnalysisResponse)
@@ -28,106 +64,394 @@ async def analyze_posture(
     image: UploadFile = File(...),
     patient_name: str = Form(...),
     height_cm: float = Form(...),
-    confidence_threshold: float = Form(0.25)
+    confidence_threshold: float = Form(0.25),
+    profile: bool = Form(False),
+    profile_calls: bool = Form(False),
+    trace: bool = Form(False)
 ):
-    upload_folder = tempfile.gettempdir()
-
+    """Analyze one image. `profile` adds a per-stage timing and peak memory report to the
+    response (`profile_calls` also adds a cProfile summary of the geometry calls).
+    `trace` adds the keypoint corrections and measurements logged by the geometry."""
+    try:
+        patient = await run_in_threadpool(_get_or_create_patient, patient_name, height_cm)
+        patient_id = patient["id"]
+        data = await image.read()
+
+        # Diagnostic runs are slowed down by tracing and cProfile: keep them out of /metrics
+        diagnostic = profile or profile_calls or trace
+        if diagnostic:
+            analysis_data = await inference_executor.profile(
+                data, patient_name, height_cm, confidence_threshold, calls=profile_calls, trace=trace
+            )
+        else:
+            analysis_data = await micro_batcher.submit(
+                data,
+                patient_name,
+                height_cm,
+                confidence_threshold
+            )
+
+        analysis_record = await run_in_threadpool(_store_analysis, patient_id, analysis_data, not diagnostic)
+
+        # Serialize here (instead of letting FastAPI re-validate the model) so the cost is measured
+        timings = analysis_data['timings']
+        report = analysis_data.get('profile') if profile or profile_calls else None
+        if report is not None:
+            report['timings_ms'] = {stage: round(seconds * 1000, 3) for stage, seconds in timings.items()}
+            report['total_ms'] = round(sum(timings.values()) * 1000, 3)
+        with timed(timings, 'serialize'):
+            result = analysis_result(analysis_record["id"], patient_name, height_cm, analysis_data)
+            body = AnalysisResponse(
+                success=True,
+                message="Analysis completed successfully",
+                data=result,
+                profile=report
+            ).model_dump_json()
+        if not diagnostic:
+            metrics.stage_seconds.observe(timings['serialize'], stage='serialize')
+
+        return Response(content=body, media_type="application/json")
+
+    except ImageDecodeError:
+        raise HTTPException(status_code=400, detail=f"Cannot decode image {image.filename}")
+    except ModelNotReadyError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
-    file_id = str(uuid.uuid4())
-    file_extension = os.path.splitext(image.filename)[1]
-    temp_file_path = os.path.join(upload_folder, f"{file_id}{file_extension}")
 
-    try:
-        with open(temp_file_path, "wb") as buffer:
-            shutil.copyfileobj(image.file, buffer)
+def _form_list(value: Optional[str]) -> List[str]:
+    """Comma-separated form field as a list of stripped entries (positions kept)."""
+    return [entry.strip() for entry in value.split(",")] if value else []
 
-        patient = db_service.get_patient_by_name(patient_name)
-        if not patient:
-            patient = db_service.create_patient(patient_name, height_cm)
 
-        patient_id = patient["id"]
+@router.post("/analyze-group", response_model=GroupAnalysisResponse)
+async def analyze_group(
+    image: UploadFile = File(...),
+    patient_name: str = Form(...),
+    height_cm: float = Form(...),
+    confidence_threshold: float = Form(0.25),
+    patient_names: Optional[str] = Form(None),
+    heights_cm: Optional[str] = Form(None)
+):
+    """Analyze every person in a group photo with one inference pass and store one
+    analysis per person. People are numbered left to right; `patient_names` and
+    `heights_cm` are optional comma-separated lists in that order. People without a
+    name are stored as "<patient_name> #<n>", people without a height use `height_cm`."""
+    names = _form_list(patient_names)
+    try:
+        heights = [float(entry) if entry else None for entry in _form_list(heights_cm)]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="heights_cm must be a comma-separated list of numbers")
 
-        analysis_data = analyzer_service.analyze_image(
-            temp_file_path,
-            patient_name,
-            height_cm,
-            confidence_threshold
-        )
+    try:
+        data = await image.read()
+        group = await inference_executor.analyze_people(data, height_cm, confidence_threshold, heights)
+
+        stored = []
+        for analysis_data in group['people']:
+            i = analysis_data['person_index']
+            person_name = names[i] if i < len(names) and names[i] else f"{patient_name} #{i + 1}"
+            person_height_cm = heights[i] if i < len(heights) and heights[i] is not None else height_cm
+
+            patient = await run_in_threadpool(_get_or_create_patient, person_name, person_height_cm)
+            analysis_record = await run_in_threadpool(_store_analysis, patient["id"], analysis_data)
+            stored.append((analysis_record["id"], person_name, person_height_cm, analysis_data))
+
+        timings = {}
+        with timed(timings, 'serialize'):
+            results = [analysis_result(*entry) for entry in stored]
+            body = GroupAnalysisResponse(
+                success=True,
+                message=f"Group analysis completed. {len(results)} people detected.",
+                total_people=len(results),
+                skeleton_image_id=group['skeleton_image_id'],
+                skeleton_image_url=artifact_url(group['skeleton_image_id']),
+                results=results
+            ).model_dump_json()
+        _observe_serialize(timings['serialize'], len(results))
+
+        return Response(content=body, media_type="application/json")
+
+    except ImageDecodeError:
+        raise HTTPException(status_code=400, detail=f"Cannot decode image {image.filename}")
+    except ModelNotReadyError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Group analysis failed: {str(e)}")
+
+
+@router.get("/batcher-stats")
+async def get_batcher_stats():
+    return micro_batcher.stats()
+
+
+@router.get("/cache-stats")
+async def get_cache_stats():
+    return inference_executor.cache.stats()
+
+
+def _job_view(job: Dict) -> Dict:
+    return {
+        "job_id": job["id"],
+        "status": job["status"],
+        "patient_name": job["patient_name"],
+        "total": job["total"],
+        "processed": job["processed"],
+        "failed": job["failed"],
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"],
+        "status_url": f"{router.prefix}/jobs/{job['id']}",
+        "results_url": f"{router.prefix}/jobs/{job['id']}/results"
+    }
+
+
+def _job_item_view(item: Dict) -> Dict:
+    result = item.get("result")
+    if result:
+        result["skeleton_image_url"] = artifact_url(result.get("skeleton_image_id"))
+    return {
+        "position": item["position"],
+        "filename": item["filename"],
+        "status": item["status"],
+        "analysis_id": item["analysis_id"],
+        "error": item["error"],
+        "result": result
+    }
+
+
+@router.post("/jobs", status_code=202)
+async def submit_batch_job(
+    images: List[UploadFile] = File(...),
+    patient_name: str = Form(...),
+    height_cm: float = Form(...),
+    confidence_threshold: float = Form(0.25)
+):
+    try:
+        uploads = [(image.filename, await image.read()) for image in images]
+        job = await batch_jobs.submit(patient_name, height_cm, confidence_threshold, uploads)
+        return _job_view(job)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to create batch job: {str(e)}")
+
+
+@router.get("/jobs/{job_id}")
+async def get_batch_job(job_id: str):
+    job = await run_in_threadpool(db_service.get_batch_job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Batch job not found")
+    return _job_view(job)
+
+
+@router.get("/jobs/{job_id}/results")
+async def get_batch_job_results(job_id: str, after: int = -1, wait: float = 0):
+    """
+    Finished items with position > `after`, in upload order. Pass the returned
+    `next_after` to fetch only new results. With `wait` (seconds, max 30) the call
+    long-polls until at least one new result is recorded or the job finishes.
+    """
+    job = await run_in_threadpool(db_service.get_batch_job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Batch job not found")
+
+    finished = job["status"] in ("completed", "failed")
+    progress = batch_jobs.progress_event(job_id) if wait > 0 and not finished else None
+    items = await run_in_threadpool(db_service.list_batch_job_items, job_id, "finished", after)
+    if not items and progress is not None:
+        await batch_jobs.wait_for_progress(progress, min(wait, 30))
+        job = await run_in_threadpool(db_service.get_batch_job, job_id)
+        items = await run_in_threadpool(db_service.list_batch_job_items, job_id, "finished", after)
+
+    return {
+        "job": _job_view(job),
+        "results": [_job_item_view(item) for item in items],
+        "next_after": items[-1]["position"] if items else after
+    }
+
+
+@router.get("/artifacts/{artifact_id}")
+async def get_artifact(artifact_id: str, request: Request):
+    found = artifact_store.find(artifact_id)
+    if found is None:
+        raise HTTPException(status_code=404, detail="Artifact not found")
+
+    # Content-addressed: the id is the hash of the bytes, so the response never changes
+    headers = {
+        "Cache-Control": "public, max-age=31536000, immutable",
+        "ETag": f'"{artifact_id}"'
+    }
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+
+    path, media_type = found
+    return FileResponse(path, media_type=media_type, headers=headers)
+
+
+def _stored_analysis_result(analysis_id: str) -> Optional[AnalysisResult]:
+    analysis = db_service.get_analysis(analysis_id)
+    if not analysis:
+        return None
+
+    patient = db_service.get_patient(analysis["patient_id"])
+    keypoints = db_service.get_keypoints(analysis_id)
+
+    return AnalysisResult(
+        analysis_id=analysis["id"],
+        patient_name=patient["name"],
+        height_cm=patient["height_cm"],
+        analysis_date=analysis["analysis_date"],
+        shoulder=analysis.get("shoulder_data"),
+        hip=analysis.get("hip_data"),
+        spinal=analysis.get("spinal_data"),
+        head=analysis.get("head_data"),
+        posture_score=analysis.get("posture_score"),
+        postural_angles=analysis.get("postural_angles"),
+        detections=analysis.get("detections"),
+        keypoints=keypoints,
+        conversion_ratio=analysis.get("conversion_ratio"),
+        actual_height_mm=analysis.get("actual_height_mm")
+    )
 
-        analysis_record = db_service.create_analysis(patient_id, analysis_data)
 
-        if analysis_data.get('keypoints'):
-            db_service.save_keypoints(analysis_record["id"], analysis_data['keypoints'])
+@router.get("/analysis/{analysis_id}", response_model=AnalysisResponse)
+async def get_analysis(analysis_id: str):
+    try:
+        result = await run_in_threadpool(_stored_analysis_result, analysis_id)
 
-        result = AnalysisResult(
-            analysis_id=analysis_record["id"],
-            patient_name=patient_name,
-            height_cm=height_cm,
-            analysis_date=datetime.now(),
-            shoulder=analysis_data.get("shoulder"),
-            hip=analysis_data.get("hip"),
-            spinal=analysis_data.get("spinal"),
-            head=analysis_data.get("head"),
-            posture_score=analysis_data.get("posture_score"),
-            postural_angles=analysis_data.get("postural_angles"),
-            detections=analysis_data.get("detections"),
-            keypoints=analysis_data.get("keypoints"),
-            conversion_ratio=analysis_data.get("conversion_ratio"),
-            actual_height_mm=analysis_data.get("actual_height_mm"),
-            skeleton_image=analysis_data.get("skeleton_image")
-        )
+        if not result:
+            raise HTTPException(status_code=404, detail="Analysis not found")
 
         return AnalysisResponse(
             success=True,
-            message="Analysis completed successfully",
+            message="Analysis retrieved successfully",
             data=result
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to retrieve analysis: {str(e)}")
 
-    finally:
-        if os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
 
+# Views of a full assessment: depan, belakang, samping kiri, samping kanan
+SESSION_VIEWS = ('front', 'back', 'left', 'right')
 
-@router.get("/analysis/{analysis_id}", response_model=AnalysisResponse)
-async def get_analysis(analysis_id: str):
-    try:
-        analysis = db_service.get_analysis(analysis_id)
 
-        if not analysis:
-            raise HTTPException(status_code=404, detail="Analysis not found")
+def _session_summary(results: Dict[str, AnalysisResult], errors: Dict[str, str]) -> Dict:
+    """Combined session result: per-view score and detected view, and their mean score."""
+    views = {}
+    for view, result in results.items():
+        score = result.posture_score or {}
+        views[view] = {
+            'analysis_id': result.analysis_id,
+            'detected_view': ((result.detections or {}).get('all_detections') or [{}])[0].get('classification'),
+            'total_score': score.get('total_score'),
+            'assessment': score.get('assessment')
+        }
+    scores = [v['total_score'] for v in views.values() if v['total_score'] is not None]
 
-        patient = db_service.get_patient(analysis["patient_id"])
+    return {
+        'views': views,
+        'overall_score': round(sum(scores) / len(scores), 1) if scores else None,
+        'missing_views': [view for view in SESSION_VIEWS if view not in results],
+        'errors': errors
+    }
 
-        result = AnalysisResult(
-            analysis_id=analysis["id"],
-            patient_name=patient["name"],
-            height_cm=patient["height_cm"],
-            analysis_date=analysis["analysis_date"],
-            shoulder=analysis.get("shoulder_data"),
-            hip=analysis.get("hip_data"),
-            spinal=analysis.get("spinal_data"),
-            head=analysis.get("head_data"),
-            posture_score=analysis.get("posture_score"),
-            postural_angles=analysis.get("postural_angles"),
-            detections=analysis.get("detections"),
-            keypoints=db_service.get_keypoints(analysis_id),
-            conversion_ratio=analysis.get("conversion_ratio"),
-            actual_height_mm=analysis.get("actual_height_mm")
+
+@router.post("/sessions", response_model=SessionResponse)
+async def analyze_session(
+    patient_name: str = Form(...),
+    height_cm: float = Form(...),
+    confidence_threshold: float = Form(0.25),
+    front: Optional[UploadFile] = File(None),
+    back: Optional[UploadFile] = File(None),
+    left: Optional[UploadFile] = File(None),
+    right: Optional[UploadFile] = File(None)
+):
+    """Analyze the views of one assessment (any of front/back/left/right) in a single
+    batched forward pass, store each view as an analysis and the combined result as a session."""
+    uploads = {view: image for view, image in zip(SESSION_VIEWS, (front, back, left, right)) if image is not None}
+    if not uploads:
+        raise HTTPException(status_code=400, detail=f"Upload at least one view: {', '.join(SESSION_VIEWS)}")
+
+    try:
+        patient = await run_in_threadpool(_get_or_create_patient, patient_name, height_cm)
+        patient_id = patient["id"]
+
+        items = [(await image.read(), patient_name, height_cm, confidence_threshold) for image in uploads.values()]
+        outcomes = await inference_executor.analyze_batch(items)
+
+        stored, errors = {}, {}
+        for (view, image), (analysis_data, error) in zip(uploads.items(), outcomes):
+            if error is not None:
+                errors[view] = f"Cannot decode image {image.filename}" if isinstance(error, ImageDecodeError) \
+                    else str(error)
+                continue
+            analysis_record = await run_in_threadpool(_store_analysis, patient_id, analysis_data)
+            stored[view] = (analysis_record["id"], analysis_data)
+
+        if not stored:
+            raise HTTPException(status_code=400, detail=f"No view could be analyzed: {errors}")
+
+        timings = {}
+        with timed(timings, 'serialize'):
+            results = {view: analysis_result(analysis_id, patient_name, height_cm, analysis_data)
+                       for view, (analysis_id, analysis_data) in stored.items()}
+            summary = _session_summary(results, errors)
+        session = await run_in_threadpool(
+            db_service.create_session, patient_id, {view: r.analysis_id for view, r in results.items()}, summary
         )
 
-        return AnalysisResponse(
+        with timed(timings, 'serialize'):
+            body = SessionResponse(
+                success=True,
+                message=f"Session analysis completed. Analyzed {len(results)}/{len(uploads)} views.",
+                session_id=session["id"],
+                patient_name=patient_name,
+                created_at=session["created_at"],
+                summary=summary,
+                views=results
+            ).model_dump_json()
+        _observe_serialize(timings['serialize'], len(results))
+
+        return Response(content=body, media_type="application/json")
+
+    except HTTPException:
+        raise
+    except ModelNotReadyError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Session analysis failed: {str(e)}")
+
+
+@router.get("/sessions/{session_id}", response_model=SessionResponse)
+async def get_session(session_id: str):
+    try:
+        session = await run_in_threadpool(db_service.get_session, session_id)
+        if not session:
+            raise HTTPException(status_code=404, detail="Session not found")
+
+        patient = await run_in_threadpool(db_service.get_patient, session["patient_id"])
+        views = {}
+        for view, analysis_id in session["views"].items():
+            result = await run_in_threadpool(_stored_analysis_result, analysis_id)
+            if result is not None:
+                views[view] = result
+
+        return SessionResponse(
             success=True,
-            message="Analysis retrieved successfully",
-            data=result
+            message="Session retrieved successfully",
+            session_id=session["id"],
+            patient_name=patient["name"],
+            created_at=session["created_at"],
+            summary=session["summary"],
+            views=views
         )
 
     except HTTPException:
         raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to retrieve analysis: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to retrieve session: {str(e)}")
 
 
 @router.post("/batch-analyze")
@@ -137,75 +461,138 @@ async def batch_analyze_postures(
     height_cm: float = Form(...),
     confidence_threshold: float = Form(0.25)
 ):
-    upload_folder = tempfile.gettempdir()
-
-
-    results = []
-    temp_files = []
+    stored, errors = [], []
 
     try:
-        patient = db_service.get_patient_by_name(patient_name)
-        if not patient:
-            patient = db_service.create_patient(patient_name, height_cm)
-
+        patient = await run_in_threadpool(_get_or_create_patient, patient_name, height_cm)
         patient_id = patient["id"]
 
-        for image in images:
-            file_id = str(uuid.uuid4())
-            file_extension = os.path.splitext(image.filename)[1]
-            temp_file_path = os.path.join(upload_folder, f"{file_id}{file_extension}")
-            temp_files.append(temp_file_path)
-
-            with open(temp_file_path, "wb") as buffer:
-                shutil.copyfileobj(image.file, buffer)
-
-            try:
-                analysis_data = analyzer_service.analyze_image(
-                    temp_file_path,
-                    patient_name,
-                    height_cm,
-                    confidence_threshold
-                )
-
-                analysis_record = db_service.create_analysis(patient_id, analysis_data)
-
-                if analysis_data.get('keypoints'):
-                    db_service.save_keypoints(analysis_record["id"], analysis_data['keypoints'])
-
-                result = AnalysisResult(
-                    analysis_id=analysis_record["id"],
-                    patient_name=patient_name,
-                    height_cm=height_cm,
-                    analysis_date=datetime.now(),
-                    shoulder=analysis_data.get("shoulder"),
-                    hip=analysis_data.get("hip"),
-                    spinal=analysis_data.get("spinal"),
-                    head=analysis_data.get("head"),
-                    posture_score=analysis_data.get("posture_score"),
-                    postural_angles=analysis_data.get("postural_angles"),
-                    detections=analysis_data.get("detections"),
-                    keypoints=analysis_data.get("keypoints"),
-                    conversion_ratio=analysis_data.get("conversion_ratio"),
-                    actual_height_mm=analysis_data.get("actual_height_mm")
-                )
-
-                results.append(result)
-
-            except Exception as e:
-                print(f"Error analyzing {image.filename}: {e}")
-                continue
+        # One batched forward pass per chunk; chunks are spread over the worker pool
+        batch_size = inference_executor.batch_size
+        chunks = []
+        for start in range(0, len(images), batch_size):
+            chunk = images[start:start + batch_size]
+            items = [(await image.read(), patient_name, height_cm, confidence_threshold) for image in chunk]
+            chunks.append((chunk, inference_executor.analyze_batch(items)))
+
+        chunk_outcomes = await asyncio.gather(*(task for _, task in chunks))
+
+        for (chunk, _), outcomes in zip(chunks, chunk_outcomes):
+            for image, (analysis_data, error) in zip(chunk, outcomes):
+                if error is not None:
+                    metrics.item_errors.inc(route='/batch-analyze', stage='analyze')
+                    errors.append({"filename": image.filename, "error": str(error)})
+                    continue
+
+                try:
+                    analysis_record = await run_in_threadpool(_store_analysis, patient_id, analysis_data)
+                    stored.append((analysis_record["id"], analysis_data))
+                except Exception as e:
+                    metrics.item_errors.inc(route='/batch-analyze', stage='store')
+                    errors.append({"filename": image.filename, "error": str(e)})
+
+        timings = {}
+        with timed(timings, 'serialize'):
+            results = [analysis_result(analysis_id, patient_name, height_cm, analysis_data).model_dump(mode='json')
+                       for analysis_id, analysis_data in stored]
+            body = json.dumps({
+                "success": True,
+                "message": f"Batch analysis completed. Processed {len(results)}/{len(images)} images.",
+                "total_processed": len(results),
+                "results": results,
+                "errors": errors
+            })
+        _observe_serialize(timings['serialize'], len(results))
+
+        return Response(content=body, media_type="application/json")
+
+    except ModelNotReadyError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Batch analysis failed: {str(e)}")
 
-        return {
-            "success": True,
-            "message": f"Batch analysis completed. Processed {len(results)}/{len(images)} images.",
-            "total_processed": len(results),
-            "results": results
-        }
 
+@router.post("/batch-analyze/stream")
+async def batch_analyze_postures_stream(
+    images: List[UploadFile] = File(...),
+    patient_name: str = Form(...),
+    height_cm: float = Form(...),
+    confidence_threshold: float = Form(0.25)
+):
+    """
+    Streaming variant of /batch-analyze (application/x-ndjson).
+
+    One JSON line per image as soon as its chunk finishes:
+      {"type": "result", "index": i, "filename": ..., "data": AnalysisResult}
+      {"type": "error", "index": i, "filename": ..., "error": ...}
+    and a final {"type": "summary", "total": n, "total_processed": k, "failed": n - k}.
+    """
+    if not inference_executor.model_loaded:
+        raise HTTPException(status_code=503, detail=f"Model is not ready (state: {inference_executor.state})")
+
+    try:
+        patient = await run_in_threadpool(_get_or_create_patient, patient_name, height_cm)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Batch analysis failed: {str(e)}")
 
-    finally:
-        for temp_file in temp_files:
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
+    # Read before streaming starts: uploads may be closed once the endpoint returns
+    filenames = [image.filename for image in images]
+    blobs = [await image.read() for image in images]
+
+    async def analyze_chunk(start: int):
+        end = start + inference_executor.batch_size
+        items = [(data, patient_name, height_cm, confidence_threshold) for data in blobs[start:end]]
+        blobs[start:end] = [None] * len(items)
+        try:
+            outcomes = await inference_executor.analyze_batch(items)
+        except Exception as e:
+            outcomes = [(None, e)] * len(items)
+        return start, outcomes
+
+    async def stream():
+        # Chunks run concurrently on the worker pool; lines go out in completion order
+        tasks = [asyncio.ensure_future(analyze_chunk(start))
+                 for start in range(0, len(blobs), inference_executor.batch_size)]
+        processed = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                start, outcomes = await next_done
+                for offset, (analysis_data, error) in enumerate(outcomes):
+                    index = start + offset
+                    filename = filenames[index]
+                    if error is None:
+                        try:
+                            analysis_record = await run_in_threadpool(_store_analysis, patient["id"], analysis_data)
+                            timings = analysis_data['timings']
+                            with timed(timings, 'serialize'):
+                                result = analysis_result(analysis_record["id"], patient_name, height_cm, analysis_data)
+                                line = json.dumps({
+                                    "type": "result", "index": index, "filename": filename,
+                                    "data": result.model_dump(mode='json')
+                                }) + "\n"
+                            metrics.stage_seconds.observe(timings['serialize'], stage='serialize')
+                            processed += 1
+                            yield line
+                            continue
+                        except Exception as e:
+                            metrics.item_errors.inc(route='/batch-analyze/stream', stage='store')
+                            error = e
+                    else:
+                        metrics.item_errors.inc(route='/batch-analyze/stream', stage='analyze')
+
+                    yield json.dumps({
+                        "type": "error", "index": index, "filename": filename, "error": str(error)
+                    }) + "\n"
+
+            yield json.dumps({
+                "type": "summary",
+                "total": len(blobs),
+                "total_processed": processed,
+                "failed": len(blobs) - processed
+            }) + "\n"
+        finally:
+            # Client went away mid-stream: stop waiting on chunks nobody will read
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
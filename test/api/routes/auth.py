@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from api.services.database import DatabaseService
 
@@ -17,7 +18,8 @@ class LoginResponse(BaseModel):
 @router.post("/login", response_model=LoginResponse)
 async def login(request: LoginRequest):
     try:
-        user = db_service.verify_patient(request.username, request.password)
+        # bcrypt verification is deliberately slow; keep it off the event loop
+        user = await run_in_threadpool(db_service.verify_patient, request.username, request.password)
         if not user:
             raise HTTPException(status_code=401, detail="Invalid username or password")
         
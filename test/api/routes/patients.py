@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from typing import List
 
 from api.models.schemas import PatientCreate, PatientResponse, AnalysisResult
@@ -14,11 +15,11 @@ db_service = DatabaseService()
 @router.post("/", response_model=PatientResponse)
 async def create_patient(patient: PatientCreate):
     try:
-        existing = db_service.get_patient_by_name(patient.name)
+        existing = await run_in_threadpool(db_service.get_patient_by_name, patient.name)
         if existing:
             raise HTTPException(status_code=400, detail="Patient with this name already exists")
 
-        result = db_service.create_patient(patient.name, patient.height_cm, patient.password)
+        result = await run_in_threadpool(db_service.create_patient, patient.name, patient.height_cm, patient.password)
 
         return PatientResponse(
             id=result["id"],
@@ -36,7 +37,7 @@ async def create_patient(patient: PatientCreate):
 @router.get("/", response_model=List[PatientResponse])
 async def list_patients(limit: int = 100, offset: int = 0):
     try:
-        patients = db_service.list_patients(limit, offset)
+        patients = await run_in_threadpool(db_service.list_patients, limit, offset)
 
         return [
             PatientResponse(
@@ -55,7 +56,7 @@ async def list_patients(limit: int = 100, offset: int = 0):
 @router.get("/{patient_id}", response_model=PatientResponse)
 async def get_patient(patient_id: str):
     try:
-        patient = db_service.get_patient(patient_id)
+        patient = await run_in_threadpool(db_service.get_patient, patient_id)
 
         if not patient:
             raise HTTPException(status_code=404, detail="Patient not found")
@@ -76,12 +77,12 @@ async def get_patient(patient_id: str):
 @router.get("/{patient_id}/analyses", response_model=List[AnalysisResult])
 async def get_patient_analyses(patient_id: str, limit: int = 50):
     try:
-        patient = db_service.get_patient(patient_id)
+        patient = await run_in_threadpool(db_service.get_patient, patient_id)
 
         if not patient:
             raise HTTPException(status_code=404, detail="Patient not found")
 
-        analyses = db_service.list_patient_analyses(patient_id, limit)
+        analyses = await run_in_threadpool(db_service.list_patient_analyses, patient_id, limit)
 
         return [
             AnalysisResult(
@@ -96,6 +97,7 @@ async def get_patient_analyses(patient_id: str, limit: int = 50):
                 posture_score=a.get("posture_score"),
                 postural_angles=a.get("postural_angles"),
                 detections=a.get("detections"),
+                keypoints=None,  # per-analysis keypoints come from /api/analysis/{analysis_id}
                 conversion_ratio=a.get("conversion_ratio"),
                 actual_height_mm=a.get("actual_height_mm")
             )
@@ -1,18 +1,28 @@
 import cv2
 import numpy as np
-from ultralytics import YOLO
 import os
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple, Union
 import sys
-import base64
+import time
+from io import BytesIO
+
+from PIL import Image
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
-from core import AdvancedPoseAnalyzer
+from core import AdvancedPoseAnalyzer, RawResult
+from api.services.artifacts import ArtifactStore
+from api.services.backends import create_backend
+from api.services.metrics import timed
+
+
+class ImageDecodeError(ValueError):
+    """Raised when uploaded bytes cannot be decoded into an image."""
 
 
 class PostureAnalyzerService:
     _instance = None
     _model = None
+    _pose_analyzer = None
 
     def __new__(cls):
         if cls._instance is None:
@@ -21,18 +31,25 @@ class PostureAnalyzerService:
 
     def __init__(self):
         self.model_path = os.getenv("MODEL_PATH", "models/best.pt")
+        self.backend_name = os.getenv("INFERENCE_BACKEND", "torch")
+        self.batch_size = int(os.getenv("INFERENCE_BATCH_SIZE", 8))
+        # Inference always runs at this floor; higher thresholds are applied as a filter afterwards
+        self.conf_floor = float(os.getenv("INFERENCE_CONF_FLOOR", 0.05))
+        # Model input size (letterboxed), decode-time downscaling and rendered skeleton size.
+        # Keypoints are always reported in original photo coordinates; 0 disables a limit.
+        self.imgsz = int(os.getenv("INFERENCE_IMGSZ", 640))
+        self.decode_max_side = int(os.getenv("DECODE_MAX_SIDE", 1280))
+        self.skeleton_max_side = int(os.getenv("SKELETON_IMAGE_MAX_SIDE", 1280))
+        # Stateless geometry: one analyzer serves every request, thread and batch
+        if self._pose_analyzer is None:
+            self._pose_analyzer = AdvancedPoseAnalyzer()
         if self._model is None:
             self.load_model()
 
     def load_model(self) -> bool:
         try:
-            if not os.path.exists(self.model_path):
-                raise FileNotFoundError(f"Model not found at {self.model_path}")
-
-            self._model = YOLO(self.model_path)
-                
-            self._model.to('cpu')
-            self._model.fp16 = False
+            backend = create_backend(self.backend_name, self.model_path)
+            self._model = backend.load()
             return True
         except Exception as e:
             print(f"Failed to load model: {e}")
@@ -41,87 +58,251 @@ class PostureAnalyzerService:
     def is_model_loaded(self) -> bool:
         return self._model is not None
 
+    def inference_conf(self, confidence_threshold: float) -> float:
+        """Confidence the model actually runs at to serve `confidence_threshold`."""
+        return min(self.conf_floor, confidence_threshold)
+
+    def warmup(self):
+        """Run one dummy forward pass so the first real request does not pay for lazy initialisation."""
+        if self.is_model_loaded():
+            self._model(np.zeros((self.imgsz, self.imgsz, 3), dtype=np.uint8),
+                        imgsz=self.imgsz, verbose=False, device='cpu')
+
+    @staticmethod
+    def image_size(data: bytes) -> Optional[Tuple[int, int]]:
+        """(height, width) of encoded image bytes as cv2.imdecode would return them, read from the header only."""
+        try:
+            with Image.open(BytesIO(data)) as pil_img:
+                width, height = pil_img.size
+                # cv2.imdecode applies the EXIF orientation; 5-8 are the rotated ones
+                if pil_img.getexif().get(0x0112, 1) in (5, 6, 7, 8):
+                    width, height = height, width
+                return height, width
+        except Exception:
+            return None
+
+    @staticmethod
+    def decode_image(data: bytes, max_side: int = 0) -> Tuple[Optional[np.ndarray], Optional[Tuple[int, int]]]:
+        """Decode encoded image bytes (JPEG/PNG/...) into a BGR array.
+
+        Returns `(image, original (height, width))`, or `(None, None)` if undecodable.
+        With `max_side`, large photos are decoded at 1/2, 1/4 or 1/8 scale (DCT
+        scaling for JPEG, so the full-resolution pixels are never materialised)
+        while keeping the long side at or above `max_side`.
+        """
+        buffer = np.frombuffer(data, dtype=np.uint8)
+        if buffer.size == 0:
+            return None, None
+
+        original_shape = PostureAnalyzerService.image_size(data) if max_side else None
+        flag = cv2.IMREAD_COLOR
+        if original_shape is not None:
+            long_side = max(original_shape)
+            for factor, reduced_flag in ((8, cv2.IMREAD_REDUCED_COLOR_8),
+                                         (4, cv2.IMREAD_REDUCED_COLOR_4),
+                                         (2, cv2.IMREAD_REDUCED_COLOR_2)):
+                if long_side // factor >= max_side:
+                    flag = reduced_flag
+                    break
+
+        img = cv2.imdecode(buffer, flag)
+        if img is None:
+            return None, None
+        if original_shape is None or flag == cv2.IMREAD_COLOR:
+            original_shape = img.shape[:2]
+        return img, original_shape
+
     def analyze_image(self,
-                     image_path: str,
+                     image: Union[str, np.ndarray],
                      patient_name: str,
                      height_cm: float,
-                     confidence_threshold: float = 0.25) -> Dict:
+                     confidence_threshold: float = 0.25,
+                     raw_result: Optional[RawResult] = None,
+                     timings: Optional[Dict[str, float]] = None) -> Dict:
+        """Analyze one image given either a file path or an already decoded BGR array.
+
+        The decoded array is the only copy of the pixels: it is handed to the model,
+        the visualizer and the dimension lookups without being re-read from disk.
+        If `raw_result` (cached model output for this exact image) is given, the model
+        is skipped and only the posture geometry is recomputed. The model runs at
+        INFERENCE_CONF_FLOOR and `confidence_threshold` is applied as a filter.
+        Per-stage wall times (seconds) are added to `timings` and returned under 'timings'.
+        """
+        timings = {} if timings is None else timings
+        if isinstance(image, np.ndarray):
+            img, original_shape = image, image.shape[:2]
+        else:
+            try:
+                with timed(timings, 'decode'), open(image, 'rb') as f:
+                    img, original_shape = self.decode_image(f.read(), self.decode_max_side)
+            except OSError:
+                img = None
+            if img is None:
+                raise ValueError(f"Cannot load image from {image}")
+
+        if raw_result is not None:
+            return self.analyze_result(img, [raw_result], patient_name, height_cm, confidence_threshold,
+                                       original_shape, timings)
 
         if not self.is_model_loaded():
             raise RuntimeError("Model not loaded")
 
-        img = cv2.imread(image_path)
-        if img is None:
-            raise ValueError(f"Cannot load image from {image_path}")
+        with timed(timings, 'inference'):
+            results = self._model(img, conf=self.inference_conf(confidence_threshold), imgsz=self.imgsz,
+                                  verbose=False, device='cpu')
 
-        img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+        return self.analyze_result(img, results, patient_name, height_cm, confidence_threshold,
+                                   original_shape, timings)
+
+    def predict_batch(self,
+                      images: List[np.ndarray],
+                      confidence_threshold: float = 0.25,
+                      batch_size: Optional[int] = None) -> List:
+        """Run decoded BGR images through the model in chunks of `batch_size`.
+
+        Returns one Ultralytics `Results` entry per input image, in input order.
+        """
+        if not self.is_model_loaded():
+            raise RuntimeError("Model not loaded")
+
+        batch_size = batch_size or self.batch_size
+        results = []
+        for start in range(0, len(images), batch_size):
+            chunk = images[start:start + batch_size]
+            results.extend(self._model(chunk, conf=confidence_threshold, imgsz=self.imgsz,
+                                       verbose=False, device='cpu'))
+        return results
+
+    def analyze_images(self,
+                       images: List[np.ndarray],
+                       patient_name: str,
+                       height_cm: float,
+                       confidence_threshold: float = 0.25,
+                       batch_size: Optional[int] = None) -> List[Dict]:
+        """Batched counterpart of `analyze_image` for already decoded BGR images."""
+        results = self.predict_batch(images, self.inference_conf(confidence_threshold), batch_size)
+        return [
+            self.analyze_result(img, [result], patient_name, height_cm, confidence_threshold)
+            for img, result in zip(images, results)
+        ]
+
+    def analyze_result(self, img: np.ndarray, results, patient_name: str, height_cm: float,
+                       confidence_threshold: Optional[float] = None,
+                       original_shape: Optional[Tuple[int, int]] = None,
+                       timings: Optional[Dict[str, float]] = None) -> Dict:
+        """Run the posture geometry for one image on an already computed inference result.
+
+        If `confidence_threshold` is given, detections below it are dropped first, so a
+        result computed at the confidence floor can serve any higher threshold.
+        If `img` is a downscaled decode, `original_shape` is the photo's real
+        (height, width): model output is mapped back to it before any measurement.
+        Stage wall times are added to `timings` (seconds) and returned under 'timings'.
+        """
+        timings = {} if timings is None else timings
+        image_h, image_w = original_shape or img.shape[:2]
+        raw_result, results = self._prepare_results(results, (image_h, image_w), confidence_threshold)
 
-        results = self._model(image_path, conf=confidence_threshold, verbose=False, device='cpu')
-        
-        
         # 1. EXTRACT KEYPOINTS FIRST (so we can visualize the Adjusted ones)
-        analyzer = AdvancedPoseAnalyzer()
-        keypoints = analyzer.extract_keypoints_from_results(results)
+        analyzer = self._pose_analyzer
+        with timed(timings, 'keypoints'):
+            keypoints = analyzer.extract_keypoints_from_results(results)
 
         # 2. GENERATE CUSTOM VISUALIZATION
         # Import visualizer here to avoid circular imports if necessary, or at top
         from core.visualizer import visualize_skeleton_custom
         
-        # Use a copy of the original image
-        plotted_img = visualize_skeleton_custom(img_rgb, keypoints)
-        
-        # BACK TO BGR for encoding (cv2 uses BGR)
-        plotted_img_bgr = cv2.cvtColor(plotted_img, cv2.COLOR_RGB2BGR)
-        
-        # Encode to Base64
-        _, buffer = cv2.imencode('.jpg', plotted_img_bgr)
-        skeleton_image_b64 = base64.b64encode(buffer).decode('utf-8')
-
-        person_height_px = analyzer.estimate_person_height_from_keypoints(keypoints)
-        if person_height_px is None:
-            person_height_px = img.shape[0] * 0.7
-
-        actual_height_mm = height_cm * 10
-        analyzer.calculate_pixel_to_mm_ratio(img.shape[0], person_height_px, actual_height_mm)
-
-        posture_center_x = analyzer.calculate_posture_center_x(keypoints, img.shape[1])
-        shoulder_analysis = analyzer.analyze_shoulder_imbalance_advanced(keypoints, plumb_line_x=posture_center_x)
-        hip_analysis = analyzer.analyze_hip_imbalance_advanced(keypoints, plumb_line_x=posture_center_x)
-        spinal_analysis = analyzer.analyze_spinal_alignment_advanced(keypoints)
-        head_analysis = analyzer.analyze_head_alignment_advanced(keypoints)
-        lateral_distances = analyzer.analyze_lateral_distances(keypoints)
+        # Draw straight onto a BGR copy (no RGB round-trip before encoding)
+        with timed(timings, 'render'):
+            canvas, scale = self._skeleton_canvas(img, image_w)
+            plotted_img_bgr = visualize_skeleton_custom(canvas, keypoints, bgr=True, scale=scale)
         
-        leg_analysis_anterior = analyzer.analyze_leg_alignment_anterior(keypoints)
-        leg_analysis_lateral = analyzer.analyze_leg_alignment_lateral(keypoints)
-
-        analysis_results = {
-            'keypoints': keypoints,
-            'conversion_ratio': analyzer.pixel_to_mm_ratio,
-            'actual_height_mm': actual_height_mm,
-            'person_height_px': person_height_px,
-            'image_height': img.shape[0],
-            'shoulder': shoulder_analysis,
-            'hip': hip_analysis,
-            'spinal': spinal_analysis,
-            'head': head_analysis,
-            'lateral_distances': lateral_distances,
-            'leg_anterior': leg_analysis_anterior,
-            'leg_anterior': leg_analysis_anterior,
-            'leg_lateral': leg_analysis_lateral,
-            'skeleton_image': skeleton_image_b64
-        }
-
-        postural_angles = analyzer.analyze_postural_angles(keypoints)
-        analysis_results['postural_angles'] = postural_angles
-        analysis_results['posture_center_x'] = posture_center_x
+        # Store the JPEG in the artifact store; the response only carries its id
+        with timed(timings, 'encode'):
+            _, buffer = cv2.imencode('.jpg', plotted_img_bgr)
+            skeleton_image_id = ArtifactStore().put(buffer.tobytes(), 'jpg')
 
-        posture_score = analyzer.calculate_overall_posture_score(analysis_results)
-        analysis_results['posture_score'] = posture_score
+        geometry_started = time.perf_counter()
+        analysis_results = analyzer.analyze_keypoints(keypoints, image_h, image_w, height_cm)
+        analysis_results['skeleton_image_id'] = skeleton_image_id
+        timings['geometry'] = timings.get('geometry', 0.0) + time.perf_counter() - geometry_started
 
         detections = self._get_detections(results)
         analysis_results['detections'] = detections
-        
-        # Determine view_type for GUI
+        analysis_results['view_type'] = self._view_type(detections)
+
+        # Unfiltered model output, for the inference cache (not part of the API response)
+        if raw_result is not None:
+            analysis_results['raw_result'] = raw_result
+        analysis_results['timings'] = timings
+
+        return analysis_results
+
+    def analyze_people(self, img: np.ndarray, results, height_cm: float,
+                       confidence_threshold: Optional[float] = None,
+                       original_shape: Optional[Tuple[int, int]] = None,
+                       timings: Optional[Dict[str, float]] = None,
+                       heights_cm: Optional[List[Optional[float]]] = None) -> Dict:
+        """Run the posture geometry for every person in one inference result (group photos).
+
+        People are ordered left to right and person i is measured with `heights_cm[i]`
+        when given (not None), else `height_cm`. Each person goes through the same keypoint
+        extraction and geometry as a photo of them alone; all skeletons are drawn on
+        one image. Returns `{'people': [...], 'skeleton_image_id', 'timings'}` (plus
+        'raw_result'), where every analysis also carries 'person_index' and 'bbox'.
+        """
+        timings = {} if timings is None else timings
+        image_h, image_w = original_shape or img.shape[:2]
+        raw_result, results = self._prepare_results(results, (image_h, image_w), confidence_threshold)
+        people = results[0].people() if raw_result is not None else []
+
+        analyzer = self._pose_analyzer
+        with timed(timings, 'keypoints'):
+            people_keypoints = [analyzer.extract_keypoints_from_results([person]) for person in people]
+
+        from core.visualizer import visualize_skeleton_custom
+
+        with timed(timings, 'render'):
+            canvas, scale = self._skeleton_canvas(img, image_w)
+            for keypoints in people_keypoints:
+                canvas = visualize_skeleton_custom(canvas, keypoints, bgr=True, scale=scale)
+
+        with timed(timings, 'encode'):
+            _, buffer = cv2.imencode('.jpg', canvas)
+            skeleton_image_id = ArtifactStore().put(buffer.tobytes(), 'jpg')
+
+        analyses = []
+        geometry_started = time.perf_counter()
+        for i, (person, keypoints) in enumerate(zip(people, people_keypoints)):
+            person_height_cm = heights_cm[i] if heights_cm and i < len(heights_cm) else None
+            if person_height_cm is None:
+                person_height_cm = height_cm
+            analysis_results = analyzer.analyze_keypoints(keypoints, image_h, image_w, person_height_cm)
+            detections = self._get_detections([person])
+            analysis_results['skeleton_image_id'] = skeleton_image_id
+            analysis_results['detections'] = detections
+            analysis_results['view_type'] = self._view_type(detections)
+            analysis_results['person_index'] = i
+            analysis_results['bbox'] = detections['all_detections'][0]['bbox'] if detections['all_detections'] else None
+            analyses.append(analysis_results)
+        timings['geometry'] = timings.get('geometry', 0.0) + time.perf_counter() - geometry_started
+
+        group = {'people': analyses, 'skeleton_image_id': skeleton_image_id, 'timings': timings}
+        if raw_result is not None:
+            group['raw_result'] = raw_result
+        return group
+
+    @staticmethod
+    def _prepare_results(results, image_shape: Tuple[int, int], confidence_threshold: Optional[float]):
+        """(unfiltered RawResult or None, results mapped to `image_shape` and filtered to the threshold)."""
+        raw_result = RawResult.from_result(results[0]) if len(results) > 0 else None
+        if raw_result is not None:
+            raw_result = raw_result.rescale(image_shape)
+            results = [raw_result.filter(confidence_threshold) if confidence_threshold is not None else raw_result]
+        return raw_result, results
+
+    @staticmethod
+    def _view_type(detections: Dict) -> str:
+        """View label for the GUI, from the first detection's classification."""
         view_type = 'frontal'
         if detections['all_detections']:
             cls = detections['all_detections'][0]['classification'].lower()
@@ -130,9 +311,16 @@ class PostureAnalyzerService:
                 view_type = cls
             elif any(k in cls for k in ['depan', 'belakang', 'front', 'back', 'anterior', 'posterior']):
                 view_type = cls
-        analysis_results['view_type'] = view_type
+        return view_type
 
-        return analysis_results
+    def _skeleton_canvas(self, img: np.ndarray, original_width: int) -> Tuple[np.ndarray, float]:
+        """Image to draw the skeleton on (at most SKELETON_IMAGE_MAX_SIDE) and its scale from original coordinates."""
+        h, w = img.shape[:2]
+        if self.skeleton_max_side and max(h, w) > self.skeleton_max_side:
+            factor = self.skeleton_max_side / max(h, w)
+            img = cv2.resize(img, (max(1, round(w * factor)), max(1, round(h * factor))),
+                             interpolation=cv2.INTER_AREA)
+        return img, img.shape[1] / original_width
 
     def _get_detections(self, results) -> Dict:
         detections = {
@@ -142,31 +330,26 @@ class PostureAnalyzerService:
         }
 
         try:
-            for result in results:
-                if hasattr(result, 'boxes') and result.boxes is not None:
-                    boxes = result.boxes
-                    if len(boxes.xyxy) > 0:
-                        for box, conf, cls in zip(boxes.xyxy, boxes.conf, boxes.cls):
-                            x1, y1, x2, y2 = box.cpu().numpy()
-                            confidence = float(conf.cpu().numpy())
-                            class_id = int(cls.cpu().numpy())
-
-                            class_name = self._model.names.get(class_id, f'Class_{class_id}')
-
-                            detection_info = {
-                                'classification': class_name,
-                                'confidence': confidence,
-                                'bbox': {
-                                    'x1': float(x1), 'y1': float(y1),
-                                    'x2': float(x2), 'y2': float(y2)
-                                }
-                            }
-                            detections['all_detections'].append(detection_info)
-
-                            detections['classification_counts'][class_name] = \
-                                detections['classification_counts'].get(class_name, 0) + 1
-
-                            detections['total_detections'] += 1
+            for raw in RawResult.from_results(results):
+                # One bulk conversion per result instead of per-box tensor reads
+                for (x1, y1, x2, y2), confidence, class_id in zip(raw.boxes_xyxy.tolist(), raw.boxes_conf.tolist(),
+                                                                  raw.class_ids):
+                    class_name = raw.names.get(class_id, f'Class_{class_id}')
+
+                    detection_info = {
+                        'classification': class_name,
+                        'confidence': confidence,
+                        'bbox': {
+                            'x1': x1, 'y1': y1,
+                            'x2': x2, 'y2': y2
+                        }
+                    }
+                    detections['all_detections'].append(detection_info)
+
+                    detections['classification_counts'][class_name] = \
+                        detections['classification_counts'].get(class_name, 0) + 1
+
+                    detections['total_detections'] += 1
         except Exception as e:
             print(f"Error extracting detections: {e}")
 
@@ -0,0 +1,128 @@
+import hashlib
+import os
+import re
+import threading
+from typing import Optional, Tuple
+
+
+class ArtifactStore:
+    """
+    Content-addressed store for rendered analysis artifacts (skeleton JPEGs).
+
+    Files live under ARTIFACT_DIR at `<id[:2]>/<id>.<ext>`, where the id is the
+    SHA-256 of the bytes. The same render is stored once, and an id never changes
+    meaning, so the API can serve artifacts with immutable cache headers.
+    Workers write here directly; only the id travels back in the analysis result.
+
+    The folder is bounded by ARTIFACT_DISK_MB (0 = unbounded): once over it, the
+    least recently written or served files are deleted down to 90% of the limit.
+    An evicted artifact's URL answers 404, as for any unknown id.
+    """
+    _instance = None
+    _ID_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+    MEDIA_TYPES = {'jpg': 'image/jpeg', 'png': 'image/png'}
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(ArtifactStore, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self.root = os.getenv("ARTIFACT_DIR", "artifacts")
+        self.disk_limit = int(float(os.getenv("ARTIFACT_DISK_MB", 1024)) * 1024 * 1024)
+        self._disk_bytes = None  # computed lazily on first write
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self._initialized = True
+
+    def _path(self, artifact_id: str, ext: str) -> str:
+        return os.path.join(self.root, artifact_id[:2], f"{artifact_id}.{ext}")
+
+    def put(self, data: bytes, ext: str = 'jpg') -> str:
+        artifact_id = hashlib.sha256(data).hexdigest()
+        path = self._path(artifact_id, ext)
+        if os.path.exists(path):
+            self._touch(path)
+            return artifact_id
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        if self.disk_limit > 0:
+            with self._lock:
+                if self._disk_bytes is None:
+                    self._disk_bytes = self._scan_disk_bytes()
+                else:
+                    self._disk_bytes += len(data)
+                over_limit = self._disk_bytes > self.disk_limit
+            if over_limit:
+                self._evict()
+        return artifact_id
+
+    def find(self, artifact_id: str) -> Optional[Tuple[str, str]]:
+        """Return `(path, media_type)` for a stored artifact, or None (also for malformed ids)."""
+        if not self._ID_PATTERN.match(artifact_id or ''):
+            return None
+        for ext, media_type in self.MEDIA_TYPES.items():
+            path = self._path(artifact_id, ext)
+            if os.path.exists(path):
+                self._touch(path)
+                return path, media_type
+        return None
+
+    @staticmethod
+    def _touch(path: str):
+        try:
+            os.utime(path)  # bump mtime so eviction is least-recently-used
+        except OSError:
+            pass
+
+    def _artifact_files(self):
+        extensions = tuple(f".{ext}" for ext in self.MEDIA_TYPES)
+        for root, _, files in os.walk(self.root):
+            for name in files:
+                if name.endswith(extensions):
+                    yield os.path.join(root, name)
+
+    def _scan_disk_bytes(self) -> int:
+        total = 0
+        for path in self._artifact_files():
+            try:
+                total += os.path.getsize(path)
+            except OSError:
+                continue
+        return total
+
+    def _evict(self):
+        # Other worker processes write to the same folder, so sweep from a fresh scan
+        files = []
+        for path in self._artifact_files():
+            try:
+                st = os.stat(path)
+                files.append((st.st_mtime, st.st_size, path))
+            except OSError:
+                continue
+        files.sort()
+
+        total = sum(size for _, size, _ in files)
+        target = int(self.disk_limit * 0.9)
+        for _, size, path in files:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                with self._lock:
+                    self.evictions += 1
+            except OSError:
+                continue
+
+        with self._lock:
+            self._disk_bytes = total
@@ -0,0 +1,150 @@
+import os
+from typing import Dict, Optional, Type
+
+
+class InferenceBackend:
+    """
+    Builds the pose model used by PostureAnalyzerService.
+
+    `load()` returns an object with the Ultralytics YOLO calling convention:
+    `model(source, conf=..., verbose=..., device=...)` returning a list of `Results`,
+    plus a `names` dict. Keeping that contract means `extract_keypoints_from_results`
+    and `_get_detections` work unchanged whatever runtime executes the network.
+    """
+    name = None
+
+    def __init__(self, model_path: str):
+        self.model_path = model_path
+
+    def load(self):
+        raise NotImplementedError
+
+    def artifact_path(self) -> Optional[str]:
+        """File or folder `load()` actually runs (what the inference cache is keyed on)."""
+        return self.model_path
+
+    def _require_weights(self):
+        if not os.path.exists(self.model_path):
+            raise FileNotFoundError(f"Model not found at {self.model_path}")
+
+
+class TorchBackend(InferenceBackend):
+    """Plain Ultralytics PyTorch model, pinned to CPU in fp32."""
+    name = "torch"
+
+    def load(self):
+        from ultralytics import YOLO
+
+        self._require_weights()
+        model = YOLO(self.model_path)
+        model.to('cpu')
+        model.fp16 = False
+        return model
+
+
+class ExportedBackend(InferenceBackend):
+    """
+    Runs an exported copy of `best.pt` through a CPU-optimised runtime.
+
+    The export is done once, next to the .pt file, and reused on later starts.
+    Delete the exported file/folder to force a re-export after retraining.
+    """
+    export_format = None
+
+    def __init__(self, model_path: str):
+        super().__init__(model_path)
+        self.imgsz = int(os.getenv("INFERENCE_IMGSZ", 640))
+
+    def exported_path(self) -> str:
+        raise NotImplementedError
+
+    def artifact_path(self) -> Optional[str]:
+        return self.exported_path()
+
+    def export(self) -> str:
+        from ultralytics import YOLO
+
+        self._require_weights()
+        # dynamic=True keeps the batch axis free so batched inference still works
+        return YOLO(self.model_path).export(format=self.export_format, imgsz=self.imgsz, dynamic=True)
+
+    def load(self):
+        from ultralytics import YOLO
+
+        path = self.exported_path()
+        if not os.path.exists(path):
+            path = self.export()
+        return YOLO(path, task='pose')
+
+
+class OnnxBackend(ExportedBackend):
+    name = "onnx"
+    export_format = "onnx"
+
+    def exported_path(self) -> str:
+        return os.path.splitext(self.model_path)[0] + ".onnx"
+
+
+class OpenVinoBackend(ExportedBackend):
+    name = "openvino"
+    export_format = "openvino"
+
+    def exported_path(self) -> str:
+        return os.path.splitext(self.model_path)[0] + "_openvino_model"
+
+
+class OnnxInt8Backend(OnnxBackend):
+    """
+    INT8 statically-quantized ONNX model produced by scripts/quantize_model.py.
+
+    Quantization needs calibration images, so unlike the other exports it is never
+    produced implicitly at startup.
+    """
+    name = "onnx-int8"
+
+    def exported_path(self) -> str:
+        return os.getenv("INT8_MODEL_PATH", os.path.splitext(self.model_path)[0] + "-int8.onnx")
+
+    def export(self) -> str:
+        raise FileNotFoundError(
+            f"INT8 model not found at {self.exported_path()}. "
+            f"Create it with: python scripts/quantize_model.py <calibration_images_dir>"
+        )
+
+
+class StubBackend(InferenceBackend):
+    """
+    Synthetic, deterministic pose model (see stub_model.StubPoseModel).
+
+    Needs neither weights nor ultralytics/torch, so the API, database and GUI
+    paths can be benchmarked and load-tested anywhere with the model cost
+    replaced by a fixed STUB_LATENCY_MS.
+    """
+    name = "stub"
+
+    def artifact_path(self) -> Optional[str]:
+        return None
+
+    def load(self):
+        from api.services.stub_model import StubPoseModel
+
+        return StubPoseModel.from_env()
+
+
+BACKENDS: Dict[str, Type[InferenceBackend]] = {
+    TorchBackend.name: TorchBackend,
+    OnnxBackend.name: OnnxBackend,
+    OpenVinoBackend.name: OpenVinoBackend,
+    OnnxInt8Backend.name: OnnxInt8Backend,
+    StubBackend.name: StubBackend,
+}
+
+
+def create_backend(name: Optional[str] = None, model_path: Optional[str] = None) -> InferenceBackend:
+    """Instantiate the backend selected by `name` or the INFERENCE_BACKEND env var (default: torch)."""
+    name = (name or os.getenv("INFERENCE_BACKEND", TorchBackend.name)).lower()
+    model_path = model_path or os.getenv("MODEL_PATH", "models/best.pt")
+
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown inference backend '{name}'. Available: {', '.join(BACKENDS)}")
+    return BACKENDS[name](model_path)
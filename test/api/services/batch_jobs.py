@@ -0,0 +1,235 @@
+import asyncio
+import os
+import shutil
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+from api.services.database import DatabaseService
+from api.services.inference_pool import InferenceExecutor
+from api.utils.results import analysis_result
+
+
+class BatchJobManager:
+    """
+    Background batch analysis jobs (POST /api/analysis/jobs).
+
+    Uploads are written to BATCH_UPLOAD_DIR and the job plus one row per image
+    are stored in SQLite, so the request returns a job id immediately. Each job
+    runs as a background task that feeds pending images to the inference pool in
+    chunks of INFERENCE_BATCH_SIZE and records every outcome as it lands.
+    Unfinished jobs are picked up again when the server restarts; images already
+    recorded are not re-analyzed. A job that keeps failing is retried with backoff
+    and then ends as 'failed', its remaining images failed with the error.
+    """
+    _instance = None
+    MAX_ATTEMPTS = 3
+    RETRY_DELAY_S = 2.0
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(BatchJobManager, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self.upload_dir = os.getenv("BATCH_UPLOAD_DIR", "uploads")
+        self._executor = InferenceExecutor()
+        self._db = DatabaseService()
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._progress: Dict[str, asyncio.Event] = {}
+        self._initialized = True
+
+    # --- Submission --------------------------------------------------------------
+
+    async def submit(self, patient_name: str, height_cm: float, confidence_threshold: float,
+                     uploads: List[Tuple[str, bytes]]) -> Dict:
+        job = await run_in_threadpool(self._create_job, patient_name, height_cm, confidence_threshold, uploads)
+        self._schedule(job["id"])
+        return job
+
+    def _create_job(self, patient_name: str, height_cm: float, confidence_threshold: float,
+                    uploads: List[Tuple[str, bytes]]) -> Dict:
+        patient = self._db.get_patient_by_name(patient_name)
+        if not patient:
+            patient = self._db.create_patient(patient_name, height_cm)
+
+        job_id = str(uuid.uuid4())
+        job_dir = os.path.join(self.upload_dir, job_id)
+        os.makedirs(job_dir, exist_ok=True)
+
+        stored = []
+        for position, (filename, data) in enumerate(uploads):
+            # Never trust the client filename for the path
+            ext = os.path.splitext(filename or '')[1].lower()[:8]
+            upload_path = os.path.join(job_dir, f"{position:05d}{ext}")
+            with open(upload_path, 'wb') as f:
+                f.write(data)
+            stored.append({"filename": filename, "upload_path": upload_path})
+
+        return self._db.create_batch_job(job_id, patient["id"], patient_name, height_cm,
+                                         confidence_threshold, stored)
+
+    # --- Lifecycle ---------------------------------------------------------------
+
+    def start(self):
+        """Resume jobs left queued or running by a previous server process."""
+        asyncio.ensure_future(self._resume())
+
+    @property
+    def active_jobs(self) -> int:
+        return len(self._tasks)
+
+    def stop(self):
+        for task in list(self._tasks.values()):
+            task.cancel()
+        self._tasks.clear()
+
+    async def _resume(self):
+        try:
+            jobs = await run_in_threadpool(self._db.list_unfinished_batch_jobs)
+        except Exception as e:
+            print(f"Failed to load unfinished batch jobs: {e}")
+            return
+        for job in jobs:
+            print(f"Resuming batch job {job['id']} ({job['processed']}/{job['total']} done)")
+            self._schedule(job["id"])
+
+    def _schedule(self, job_id: str):
+        if job_id in self._tasks:
+            return
+        task = asyncio.ensure_future(self._run(job_id))
+        self._tasks[job_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job_id, None))
+
+    # --- Processing --------------------------------------------------------------
+
+    async def _wait_for_model(self) -> bool:
+        while self._executor.state in ("stopped", "loading"):
+            await asyncio.sleep(0.5)
+        return self._executor.model_loaded
+
+    async def _run(self, job_id: str):
+        if not await self._wait_for_model():
+            # Left queued; it is resumed on the next start
+            print(f"Batch job {job_id} waiting: model {self._executor.state}")
+            return
+
+        job = await run_in_threadpool(self._db.get_batch_job, job_id)
+        if job is None:
+            return
+        await run_in_threadpool(self._db.set_batch_job_status, job_id, "running")
+
+        error = None
+        for attempt in range(self.MAX_ATTEMPTS):
+            if attempt:
+                await asyncio.sleep(self.RETRY_DELAY_S * 2 ** (attempt - 1))
+            try:
+                await self._process_pending(job)
+                error = None
+                break
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                error = e
+                print(f"Batch job {job_id} interrupted (attempt {attempt + 1}/{self.MAX_ATTEMPTS}): {e}")
+                self._notify(job_id)
+
+        try:
+            if error is None:
+                await run_in_threadpool(self._db.set_batch_job_status, job_id, "completed")
+            else:
+                await run_in_threadpool(self._db.fail_batch_job, job_id, f"Batch job failed: {error}")
+        except Exception as e:
+            # Job stays 'running' with its pending items; it is resumed on the next start
+            print(f"Batch job {job_id} could not be finished: {e}")
+            self._notify(job_id)
+            return
+
+        shutil.rmtree(os.path.join(self.upload_dir, job_id), ignore_errors=True)
+        self._notify(job_id)
+
+    async def _process_pending(self, job: Dict):
+        """Analyze and record the job's pending items, one inference chunk at a time."""
+        pending = await run_in_threadpool(self._db.list_batch_job_items, job["id"], "pending")
+        batch_size = self._executor.batch_size
+
+        for start in range(0, len(pending), batch_size):
+            chunk = pending[start:start + batch_size]
+            blobs = await run_in_threadpool(self._read_uploads, chunk)
+
+            readable = [(item, data) for item, data in zip(chunk, blobs) if data is not None]
+            outcomes = []
+            if readable:
+                outcomes = await self._executor.analyze_batch([
+                    (data, job["patient_name"], job["height_cm"], job["confidence_threshold"])
+                    for _, data in readable
+                ])
+
+            await run_in_threadpool(self._record_chunk, job, chunk, readable, outcomes)
+            self._notify(job["id"])
+
+    @staticmethod
+    def _read_uploads(items: List[Dict]) -> List[Optional[bytes]]:
+        blobs = []
+        for item in items:
+            try:
+                with open(item["upload_path"], 'rb') as f:
+                    blobs.append(f.read())
+            except OSError:
+                blobs.append(None)
+        return blobs
+
+    def _record_chunk(self, job: Dict, chunk: List[Dict], readable: List[Tuple[Dict, bytes]],
+                      outcomes: List[Tuple[Optional[Dict], Optional[Exception]]]):
+        outcome_by_item = {item["id"]: outcome for (item, _), outcome in zip(readable, outcomes)}
+
+        for item in chunk:
+            outcome = outcome_by_item.get(item["id"])
+            if outcome is None:
+                self._db.finish_batch_job_item(job["id"], item["id"], error="Upload missing")
+                continue
+
+            analysis_data, error = outcome
+            if error is not None:
+                print(f"Error analyzing {item['filename']}: {error}")
+                self._db.finish_batch_job_item(job["id"], item["id"], error=str(error))
+                continue
+
+            try:
+                analysis_id = str(uuid.uuid4())
+                result = analysis_result(analysis_id, job["patient_name"], job["height_cm"], analysis_data)
+                self._db.finish_batch_job_item_with_analysis(job["id"], item["id"], job["patient_id"],
+                                                             analysis_id, analysis_data,
+                                                             result.model_dump(mode='json'))
+            except Exception as e:
+                print(f"Error storing {item['filename']}: {e}")
+                self._db.finish_batch_job_item(job["id"], item["id"], error=str(e))
+                continue
+
+            try:
+                os.remove(item["upload_path"])
+            except OSError:
+                pass
+
+    # --- Progress ----------------------------------------------------------------
+
+    def _notify(self, job_id: str):
+        event = self._progress.pop(job_id, None)
+        if event is not None:
+            event.set()
+
+    def progress_event(self, job_id: str) -> asyncio.Event:
+        """Event set the next time the job records results or finishes. Take it before querying, then wait."""
+        return self._progress.setdefault(job_id, asyncio.Event())
+
+    @staticmethod
+    async def wait_for_progress(event: asyncio.Event, timeout: float):
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
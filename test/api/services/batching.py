@@ -0,0 +1,131 @@
+import asyncio
+import os
+import time
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from api.services.inference_pool import InferenceExecutor
+from api.services.metrics import Metrics
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent single-image /analyze requests into batched forward passes.
+
+    Jobs are queued per inference confidence, so requests with different thresholds
+    above INFERENCE_CONF_FLOOR share one forward pass. A queue is flushed to the inference
+    pool as soon as it holds MICROBATCH_MAX_SIZE images, or MICROBATCH_MAX_WAIT_MS
+    after its first job arrived, whichever comes first. Every caller gets back
+    its own analysis dict (or its own exception).
+    MICROBATCH_MAX_SIZE=1 disables coalescing and sends each job straight through.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(MicroBatcher, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self.max_wait_ms = float(os.getenv("MICROBATCH_MAX_WAIT_MS", 10))
+        self.max_batch = int(os.getenv("MICROBATCH_MAX_SIZE", 8))
+        self._executor = InferenceExecutor()
+
+        # inference confidence -> [(data, patient_name, height_cm, confidence_threshold, enqueued_at, future)]
+        self._pending: Dict[float, List[Tuple[bytes, str, float, float, float, asyncio.Future]]] = {}
+        self._timers: Dict[float, asyncio.TimerHandle] = {}
+
+        self.in_flight = 0
+        self.batches_run = 0
+        self.images_run = 0
+        self.batch_size_counts = Counter()
+        self._initialized = True
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_batch > 1
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(len(jobs) for jobs in self._pending.values())
+
+    async def submit(self, data: bytes, patient_name: str, height_cm: float,
+                     confidence_threshold: float = 0.25) -> Dict:
+        if not self.enabled:
+            self._record_batch(1)
+            return await self._executor.analyze(data, patient_name, height_cm, confidence_threshold)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        inference_conf = self._executor.inference_conf(confidence_threshold)
+        queue = self._pending.setdefault(inference_conf, [])
+        queue.append((data, patient_name, height_cm, confidence_threshold, time.perf_counter(), future))
+
+        if len(queue) >= self.max_batch:
+            self._flush(inference_conf)
+        elif len(queue) == 1:
+            self._timers[inference_conf] = loop.call_later(
+                self.max_wait_ms / 1000, self._flush, inference_conf
+            )
+
+        return await future
+
+    def _flush(self, inference_conf: float):
+        timer = self._timers.pop(inference_conf, None)
+        if timer is not None:
+            timer.cancel()
+
+        jobs = self._pending.pop(inference_conf, [])
+        if jobs:
+            asyncio.ensure_future(self._run_batch(jobs))
+
+    async def _run_batch(self, jobs: List[Tuple[bytes, str, float, float, float, asyncio.Future]]):
+        self._record_batch(len(jobs))
+        flushed_at = time.perf_counter()
+        queue_waits = [flushed_at - enqueued_at for *_, enqueued_at, _ in jobs]
+        for wait in queue_waits:
+            Metrics().stage_seconds.observe(wait, stage='queue')
+
+        self.in_flight += len(jobs)
+        try:
+            outcomes = await self._executor.analyze_batch([job[:4] for job in jobs])
+        except Exception as e:
+            for *_, future in jobs:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self.in_flight -= len(jobs)
+
+        for (*_, future), wait, (analysis_data, error) in zip(jobs, queue_waits, outcomes):
+            if future.done():
+                # Caller went away (client disconnected); drop the result
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                analysis_data.setdefault('timings', {})['queue'] = wait
+                future.set_result(analysis_data)
+
+    def _record_batch(self, size: int):
+        self.batches_run += 1
+        self.images_run += size
+        self.batch_size_counts[size] += 1
+
+    def stats(self) -> Dict:
+        return {
+            "enabled": self.enabled,
+            "max_batch": self.max_batch,
+            "max_wait_ms": self.max_wait_ms,
+            "queue_depth": self.queue_depth,
+            "in_flight": self.in_flight,
+            "batches_run": self.batches_run,
+            "images_run": self.images_run,
+            "mean_batch_size": round(self.images_run / self.batches_run, 2) if self.batches_run else 0,
+            "batch_size_counts": dict(sorted(self.batch_size_counts.items()))
+        }
@@ -6,6 +6,8 @@ from datetime import datetime
 from typing import Optional, List, Dict, Any
 from passlib.hash import bcrypt
 
+from core.keypoints import keypoints_as_dicts, pack_keypoints, unpack_keypoints
+
 def dict_factory(cursor, row):
     fields = [column[0] for column in cursor.description]
     return {key: value for key, value in zip(fields, row)}
@@ -66,10 +68,19 @@ class DatabaseService:
                 detections TEXT,
                 conversion_ratio REAL,
                 actual_height_mm REAL,
+                image_width INTEGER,
+                image_height INTEGER,
                 FOREIGN KEY (patient_id) REFERENCES patients (id)
             )
         ''')
 
+        # Databases created before image sizes were stored (needed to re-score from keypoints)
+        cursor.execute("PRAGMA table_info(analyses)")
+        analysis_columns = {row['name'] for row in cursor.fetchall()}
+        for column in ('image_width', 'image_height'):
+            if column not in analysis_columns:
+                cursor.execute(f"ALTER TABLE analyses ADD COLUMN {column} INTEGER")
+
         # Create keypoints table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS keypoints (
@@ -81,6 +92,55 @@ class DatabaseService:
             )
         ''')
 
+        # Create batch job tables (asynchronous /jobs API; survive server restarts)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS batch_jobs (
+                id TEXT PRIMARY KEY,
+                patient_id TEXT NOT NULL,
+                patient_name TEXT NOT NULL,
+                height_cm REAL NOT NULL,
+                confidence_threshold REAL NOT NULL,
+                status TEXT NOT NULL,
+                total INTEGER NOT NULL,
+                processed INTEGER NOT NULL DEFAULT 0,
+                failed INTEGER NOT NULL DEFAULT 0,
+                created_at TIMESTAMP NOT NULL,
+                updated_at TIMESTAMP NOT NULL,
+                FOREIGN KEY (patient_id) REFERENCES patients (id)
+            )
+        ''')
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS batch_job_items (
+                id TEXT PRIMARY KEY,
+                job_id TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                filename TEXT,
+                upload_path TEXT NOT NULL,
+                status TEXT NOT NULL,
+                analysis_id TEXT,
+                result TEXT,
+                error TEXT,
+                updated_at TIMESTAMP,
+                FOREIGN KEY (job_id) REFERENCES batch_jobs (id)
+            )
+        ''')
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_batch_job_items_job ON batch_job_items (job_id, position)"
+        )
+
+        # Create sessions table (one multi-view assessment: views maps view -> analysis id)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS sessions (
+                id TEXT PRIMARY KEY,
+                patient_id TEXT NOT NULL,
+                created_at TIMESTAMP NOT NULL,
+                views TEXT NOT NULL,
+                summary TEXT,
+                FOREIGN KEY (patient_id) REFERENCES patients (id)
+            )
+        ''')
+
         conn.commit()
         conn.close()
 
@@ -155,8 +215,20 @@ class DatabaseService:
     def create_analysis(self, patient_id: str, analysis_data: Dict) -> Dict:
         conn = self._get_connection()
         cursor = conn.cursor()
-        
         analysis_id = str(uuid.uuid4())
+
+        try:
+            self._insert_analysis(cursor, analysis_id, patient_id, analysis_data)
+            conn.commit()
+            
+            cursor.execute("SELECT * FROM analyses WHERE id = ?", (analysis_id,))
+            row = cursor.fetchone()
+            return self._row_to_analysis_dict(row)
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _insert_analysis(cursor, analysis_id: str, patient_id: str, analysis_data: Dict):
         analysis_date = datetime.now()
         
         # Serialize dictionaries to JSON strings
@@ -168,25 +240,18 @@ class DatabaseService:
         postural_angles = json.dumps(analysis_data.get("postural_angles")) if analysis_data.get("postural_angles") else None
         detections = json.dumps(analysis_data.get("detections")) if analysis_data.get("detections") else None
         
-        try:
-            cursor.execute('''
-                INSERT INTO analyses (
-                    id, patient_id, analysis_date, shoulder_data, hip_data, 
-                    spinal_data, head_data, posture_score, postural_angles, 
-                    detections, conversion_ratio, actual_height_mm
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                analysis_id, patient_id, analysis_date, shoulder_data, hip_data,
-                spinal_data, head_data, posture_score, postural_angles,
-                detections, analysis_data.get("conversion_ratio"), analysis_data.get("actual_height_mm")
-            ))
-            conn.commit()
-            
-            cursor.execute("SELECT * FROM analyses WHERE id = ?", (analysis_id,))
-            row = cursor.fetchone()
-            return self._row_to_analysis_dict(row)
-        finally:
-            conn.close()
+        cursor.execute('''
+            INSERT INTO analyses (
+                id, patient_id, analysis_date, shoulder_data, hip_data, 
+                spinal_data, head_data, posture_score, postural_angles, 
+                detections, conversion_ratio, actual_height_mm, image_width, image_height
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            analysis_id, patient_id, analysis_date, shoulder_data, hip_data,
+            spinal_data, head_data, posture_score, postural_angles,
+            detections, analysis_data.get("conversion_ratio"), analysis_data.get("actual_height_mm"),
+            analysis_data.get("image_width"), analysis_data.get("image_height")
+        ))
 
     def get_analysis(self, analysis_id: str) -> Optional[Dict]:
         conn = self._get_connection()
@@ -215,27 +280,281 @@ class DatabaseService:
         finally:
             conn.close()
 
-    def save_keypoints(self, analysis_id: str, keypoints_data: Dict) -> Dict:
+    def list_rescorable_analyses(self, limit: int = 500, offset: int = 0) -> List[Dict]:
+        """Analyses with a stored image size (oldest first); older rows cannot be re-scored."""
         conn = self._get_connection()
         cursor = conn.cursor()
-        
-        kp_id = str(uuid.uuid4())
-        keypoints_json = json.dumps(keypoints_data)
-        
+
         try:
             cursor.execute(
-                "INSERT INTO keypoints (id, analysis_id, keypoints) VALUES (?, ?, ?)",
-                (kp_id, analysis_id, keypoints_json)
+                "SELECT * FROM analyses WHERE image_width IS NOT NULL AND image_height IS NOT NULL "
+                "ORDER BY analysis_date LIMIT ? OFFSET ?",
+                (limit, offset)
             )
+            return [self._row_to_analysis_dict(row) for row in cursor.fetchall()]
+        finally:
+            conn.close()
+
+    def update_analysis_scores(self, analysis_id: str, analysis_data: Dict):
+        """Overwrite the calibration and component scores of a stored analysis (re-scoring)."""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute('''
+                UPDATE analyses SET shoulder_data = ?, hip_data = ?, spinal_data = ?, head_data = ?,
+                    posture_score = ?, conversion_ratio = ?
+                WHERE id = ?
+            ''', (
+                json.dumps(analysis_data["shoulder"]), json.dumps(analysis_data["hip"]),
+                json.dumps(analysis_data["spinal"]), json.dumps(analysis_data["head"]),
+                json.dumps(analysis_data["posture_score"]), analysis_data["conversion_ratio"],
+                analysis_id
+            ))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def save_keypoints(self, analysis_id: str, keypoints_data: Dict) -> Dict:
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            kp_id = self._insert_keypoints(cursor, analysis_id, keypoints_data)
             conn.commit()
             return {
                 "id": kp_id,
                 "analysis_id": analysis_id,
-                "keypoints": keypoints_data
+                "keypoints": keypoints_as_dicts(keypoints_data)
             }
         finally:
             conn.close()
 
+    @staticmethod
+    def _insert_keypoints(cursor, analysis_id: str, keypoints_data: Dict) -> str:
+        kp_id = str(uuid.uuid4())
+        cursor.execute(
+            "INSERT INTO keypoints (id, analysis_id, keypoints) VALUES (?, ?, ?)",
+            (kp_id, analysis_id, json.dumps(pack_keypoints(keypoints_data)))
+        )
+        return kp_id
+
+    def get_keypoints(self, analysis_id: str) -> Optional[Dict]:
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(
+                "SELECT keypoints FROM keypoints WHERE analysis_id = ? ORDER BY created_at DESC LIMIT 1",
+                (analysis_id,)
+            )
+            row = cursor.fetchone()
+            if row and row.get('keypoints'):
+                return unpack_keypoints(json.loads(row['keypoints']))
+            return None
+        finally:
+            conn.close()
+
+    def create_batch_job(self, job_id: str, patient_id: str, patient_name: str, height_cm: float,
+                         confidence_threshold: float, uploads: List[Dict]) -> Dict:
+        """Insert a queued job and one pending item per `{'filename', 'upload_path'}` upload."""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        now = datetime.now()
+
+        try:
+            cursor.execute(
+                """INSERT INTO batch_jobs (
+                    id, patient_id, patient_name, height_cm, confidence_threshold,
+                    status, total, created_at, updated_at
+                ) VALUES (?, ?, ?, ?, ?, 'queued', ?, ?, ?)""",
+                (job_id, patient_id, patient_name, height_cm, confidence_threshold, len(uploads), now, now)
+            )
+            cursor.executemany(
+                """INSERT INTO batch_job_items (id, job_id, position, filename, upload_path, status)
+                   VALUES (?, ?, ?, ?, ?, 'pending')""",
+                [(str(uuid.uuid4()), job_id, position, upload["filename"], upload["upload_path"])
+                 for position, upload in enumerate(uploads)]
+            )
+            conn.commit()
+
+            cursor.execute("SELECT * FROM batch_jobs WHERE id = ?", (job_id,))
+            return cursor.fetchone()
+        finally:
+            conn.close()
+
+    def get_batch_job(self, job_id: str) -> Optional[Dict]:
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute("SELECT * FROM batch_jobs WHERE id = ?", (job_id,))
+            return cursor.fetchone()
+        finally:
+            conn.close()
+
+    def list_unfinished_batch_jobs(self) -> List[Dict]:
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute(
+                "SELECT * FROM batch_jobs WHERE status IN ('queued', 'running') ORDER BY created_at"
+            )
+            return cursor.fetchall()
+        finally:
+            conn.close()
+
+    def set_batch_job_status(self, job_id: str, status: str):
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute(
+                "UPDATE batch_jobs SET status = ?, updated_at = ? WHERE id = ?",
+                (status, datetime.now(), job_id)
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def list_batch_job_items(self, job_id: str, status: Optional[str] = None,
+                             after_position: int = -1) -> List[Dict]:
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        try:
+            query = "SELECT * FROM batch_job_items WHERE job_id = ? AND position > ?"
+            params = [job_id, after_position]
+            if status == 'finished':
+                query += " AND status != 'pending'"
+            elif status:
+                query += " AND status = ?"
+                params.append(status)
+            cursor.execute(query + " ORDER BY position", params)
+
+            rows = cursor.fetchall()
+            for row in rows:
+                if row.get('result'):
+                    row['result'] = json.loads(row['result'])
+            return rows
+        finally:
+            conn.close()
+
+    def finish_batch_job_item(self, job_id: str, item_id: str, analysis_id: Optional[str] = None,
+                              result: Optional[Dict] = None, error: Optional[str] = None):
+        """Record one item's outcome and bump the job counters in the same transaction."""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        try:
+            self._finish_item(cursor, job_id, item_id, analysis_id, result, error)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def finish_batch_job_item_with_analysis(self, job_id: str, item_id: str, patient_id: str,
+                                            analysis_id: str, analysis_data: Dict, result: Dict) -> bool:
+        """
+        Store an item's analysis (and keypoints) and mark the item done in one transaction,
+        so a crash cannot leave an analysis behind for an item that is re-analyzed on resume.
+        Returns False, storing nothing, if the item was already finished.
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        try:
+            if not self._finish_item(cursor, job_id, item_id, analysis_id, result, None):
+                conn.rollback()
+                return False
+            self._insert_analysis(cursor, analysis_id, patient_id, analysis_data)
+            if analysis_data.get('keypoints'):
+                self._insert_keypoints(cursor, analysis_id, analysis_data['keypoints'])
+            conn.commit()
+            return True
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _finish_item(cursor, job_id: str, item_id: str, analysis_id: Optional[str],
+                     result: Optional[Dict], error: Optional[str]) -> bool:
+        now = datetime.now()
+        failed = error is not None
+        cursor.execute(
+            """UPDATE batch_job_items
+               SET status = ?, analysis_id = ?, result = ?, error = ?, updated_at = ?
+               WHERE id = ? AND status = 'pending'""",
+            ('failed' if failed else 'done', analysis_id,
+             json.dumps(result) if result is not None else None, error, now, item_id)
+        )
+        if not cursor.rowcount:
+            return False
+        cursor.execute(
+            """UPDATE batch_jobs
+               SET processed = processed + 1, failed = failed + ?, updated_at = ?
+               WHERE id = ?""",
+            (1 if failed else 0, now, job_id)
+        )
+        return True
+
+    def fail_batch_job(self, job_id: str, error: str):
+        """Give up on a job: its pending items fail with `error` and the job ends as 'failed'."""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        now = datetime.now()
+
+        try:
+            cursor.execute(
+                """UPDATE batch_job_items SET status = 'failed', error = ?, updated_at = ?
+                   WHERE job_id = ? AND status = 'pending'""",
+                (error, now, job_id)
+            )
+            given_up = cursor.rowcount
+            cursor.execute(
+                """UPDATE batch_jobs
+                   SET status = 'failed', processed = processed + ?, failed = failed + ?, updated_at = ?
+                   WHERE id = ?""",
+                (given_up, given_up, now, job_id)
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def create_session(self, patient_id: str, views: Dict[str, str], summary: Dict) -> Dict:
+        """Insert a multi-view session; `views` maps each view name to its analysis id."""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        session_id = str(uuid.uuid4())
+
+        try:
+            cursor.execute(
+                "INSERT INTO sessions (id, patient_id, created_at, views, summary) VALUES (?, ?, ?, ?, ?)",
+                (session_id, patient_id, datetime.now(), json.dumps(views), json.dumps(summary))
+            )
+            conn.commit()
+
+            cursor.execute("SELECT * FROM sessions WHERE id = ?", (session_id,))
+            return self._row_to_session_dict(cursor.fetchone())
+        finally:
+            conn.close()
+
+    def get_session(self, session_id: str) -> Optional[Dict]:
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute("SELECT * FROM sessions WHERE id = ?", (session_id,))
+            row = cursor.fetchone()
+            return self._row_to_session_dict(row) if row else None
+        finally:
+            conn.close()
+
+    def _row_to_session_dict(self, row) -> Dict:
+        data = dict(row)
+        data['views'] = json.loads(data['views'])
+        data['summary'] = json.loads(data['summary']) if data.get('summary') else None
+        return data
+
     def health_check(self) -> bool:
         try:
             conn = self._get_connection()
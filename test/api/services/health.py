@@ -0,0 +1,73 @@
+import asyncio
+import os
+from datetime import datetime
+from typing import Dict
+
+from fastapi.concurrency import run_in_threadpool
+
+from api.services.database import DatabaseService
+from api.services.inference_pool import InferenceExecutor
+
+
+class HealthMonitor:
+    """
+    Keeps a cached health snapshot so probes never touch the database or the model.
+
+    The database check is refreshed every HEALTH_REFRESH_SECONDS by a background
+    task; model status is read from the inference executor, which is a plain
+    attribute lookup. /live, /ready and /health all answer from memory.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(HealthMonitor, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self.refresh_seconds = float(os.getenv("HEALTH_REFRESH_SECONDS", 5))
+        self.database_connected = False
+        self.checked_at = None
+        self._executor = InferenceExecutor()
+        self._task = None
+        self._initialized = True
+
+    async def refresh(self):
+        self.database_connected = await run_in_threadpool(DatabaseService().health_check)
+        self.checked_at = datetime.now()
+
+    async def _refresh_loop(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                print(f"Health refresh failed: {e}")
+                self.database_connected = False
+            await asyncio.sleep(self.refresh_seconds)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._refresh_loop())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    @property
+    def ready(self) -> bool:
+        return self._executor.model_loaded and self.database_connected
+
+    def snapshot(self) -> Dict:
+        return {
+            "status": "healthy" if self.ready else "degraded",
+            "timestamp": self.checked_at or datetime.now(),
+            "model_loaded": self._executor.model_loaded,
+            "model_state": self._executor.state,
+            "model_load_seconds": self._executor.model_load_seconds,
+            "database_connected": self.database_connected
+        }
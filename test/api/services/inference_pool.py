@@ -0,0 +1,363 @@
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+from api.services.analyzer import ImageDecodeError, PostureAnalyzerService
+from api.services.backends import create_backend
+from api.services.metrics import Metrics, timed
+from api.services.profiling import memory_peak, profiled_calls
+from api.services.result_cache import InferenceCache, model_version
+from core import RawResult, tracing
+
+
+# --- Worker side -------------------------------------------------------------
+# Everything below runs inside the pool processes. Each process builds its own
+# PostureAnalyzerService (and therefore its own YOLO model) exactly once.
+
+_worker_service: Optional[PostureAnalyzerService] = None
+
+
+def _init_worker():
+    global _worker_service
+    _worker_service = PostureAnalyzerService()
+
+
+def _get_worker_service() -> PostureAnalyzerService:
+    if _worker_service is None:
+        _init_worker()
+    return _worker_service
+
+
+def _worker_warmup() -> Optional[str]:
+    """Warm up the worker's model; returns the cache version of the file it loaded, or None."""
+    service = _get_worker_service()
+    if not service.is_model_loaded():
+        return None
+    service.warmup()
+    # Stamped after loading: the backend may just have exported the file it runs
+    return model_version(create_backend(service.backend_name, service.model_path))
+
+
+def _worker_analyze_batch(items: List[Tuple[bytes, str, float, float, Optional[RawResult]]],
+                          inference_conf: float) -> List[Tuple[Optional[Dict], Optional[Exception]]]:
+    """Analyze several images with one batched forward pass at `inference_conf`.
+
+    Each item carries its own confidence threshold, applied as a filter on the
+    shared low-confidence pass. Items that come with a cached `RawResult` skip the
+    model and only get the geometry pass. Returns one `(analysis_data, error)` pair
+    per item so a single bad image does not fail the whole batch. Each analysis
+    carries per-stage 'timings'; the batched forward pass is split evenly.
+    """
+    service = _get_worker_service()
+    outcomes: List[Tuple[Optional[Dict], Optional[Exception]]] = [(None, None)] * len(items)
+
+    to_infer = []
+    for i, (data, patient_name, height_cm, confidence_threshold, raw_result) in enumerate(items):
+        timings = {}
+        with timed(timings, 'decode'):
+            img, original_shape = service.decode_image(data, service.decode_max_side)
+        if img is None:
+            outcomes[i] = (None, ImageDecodeError("Cannot decode image"))
+        elif raw_result is not None:
+            try:
+                outcomes[i] = (service.analyze_result(img, [raw_result], patient_name, height_cm,
+                                                      confidence_threshold, original_shape, timings), None)
+            except Exception as e:
+                outcomes[i] = (None, e)
+        else:
+            to_infer.append((i, img, original_shape, patient_name, height_cm, confidence_threshold, timings))
+
+    if not to_infer:
+        return outcomes
+
+    started = time.perf_counter()
+    results = service.predict_batch([img for _, img, *_ in to_infer], inference_conf)
+    inference_share = (time.perf_counter() - started) / len(to_infer)
+
+    for (i, img, original_shape, patient_name, height_cm, confidence_threshold, timings), result in zip(to_infer, results):
+        timings['inference'] = inference_share
+        try:
+            outcomes[i] = (service.analyze_result(img, [result], patient_name, height_cm,
+                                                  confidence_threshold, original_shape, timings), None)
+        except Exception as e:
+            outcomes[i] = (None, e)
+
+    return outcomes
+
+
+def _worker_profile(data: bytes, patient_name: str, height_cm: float, confidence_threshold: float,
+                    inference_conf: float, with_calls: bool = False, with_trace: bool = False) -> Dict:
+    """Analyze one image on its own and attach a 'profile' report.
+
+    The report holds the input and decoded sizes, the number of detections, the
+    peak memory of the whole analysis and, if `with_calls`, a cProfile summary of
+    the AdvancedPoseAnalyzer geometry calls. `with_trace` also attaches the
+    geometry trace records (see core.tracing) under 'trace'.
+    """
+    service = _get_worker_service()
+    report = {}
+    timings = {}
+
+    with memory_peak(report):
+        with timed(timings, 'decode'):
+            img, original_shape = service.decode_image(data, service.decode_max_side)
+        if img is None:
+            raise ImageDecodeError("Cannot decode image")
+
+        with timed(timings, 'inference'):
+            results = service.predict_batch([img], inference_conf)
+
+        with profiled_calls(report, with_calls), tracing.collect(tracing.DEBUG if with_trace else tracing.OFF) as trace:
+            analysis_data = service.analyze_result(img, results, patient_name, height_cm,
+                                                   confidence_threshold, original_shape, timings)
+
+    report['input'] = {
+        'bytes': len(data),
+        'original_shape': list(original_shape),
+        'decoded_shape': list(img.shape[:2])
+    }
+    report['detections'] = analysis_data['detections']['total_detections']
+    analysis_data['profile'] = report
+    if with_trace:
+        analysis_data['trace'] = trace.to_list()
+    return analysis_data
+
+
+def _worker_analyze_people(data: bytes, height_cm: float, heights_cm: Optional[List[Optional[float]]],
+                           confidence_threshold: float, inference_conf: float,
+                           raw_result: Optional[RawResult]) -> Dict:
+    """Analyze every person in one image (see PostureAnalyzerService.analyze_people).
+
+    A cached `raw_result` skips the model and only the geometry runs.
+    """
+    service = _get_worker_service()
+    timings = {}
+    with timed(timings, 'decode'):
+        img, original_shape = service.decode_image(data, service.decode_max_side)
+    if img is None:
+        raise ImageDecodeError("Cannot decode image")
+
+    if raw_result is not None:
+        results = [raw_result]
+    else:
+        with timed(timings, 'inference'):
+            results = service.predict_batch([img], inference_conf)
+
+    return service.analyze_people(img, results, height_cm, confidence_threshold, original_shape, timings,
+                                  heights_cm)
+
+
+# --- Server side -------------------------------------------------------------
+
+class ModelNotReadyError(RuntimeError):
+    """Raised when a job is submitted before the workers finished loading the model."""
+
+
+class InferenceExecutor:
+    """
+    Pool of inference workers shared by the API routes.
+
+    INFERENCE_WORKERS > 0 starts that many processes, each holding its own model,
+    so concurrent requests run in parallel and never block the event loop.
+    INFERENCE_WORKERS = 0 keeps the model in the API process and runs jobs on a
+    single background thread (useful for debugging or very small machines).
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(InferenceExecutor, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self.workers = int(os.getenv("INFERENCE_WORKERS", 1))
+        self.batch_size = int(os.getenv("INFERENCE_BATCH_SIZE", 8))
+        self.conf_floor = float(os.getenv("INFERENCE_CONF_FLOOR", 0.05))
+        self.state = "stopped"  # stopped -> loading -> ready | failed
+        self.cache = InferenceCache()
+        self.metrics = Metrics()
+        self.model_load_seconds = None
+        self._pool = None
+        self._loader = None
+        self._initialized = True
+
+    @property
+    def model_loaded(self) -> bool:
+        return self.state == "ready"
+
+    def inference_conf(self, confidence_threshold: float) -> float:
+        """Confidence the model runs at to serve `confidence_threshold` (see INFERENCE_CONF_FLOOR)."""
+        return min(self.conf_floor, confidence_threshold)
+
+    def start(self) -> bool:
+        """Create the pool, load and warm up the model in every worker. Blocking; run it off the event loop."""
+        if self._pool is not None:
+            return self.model_loaded
+
+        self.state = "loading"
+        started = time.perf_counter()
+
+        if self.workers > 0:
+            # spawn: forking a process that already imported torch is not safe
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker
+            )
+        else:
+            self._pool = ThreadPoolExecutor(max_workers=1, initializer=_init_worker)
+
+        try:
+            # One warm-up job per worker so every process has its model loaded and its first pass done
+            warmups = [self._pool.submit(_worker_warmup) for _ in range(max(self.workers, 1))]
+            versions = [f.result() for f in warmups]
+            loaded = all(versions)
+            if loaded:
+                self.cache.set_model_version("|".join(sorted(set(versions))))
+        except Exception as e:
+            print(f"Inference workers failed to start: {e}")
+            loaded = False
+
+        self.model_load_seconds = round(time.perf_counter() - started, 3)
+        self.state = "ready" if loaded else "failed"
+        print(f"Inference workers {self.state} in {self.model_load_seconds}s ({self.workers} worker(s))")
+        return loaded
+
+    def start_in_background(self):
+        """Run `start` off the event loop; the server keeps serving while `state` is 'loading'."""
+        if self._loader is None:
+            self._loader = asyncio.ensure_future(run_in_threadpool(self.start))
+
+    def shutdown(self):
+        if self._loader is not None:
+            self._loader.cancel()
+            self._loader = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            self.state = "stopped"
+
+    async def run(self, fn, *args):
+        if not self.model_loaded:
+            raise ModelNotReadyError(f"Model is not ready (state: {self.state})")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, fn, *args)
+
+    async def analyze(self, data: bytes, patient_name: str, height_cm: float,
+                      confidence_threshold: float = 0.25) -> Dict:
+        outcomes = await self.analyze_batch([(data, patient_name, height_cm, confidence_threshold)])
+        analysis_data, error = outcomes[0]
+        if error is not None:
+            raise error
+        return analysis_data
+
+    async def profile(self, data: bytes, patient_name: str, height_cm: float,
+                      confidence_threshold: float = 0.25, calls: bool = False, trace: bool = False) -> Dict:
+        """Analyze one image with a profiling report under 'profile' (and its trace under 'trace').
+
+        Bypasses the micro-batcher and the inference cache so every stage really
+        runs for this image alone. Its timings are not fed to the stage histograms,
+        since tracing and cProfile slow the run down.
+        """
+        started = time.perf_counter()
+        analysis_data = await self.run(_worker_profile, data, patient_name, height_cm, confidence_threshold,
+                                       self.inference_conf(confidence_threshold), calls, trace)
+        pool_seconds = time.perf_counter() - started
+
+        timings = analysis_data['timings']
+        timings['dispatch'] = max(pool_seconds - sum(timings.values()), 0.0)
+        analysis_data.pop('raw_result', None)
+        return analysis_data
+
+    async def analyze_people(self, data: bytes, height_cm: float, confidence_threshold: float = 0.25,
+                             heights_cm: Optional[List[Optional[float]]] = None) -> Dict:
+        """Analyze every person in one photo with a single inference pass.
+
+        Skips the micro-batcher (a group photo is already one forward pass for
+        many people) but reads and fills the inference cache like `analyze_batch`.
+        """
+        if not self.model_loaded:
+            raise ModelNotReadyError(f"Model is not ready (state: {self.state})")
+
+        started = time.perf_counter()
+        keys, cached = await run_in_threadpool(self._cache_lookup, [(data, None, height_cm, confidence_threshold)])
+        lookup_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        group = await self.run(_worker_analyze_people, data, height_cm, heights_cm, confidence_threshold,
+                               self.inference_conf(confidence_threshold), cached[0])
+        pool_seconds = time.perf_counter() - started
+
+        timings = group['timings']
+        timings['dispatch'] = max(pool_seconds - sum(timings.values()), 0.0)
+        timings['cache_lookup'] = lookup_seconds
+        self.metrics.observe_stages(timings)
+
+        raw_result = group.pop('raw_result', None)
+        if cached[0] is None and keys[0] is not None and raw_result is not None:
+            await run_in_threadpool(self._cache_store, [(keys[0], raw_result)])
+        return group
+
+    async def analyze_batch(self, items: List[Tuple[bytes, str, float, float]]) -> List[Tuple[Optional[Dict], Optional[Exception]]]:
+        """Analyze `(image_bytes, patient_name, height_cm, confidence_threshold)` items.
+
+        Items may ask for different thresholds; the model runs once at the lowest
+        inference confidence they need and each item is filtered to its own threshold.
+        Model output is served from the cache when possible.
+        """
+        if not self.model_loaded:
+            raise ModelNotReadyError(f"Model is not ready (state: {self.state})")
+
+        inference_conf = min(self.inference_conf(threshold) for *_, threshold in items)
+        started = time.perf_counter()
+        keys, cached = await run_in_threadpool(self._cache_lookup, items)
+        lookup_share = (time.perf_counter() - started) / len(items)
+        worker_items = [(data, patient_name, height_cm, threshold, raw)
+                        for (data, patient_name, height_cm, threshold), raw in zip(items, cached)]
+
+        started = time.perf_counter()
+        outcomes = await self.run(_worker_analyze_batch, worker_items, inference_conf)
+        pool_seconds = time.perf_counter() - started
+
+        # Time in the pool not accounted for by worker stages: queueing behind other batches and pickling
+        worker_seconds = sum(sum(analysis_data.get('timings', {}).values())
+                             for analysis_data, _ in outcomes if analysis_data is not None)
+        dispatch_share = max(pool_seconds - worker_seconds, 0.0) / len(items)
+
+        fresh = []
+        for (*_, threshold), key, raw, (analysis_data, _) in zip(items, keys, cached, outcomes):
+            if analysis_data is None:
+                continue
+            timings = analysis_data.setdefault('timings', {})
+            timings['cache_lookup'] = lookup_share
+            timings['dispatch'] = dispatch_share
+            self.metrics.observe_stages(timings)
+
+            raw_result = analysis_data.pop('raw_result', None)
+            # Only cache output produced at the confidence this item's key stands for
+            if raw is None and key is not None and raw_result is not None \
+                    and self.inference_conf(threshold) == inference_conf:
+                fresh.append((key, raw_result))
+        if fresh:
+            await run_in_threadpool(self._cache_store, fresh)
+
+        return outcomes
+
+    def _cache_lookup(self, items):
+        if not self.cache.enabled:
+            return [None] * len(items), [None] * len(items)
+        keys = [self.cache.key_for(data, self.inference_conf(threshold)) for data, _, _, threshold in items]
+        return keys, [self.cache.get(key) for key in keys]
+
+    def _cache_store(self, entries):
+        for key, raw_result in entries:
+            self.cache.put(key, raw_result)
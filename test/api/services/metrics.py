@@ -0,0 +1,153 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Latency buckets in seconds, from sub-millisecond geometry up to multi-second batches
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@contextmanager
+def timed(timings: Dict[str, float], stage: str):
+    """Add the wall time of the `with` block to `timings[stage]` (seconds)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - start
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = []
+    for key, value in labels.items():
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{key}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return str(value) if isinstance(value, int) else repr(float(value))
+
+
+class Histogram:
+    """Cumulative-bucket histogram rendered in the Prometheus text format."""
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = tuple(buckets) + (float("inf"),)
+        self._series: Dict[Tuple[str, ...], List] = {}  # labels -> [bucket counts, sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._series.items()):
+                labels = dict(zip(self.label_names, key))
+                for bound, bucket_count in zip(self.buckets, counts):
+                    bucket_labels = _format_labels({**labels, "le": _format_value(bound)})
+                    lines.append(f"{self.name}_bucket{bucket_labels} {bucket_count}")
+                lines.append(f"{self.name}_sum{_format_labels(labels)} {total!r}")
+                lines.append(f"{self.name}_count{_format_labels(labels)} {count}")
+        return lines
+
+
+class Counter:
+    """Monotonic counter rendered in the Prometheus text format."""
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._values: Dict[Tuple[str, ...], int] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(dict(zip(self.label_names, key)))} {value}")
+        return lines
+
+
+class Metrics:
+    """
+    Process-wide latency histograms for the API.
+
+    Inference workers measure their own stages (decode, inference, keypoints,
+    render, encode, geometry) and return them with each result; the executor and
+    the routes feed them into `stage_seconds` here, in the API process. Point-in-time
+    values (queue depth, cache counters, model load time) are passed to `render`
+    by the /metrics endpoint.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(Metrics, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self.stage_seconds = Histogram(
+            "posture_stage_seconds",
+            "Time spent per analysis stage (per image; batched inference is split evenly).",
+            ("stage",)
+        )
+        self.request_seconds = Histogram(
+            "posture_http_request_seconds",
+            "HTTP request latency by route.",
+            ("method", "route", "status")
+        )
+        self.item_errors = Counter(
+            "posture_item_errors_total",
+            "Images that failed inside multi-image requests, by route and stage (analyze or store).",
+            ("route", "stage")
+        )
+        self._initialized = True
+
+    def observe_stages(self, timings: Optional[Dict[str, float]]):
+        for stage, seconds in (timings or {}).items():
+            self.stage_seconds.observe(seconds, stage=stage)
+
+    def render(self, gauges: Iterable[Tuple[str, str, str, float, Dict[str, str]]] = ()) -> str:
+        """Prometheus text exposition; `gauges` are `(name, type, help, value, labels)` tuples."""
+        lines = self.stage_seconds.render() + self.request_seconds.render() + self.item_errors.render()
+
+        described = set()
+        for name, metric_type, help_text, value, labels in gauges:
+            if value is None:
+                continue
+            if name not in described:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                described.add(name)
+            lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        return "\n".join(lines) + "\n"
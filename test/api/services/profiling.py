@@ -0,0 +1,63 @@
+import cProfile
+import inspect
+import os
+import pstats
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, List
+
+from core import AdvancedPoseAnalyzer
+
+
+@contextmanager
+def memory_peak(report: Dict):
+    """Store the peak traced allocation of the `with` block in `report['peak_memory_bytes']`.
+
+    tracemalloc sees Python and NumPy allocations (decoded images, keypoint arrays,
+    the skeleton canvas) but not memory held inside the inference runtime.
+    """
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    try:
+        yield
+    finally:
+        report['peak_memory_bytes'] = max(tracemalloc.get_traced_memory()[1] - baseline, 0)
+        if not already_tracing:
+            tracemalloc.stop()
+
+
+@contextmanager
+def profiled_calls(report: Dict, enabled: bool = True, limit: int = 25):
+    """cProfile the `with` block and store the AdvancedPoseAnalyzer calls in `report['calls']`."""
+    if not enabled:
+        yield
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        report['calls'] = pose_analyzer_calls(profiler, limit)
+
+
+def pose_analyzer_calls(profiler: cProfile.Profile, limit: int = 25) -> List[Dict]:
+    """Functions defined in core/pose_analyzer.py, slowest (cumulative) first."""
+    source = os.path.normcase(os.path.abspath(inspect.getsourcefile(AdvancedPoseAnalyzer)))
+    rows = []
+    for (filename, line, function), (_, calls, own, cumulative, _) in pstats.Stats(profiler).stats.items():
+        if os.path.normcase(os.path.abspath(filename)) != source:
+            continue
+        rows.append({
+            'function': function,
+            'line': line,
+            'calls': calls,
+            'own_ms': round(own * 1000, 3),
+            'cumulative_ms': round(cumulative * 1000, 3)
+        })
+    rows.sort(key=lambda row: row['cumulative_ms'], reverse=True)
+    return rows[:limit]
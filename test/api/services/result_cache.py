@@ -0,0 +1,238 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+from api.services.backends import create_backend
+from core import RawResult
+
+
+def _artifact_stamp(path: str) -> str:
+    """Size and mtime of a model file, or of all files in a model folder (OpenVINO)."""
+    try:
+        if os.path.isdir(path):
+            stats = [os.stat(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names]
+        else:
+            stats = [os.stat(path)]
+    except OSError:
+        return "missing"
+    if not stats:
+        return "missing"
+    return f"{sum(st.st_size for st in stats)}:{int(max(st.st_mtime for st in stats))}"
+
+
+def model_version(backend=None) -> str:
+    """Cache key component for the model `backend` (default: the configured one) runs."""
+    backend = backend or create_backend()
+    # Input size and decode downscaling change what the model sees
+    preprocess = f"{os.getenv('INFERENCE_IMGSZ', 640)}:{os.getenv('DECODE_MAX_SIDE', 1280)}"
+    path = backend.artifact_path()
+    if path is None:
+        # Synthetic output depends on the stub settings, not on any weights file
+        stub = ":".join(os.getenv(name, "") for name in ("STUB_CLASSES", "STUB_DETECTIONS", "STUB_SEED"))
+        return f"{backend.name}:{preprocess}:{stub}"
+    # The file the backend really runs: an export or INT8 model, not the .pt it came from
+    return f"{backend.name}:{os.path.basename(os.path.normpath(path))}:{_artifact_stamp(path)}:{preprocess}"
+
+
+class InferenceCache:
+    """
+    Two-level cache of raw model output (boxes + keypoints), keyed by content.
+
+    Key = SHA-256(image bytes) + model version + confidence threshold, so a
+    re-uploaded photo skips YOLO entirely and only the AdvancedPoseAnalyzer
+    geometry is recomputed (e.g. after a height correction).
+
+    Level 1: in-memory LRU, bounded by INFERENCE_CACHE_MEMORY_MB.
+    Level 2: one .npz file per key under INFERENCE_CACHE_DIR, bounded by
+             INFERENCE_CACHE_DISK_MB (least recently used files go first).
+    Set INFERENCE_CACHE_MEMORY_MB=0 and INFERENCE_CACHE_DISK_MB=0 to disable.
+
+    The model version part of the key is re-stamped by InferenceExecutor every
+    time the workers (re)load the model (see `set_model_version`).
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(InferenceCache, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self.memory_limit = int(float(os.getenv("INFERENCE_CACHE_MEMORY_MB", 64)) * 1024 * 1024)
+        self.disk_limit = int(float(os.getenv("INFERENCE_CACHE_DISK_MB", 512)) * 1024 * 1024)
+        self.cache_dir = os.getenv("INFERENCE_CACHE_DIR", os.path.join("cache", "inference"))
+        self.model_version = model_version()
+
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes = None  # computed lazily on first disk write
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._initialized = True
+
+    def set_model_version(self, version: str):
+        """
+        Key new entries on the model the workers loaded. On a change the memory level
+        is dropped; disk entries of the old version are no longer reachable and age out.
+        """
+        with self._lock:
+            if version == self.model_version:
+                return
+            self.model_version = version
+            self._memory.clear()
+            self._memory_bytes = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.memory_limit > 0 or self.disk_limit > 0
+
+    def key_for(self, data: bytes, confidence_threshold: float) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        suffix = hashlib.sha256(f"{self.model_version}|{confidence_threshold:.4f}".encode()).hexdigest()[:16]
+        return f"{digest}_{suffix}"
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.npz")
+
+    # --- Lookup ------------------------------------------------------------------
+
+    def get(self, key: str) -> Optional[RawResult]:
+        with self._lock:
+            raw = self._memory.get(key)
+            if raw is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return raw
+
+        raw = self._read_disk(key)
+        with self._lock:
+            if raw is not None:
+                self.disk_hits += 1
+                self._remember(key, raw)
+            else:
+                self.misses += 1
+        return raw
+
+    def _read_disk(self, key: str) -> Optional[RawResult]:
+        if self.disk_limit <= 0:
+            return None
+        path = self._disk_path(key)
+        try:
+            with np.load(path, allow_pickle=False) as arrays:
+                raw = RawResult.from_arrays(arrays)
+            os.utime(path)  # bump mtime so eviction is least-recently-used
+            return raw
+        except (OSError, ValueError, KeyError):
+            return None
+
+    # --- Store -------------------------------------------------------------------
+
+    def put(self, key: str, raw: RawResult):
+        if raw is None or not self.enabled:
+            return
+        with self._lock:
+            self._remember(key, raw)
+        self._write_disk(key, raw)
+
+    def _remember(self, key: str, raw: RawResult):
+        if self.memory_limit <= 0:
+            return
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return
+        self._memory[key] = raw
+        self._memory_bytes += raw.nbytes
+        while self._memory_bytes > self.memory_limit and self._memory:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted.nbytes
+            self.evictions += 1
+
+    def _write_disk(self, key: str, raw: RawResult):
+        if self.disk_limit <= 0:
+            return
+        path = self._disk_path(key)
+        if os.path.exists(path):
+            return
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, **raw.to_arrays())
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Inference cache write failed: {e}")
+            return
+
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = self._scan_disk_bytes()
+            else:
+                self._disk_bytes += os.path.getsize(path)
+            over_limit = self._disk_bytes > self.disk_limit
+        if over_limit:
+            self._evict_disk()
+
+    def _cache_files(self):
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith('.npz'):
+                    yield os.path.join(root, name)
+
+    def _scan_disk_bytes(self) -> int:
+        return sum(os.path.getsize(p) for p in self._cache_files())
+
+    def _evict_disk(self):
+        # Drop least recently used files until we are back under 90% of the limit
+        files = []
+        for path in self._cache_files():
+            try:
+                st = os.stat(path)
+                files.append((st.st_mtime, st.st_size, path))
+            except OSError:
+                continue
+        files.sort()
+
+        total = sum(size for _, size, _ in files)
+        target = int(self.disk_limit * 0.9)
+        for _, size, path in files:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                with self._lock:
+                    self.evictions += 1
+            except OSError:
+                continue
+
+        with self._lock:
+            self._disk_bytes = total
+
+    # --- Reporting ---------------------------------------------------------------
+
+    def stats(self) -> dict:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "model_version": self.model_version,
+            "memory_items": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "disk_bytes": self._disk_bytes,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else 0
+        }
@@ -0,0 +1,93 @@
+import os
+import time
+import zlib
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from core import RawResult
+from core.synthetic import FRONTAL_TEMPLATE
+
+# Class names of the Kuro posture model: <posture>-<view>
+DEFAULT_CLASSES = ('Normal-Depan', 'Kyphosis-Kiri', 'Lordosis-Kanan', 'Swayback-Belakang')
+
+# Keypoints in the model's anterior order (see AdvancedPoseAnalyzer.ANTERIOR_MAPPING),
+# as (x, y) fractions of the person box
+_KEYPOINT_TEMPLATE = FRONTAL_TEMPLATE.astype(np.float32)
+_JITTER = np.array([0.01, 0.003], dtype=np.float32)
+
+
+class StubPoseModel:
+    """
+    Deterministic stand-in for the YOLO pose model (INFERENCE_BACKEND=stub).
+
+    Follows the Ultralytics calling convention, `model(source, conf=..., imgsz=..., ...)`,
+    and returns one `RawResult` per image with `detections` standing people, class
+    names from `classes` and the 8 Kuro keypoints. The output depends only on the
+    pixels and `seed`, so the same photo always gives the same analysis. Small
+    per-image jitter gives different photos different asymmetries. `latency_ms`
+    is slept once per image to stand in for the forward pass.
+    """
+
+    def __init__(self, classes: Sequence[str] = DEFAULT_CLASSES, detections: int = 1,
+                 latency_ms: float = 0.0, seed: int = 0):
+        self.names: Dict[int, str] = dict(enumerate(classes))
+        self.detections = max(int(detections), 0)
+        self.latency_ms = max(float(latency_ms), 0.0)
+        self.seed = int(seed)
+
+    @classmethod
+    def from_env(cls) -> 'StubPoseModel':
+        classes = [c.strip() for c in os.getenv("STUB_CLASSES", ",".join(DEFAULT_CLASSES)).split(",") if c.strip()]
+        return cls(
+            classes=classes or DEFAULT_CLASSES,
+            detections=int(os.getenv("STUB_DETECTIONS", 1)),
+            latency_ms=float(os.getenv("STUB_LATENCY_MS", 0)),
+            seed=int(os.getenv("STUB_SEED", 0))
+        )
+
+    def to(self, device):
+        return self
+
+    def __call__(self, source: Union[np.ndarray, List[np.ndarray]], conf: float = 0.25,
+                 imgsz: Optional[int] = None, verbose: bool = False, device: str = 'cpu') -> List[RawResult]:
+        images = source if isinstance(source, list) else [source]
+        if self.latency_ms:
+            time.sleep(self.latency_ms * len(images) / 1000)
+        return [self._predict(img, conf) for img in images]
+
+    def _fingerprint(self, img: np.ndarray) -> int:
+        h, w = img.shape[:2]
+        # A strided sample is enough to tell photos apart and costs microseconds
+        sample = np.ascontiguousarray(img[::max(1, h // 64), ::max(1, w // 64)])
+        return zlib.crc32(sample.tobytes(), self.seed)
+
+    def _predict(self, img: np.ndarray, conf: float) -> RawResult:
+        h, w = img.shape[:2]
+        fingerprint = self._fingerprint(img)
+        rng = np.random.default_rng(fingerprint)
+
+        boxes, scores, classes, keypoints, keypoint_conf = [], [], [], [], []
+        for i in range(self.detections):
+            # People side by side, left to right, each less confident than the previous
+            center_x = w * (i + 0.5) / self.detections
+            box_w, box_h = w * min(0.4, 0.8 / self.detections), h * 0.85
+            x1, y1 = center_x - box_w / 2, h * 0.08
+            score = round(0.92 - 0.12 * i, 4)
+            if score < conf:
+                break
+
+            # Mild asymmetry: shoulder/hip height differences of a few mm
+            points = _KEYPOINT_TEMPLATE + rng.uniform(-1, 1, _KEYPOINT_TEMPLATE.shape) * _JITTER
+            boxes.append([x1, y1, x1 + box_w, y1 + box_h])
+            scores.append(score)
+            classes.append((fingerprint + i) % len(self.names))
+            keypoints.append(points * [box_w, box_h] + [x1, y1])
+            keypoint_conf.append(rng.uniform(0.8, 0.99, len(_KEYPOINT_TEMPLATE)))
+
+        if not boxes:
+            return RawResult(np.zeros((0, 4)), np.zeros(0), np.zeros(0),
+                             np.zeros((0, len(_KEYPOINT_TEMPLATE), 2)), np.zeros((0, len(_KEYPOINT_TEMPLATE))),
+                             names=self.names, orig_shape=(h, w))
+        return RawResult(boxes, scores, classes, np.array(keypoints), np.array(keypoint_conf),
+                         names=self.names, orig_shape=(h, w))
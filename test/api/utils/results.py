@@ -0,0 +1,36 @@
+from datetime import datetime
+from typing import Dict, Optional
+
+from api.models.schemas import AnalysisResult
+from core.keypoints import keypoints_as_dicts
+
+ANALYSIS_PREFIX = "/api/analysis"
+
+
+def artifact_url(artifact_id: Optional[str]) -> Optional[str]:
+    return f"{ANALYSIS_PREFIX}/artifacts/{artifact_id}" if artifact_id else None
+
+
+def analysis_result(analysis_id: str, patient_name: str, height_cm: float, analysis_data: Dict) -> AnalysisResult:
+    """API view of a freshly computed analysis (routes and background batch jobs)."""
+    return AnalysisResult(
+        analysis_id=analysis_id,
+        patient_name=patient_name,
+        height_cm=height_cm,
+        analysis_date=datetime.now(),
+        shoulder=analysis_data.get("shoulder"),
+        hip=analysis_data.get("hip"),
+        spinal=analysis_data.get("spinal"),
+        head=analysis_data.get("head"),
+        posture_score=analysis_data.get("posture_score"),
+        postural_angles=analysis_data.get("postural_angles"),
+        detections=analysis_data.get("detections"),
+        keypoints=keypoints_as_dicts(analysis_data.get("keypoints")),
+        conversion_ratio=analysis_data.get("conversion_ratio"),
+        actual_height_mm=analysis_data.get("actual_height_mm"),
+        skeleton_image_id=analysis_data.get("skeleton_image_id"),
+        skeleton_image_url=artifact_url(analysis_data.get("skeleton_image_id")),
+        trace=analysis_data.get("trace"),
+        person_index=analysis_data.get("person_index"),
+        bbox=analysis_data.get("bbox")
+    )
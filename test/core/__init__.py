@@ -1,4 +1,7 @@
+from .batch_engine import BatchPoseAnalyzer, KeypointBatch
+from .keypoints import Keypoint
 from .pose_analyzer import AdvancedPoseAnalyzer
+from .raw_results import RawResult
 from .visualizer import (
     visualize_angles_and_imbalance,
     visualize_just_bounding_boxes,
@@ -7,6 +10,10 @@ from .visualizer import (
 
 __all__ = [
     'AdvancedPoseAnalyzer',
+    'BatchPoseAnalyzer',
+    'Keypoint',
+    'KeypointBatch',
+    'RawResult',
     'visualize_angles_and_imbalance',
     'visualize_just_bounding_boxes',
     'visualize_just_imbalance'
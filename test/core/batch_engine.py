@@ -0,0 +1,668 @@
+import numpy as np
+
+from .pose_analyzer import AdvancedPoseAnalyzer
+
+# Every keypoint name the geometry reads, frontal then lateral
+KEYPOINT_NAMES = (
+    'right_shoulder', 'right_hip', 'right_knee', 'right_ankle',
+    'left_shoulder', 'left_hip', 'left_knee', 'left_ankle',
+    'mid_shoulder', 'mid_hip', 'nose', 'left_ear', 'right_ear',
+    'lateral_ear', 'lateral_shoulder', 'lateral_pelvic_back', 'lateral_pelvic_front',
+    'lateral_pelvic_center', 'lateral_knee', 'lateral_ankle',
+)
+
+_POSTURE_CENTER_ANCHORS = (
+    'lateral_shoulder', 'lateral_pelvic_center', 'lateral_knee', 'lateral_ankle',
+    'left_shoulder', 'right_shoulder', 'left_hip', 'right_hip'
+)
+
+SHOULDER_UNITS = {'height_difference': 'mm', 'slope_angle': '°', 'score': 'points'}
+HIP_UNITS = {'height_difference': 'mm', 'pelvic_tilt_angle': '°', 'score': 'points'}
+SPINAL_UNITS = {'lateral_deviation': 'mm', 'curvature_angle': '°', 'score': 'points'}
+HEAD_UNITS = {'tilt_angle': '°', 'shift': 'mm', 'forward_lean': 'mm', 'score': 'points'}
+LEG_ANTERIOR_UNITS = {'right_leg_angle': '°', 'left_leg_angle': '°', 'inter_knee_mm': 'mm', 'inter_ankle_mm': 'mm'}
+LEG_LATERAL_UNITS = {'leg_angle': '°', 'knee_deviation_mm': 'mm', 'height_diff_ef_mm': 'mm', 'height_diff_fg_mm': 'mm'}
+
+BALANCE_STATUSES = ('Very Balanced', 'Balanced', 'Slightly Unbalanced', 'Unbalanced', 'Very Unbalanced')
+HEAD_STATUSES = ('Excellent Alignment', 'Good Alignment', 'Moderate Misalignment',
+                 'Significant Misalignment', 'Critical Misalignment')
+ANTERIOR_LEG_STATUSES = ('Normal', 'Valgus (X)', 'Varus (O)')
+LATERAL_LEG_STATUSES = ('Normal', 'Flexion (Bend)', 'Genu Recurvatum')
+ASSESSMENTS = (
+    ('Excellent', 'Posture is excellent! Maintain your current posture habits.'),
+    ('Very Good', 'Very good posture with minor areas for improvement.'),
+    ('Good', 'Good posture, focus on correcting minor imbalances.'),
+    ('Fair', 'Moderate posture issues detected. Consider corrective exercises.'),
+    ('Poor', 'Poor posture detected. Consult a physiotherapist.'),
+    ('Critical', 'Critical posture issues. Immediate professional consultation recommended.'),
+)
+
+
+def _round(values, decimals):
+    """Vectorized `round(value, decimals)` with Python's exact results.
+
+    np.round scales by 10**decimals first, which can land on the wrong side of
+    a tie; the few values that close to a tie are rounded by Python itself.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    out = np.round(values, decimals)
+    scaled = values * 10.0 ** decimals
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_tie.any():
+        idx = np.nonzero(near_tie)
+        out[idx] = [round(float(v), decimals) for v in values[idx]]
+    return out
+
+
+def _angle(a, b, c):
+    """AdvancedPoseAnalyzer.calculate_angle (law of cosines, degrees) on (N, 2) point arrays."""
+    ab = np.sqrt((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2)
+    bc = np.sqrt((b[0] - c[0]) ** 2 + (b[1] - c[1]) ** 2)
+    ac = np.sqrt((a[0] - c[0]) ** 2 + (a[1] - c[1]) ** 2)
+    degenerate = (ab == 0) | (bc == 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cos_angle = (ab ** 2 + bc ** 2 - ac ** 2) / (2 * ab * bc)
+    angle = np.degrees(np.arccos(np.clip(cos_angle, -1.0, 1.0)))
+    return np.where(degenerate, 0.0, angle)
+
+
+def _distance(a, b):
+    return np.sqrt((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2)
+
+
+def _slope_angle(a, b):
+    """AdvancedPoseAnalyzer.calculate_slope_angle: absolute slope in degrees (0-90)."""
+    dx = b[0] - a[0]
+    dy = b[1] - a[1]
+    angle = np.degrees(np.arctan2(np.abs(dy), np.abs(dx)))
+    return np.where(dx == 0, np.where(dy != 0, 90.0, 0.0), angle)
+
+
+class KeypointBatch:
+    """
+    Keypoints of N images stacked as arrays.
+
+    `points` is (N, K, 3) with x, y and confidence per keypoint name in `names`
+    (NaN where an image has no such keypoint); `visible` is (N, K).
+    """
+
+    def __init__(self, points, visible, names=KEYPOINT_NAMES):
+        self.points = np.asarray(points, dtype=np.float64)
+        self.visible = np.asarray(visible, dtype=bool)
+        self.names = tuple(names)
+        self._index = {name: i for i, name in enumerate(self.names)}
+
+    @classmethod
+    def from_dicts(cls, keypoint_dicts, names=KEYPOINT_NAMES) -> 'KeypointBatch':
+        """Stack `extract_keypoints_from_results` / `_add_lateral_points` outputs."""
+        points = np.full((len(keypoint_dicts), len(names), 3), np.nan)
+        visible = np.zeros((len(keypoint_dicts), len(names)), dtype=bool)
+        for i, keypoints in enumerate(keypoint_dicts):
+            for k, name in enumerate(names):
+                kp = keypoints.get(name)
+                if kp:
+                    points[i, k] = (kp['x'], kp['y'], kp.get('confidence', np.nan))
+                    visible[i, k] = bool(kp.get('visible'))
+        return cls(points, visible, names)
+
+    def __len__(self):
+        return len(self.points)
+
+    def xy(self, name):
+        k = self._index[name]
+        return self.points[:, k, 0], self.points[:, k, 1]
+
+    def present(self, name):
+        return ~np.isnan(self.points[:, self._index[name], 0])
+
+    def is_visible(self, name):
+        return self.visible[:, self._index[name]]
+
+
+class BatchPoseAnalyzer:
+    """
+    Vectorized counterpart of the AdvancedPoseAnalyzer geometry for N images at once.
+
+    Works on keypoints already extracted per image (see KeypointBatch) and
+    reproduces the scalar `analyze_*`, height, ratio and overall score methods
+    exactly, including their rounding, caps and missing-keypoint rules. Used to
+    re-score stored analyses (scripts/rescore_analyses.py); `to_dicts` gives the
+    same per-image dicts the scalar path returns. Postural angles are not covered.
+
+    Parity holds for keypoints holding plain Python floats (Keypoint objects and
+    stored analyses). `round()` on NumPy scalars uses NumPy's rounding, which can
+    differ by 0.01 on exact ties.
+    """
+
+    def __init__(self, reference_height_mm=1700):
+        # Scaling constants come from the scalar analyzer so both paths stay in step
+        scalar = AdvancedPoseAnalyzer(reference_height_mm)
+        self.reference_height_mm = scalar.reference_height_mm
+        self.HEIGHT_DIFF_SCALE = scalar.HEIGHT_DIFF_SCALE
+        self.HEAD_SHIFT_SCALE = scalar.HEAD_SHIFT_SCALE
+
+    # --- Scale ---------------------------------------------------------------------
+
+    def estimate_person_height(self, batch: KeypointBatch):
+        """estimate_person_height_from_keypoints per image; NaN where the scalar path returns None."""
+        n = len(batch)
+
+        def extreme(names, reducer, fill):
+            values = np.full(n, fill)
+            found = np.zeros(n, dtype=bool)
+            for name in names:
+                _, y = batch.xy(name)
+                ok = batch.present(name) & batch.is_visible(name)
+                values = np.where(ok, reducer(values, y), values)
+                found |= ok
+            return values, found
+
+        head_y, has_head = extreme(('nose', 'left_ear', 'right_ear', 'lateral_ear'), np.minimum, np.inf)
+        ankle_y, has_ankle = extreme(('left_ankle', 'right_ankle', 'lateral_ankle'), np.maximum, -np.inf)
+        shoulder_y, has_shoulder = extreme(('left_shoulder', 'right_shoulder', 'lateral_shoulder'),
+                                           np.minimum, np.inf)
+
+        with np.errstate(invalid='ignore'):
+            from_head = ankle_y - head_y
+            from_shoulder = (ankle_y - shoulder_y) * 1.25
+        height = np.full(n, np.nan)
+        use_head = has_head & has_ankle
+        use_shoulder = ~use_head & has_shoulder & has_ankle
+        height = np.where(use_head & (from_head > 100), from_head, height)
+        height = np.where(use_shoulder & (from_shoulder > 100), from_shoulder, height)
+        return height
+
+    def pixel_to_mm_ratio(self, image_heights, person_heights_px, actual_heights_mm):
+        """calculate_pixel_to_mm_ratio per image (NaN person height = not available)."""
+        image_heights = np.asarray(image_heights, dtype=np.float64)
+        person = np.asarray(person_heights_px, dtype=np.float64)
+        actual = np.broadcast_to(np.asarray(actual_heights_mm, dtype=np.float64), image_heights.shape)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            measured = actual / person
+            estimated_person = image_heights * 0.7
+            estimated = np.where(actual != 0, actual, self.reference_height_mm) / estimated_person
+        use_measured = (actual != 0) & ~np.isnan(person) & (person > 0)
+        return _round(np.where(use_measured, measured, estimated), 2)
+
+    def posture_center_x(self, batch: KeypointBatch, image_widths):
+        """calculate_posture_center_x per image (mean X of the visible core anchors)."""
+        n = len(batch)
+        total, count = np.zeros(n), np.zeros(n)
+        for name in _POSTURE_CENTER_ANCHORS:
+            x, _ = batch.xy(name)
+            ok = batch.present(name) & batch.is_visible(name)
+            total = np.where(ok, total + x, total)
+            count += ok
+
+        # No anchors: every visible keypoint (summed in KEYPOINT_NAMES order)
+        fallback_total, fallback_count = np.zeros(n), np.zeros(n)
+        for name in batch.names:
+            x, _ = batch.xy(name)
+            ok = batch.present(name) & batch.is_visible(name)
+            fallback_total = np.where(ok, fallback_total + x, fallback_total)
+            fallback_count += ok
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            center = np.where(count > 0, total / count, fallback_total / fallback_count)
+        default = np.asarray(image_widths, dtype=np.int64) // 2
+        return np.where((count > 0) | (fallback_count > 0), center, default)
+
+    # --- Components ----------------------------------------------------------------
+
+    @staticmethod
+    def _has_ratio(ratio):
+        return ~np.isnan(ratio) & (ratio != 0)
+
+    @staticmethod
+    def _pair(batch, left, right):
+        return (batch.present(left) & batch.present(right)
+                & batch.is_visible(left) & batch.is_visible(right))
+
+    def shoulder(self, batch: KeypointBatch, ratio, plumb_line_x):
+        """analyze_shoulder_imbalance_advanced; `ratio`/`plumb_line_x` NaN stand for None."""
+        ratio = np.asarray(ratio, dtype=np.float64)
+        plumb = np.asarray(plumb_line_x, dtype=np.float64)
+        ls, rs = batch.xy('left_shoulder'), batch.xy('right_shoulder')
+        valid = self._pair(batch, 'left_shoulder', 'right_shoulder')
+        has_ratio = self._has_ratio(ratio)
+
+        height_diff_px = np.abs(ls[1] - rs[1])
+        height_mm = np.where(has_ratio, height_diff_px * ratio * self.HEIGHT_DIFF_SCALE,
+                             height_diff_px * self.HEIGHT_DIFF_SCALE)
+        height_diff_mm = _round(np.minimum(height_mm, 50), 2)
+        slope = _round(np.minimum(_slope_angle(ls, rs), 30), 2)
+
+        height_score = np.select(
+            [height_diff_mm <= 5, height_diff_mm <= 10, height_diff_mm <= 20],
+            [100, 90 - (height_diff_mm - 5), 80 - (height_diff_mm - 10) * 2],
+            np.maximum(0, 60 - (height_diff_mm - 20) * 1.5))
+        abs_angle = np.abs(slope)
+        angle_score = np.select(
+            [abs_angle <= 2, abs_angle <= 5, abs_angle <= 10],
+            [100, 90 - (abs_angle - 2) * 3, 80 - (abs_angle - 5) * 4],
+            np.maximum(0, 60 - (abs_angle - 10) * 2))
+        score = _round(height_score * 0.6 + angle_score * 0.4, 2)
+
+        return {
+            'valid': valid,
+            'has_ratio': has_ratio,
+            'height_difference_mm': height_diff_mm,
+            'height_difference_px': _round(height_diff_px, 2),
+            'slope_angle_deg': slope,
+            'score': score,
+            'width_mm': _round(np.abs(ls[0] - rs[0]) * ratio, 2),
+            'has_plumb': ~np.isnan(plumb),
+            'lateral_shift_mm': _round(((ls[0] + rs[0]) / 2 - plumb) * ratio, 2),
+            'status': self._balance_status(height_diff_mm, slope),
+        }
+
+    def hip(self, batch: KeypointBatch, ratio, plumb_line_x):
+        """analyze_hip_imbalance_advanced; `ratio`/`plumb_line_x` NaN stand for None."""
+        ratio = np.asarray(ratio, dtype=np.float64)
+        plumb = np.asarray(plumb_line_x, dtype=np.float64)
+        lh, rh = batch.xy('left_hip'), batch.xy('right_hip')
+        valid = self._pair(batch, 'left_hip', 'right_hip')
+        has_ratio = self._has_ratio(ratio)
+
+        height_diff_px = np.abs(lh[1] - rh[1])
+        height_mm = np.where(has_ratio, height_diff_px * ratio * self.HEIGHT_DIFF_SCALE,
+                             height_diff_px * self.HEIGHT_DIFF_SCALE)
+        height_diff_mm = _round(np.minimum(height_mm, 50), 2)
+        tilt = _round(np.minimum(_slope_angle(lh, rh), 30), 2)
+
+        height_score = np.select(
+            [height_diff_mm <= 5, height_diff_mm <= 10, height_diff_mm <= 20],
+            [100, 85 - (height_diff_mm - 5) * 2, 70 - (height_diff_mm - 10) * 2],
+            np.maximum(0, 50 - (height_diff_mm - 20) * 1.5))
+        abs_tilt = np.abs(tilt)
+        angle_score = np.select(
+            [abs_tilt <= 2, abs_tilt <= 5, abs_tilt <= 10],
+            [100, 85 - (abs_tilt - 2) * 4, 70 - (abs_tilt - 5) * 3],
+            np.maximum(0, 50 - (abs_tilt - 10) * 2))
+        score = _round(height_score * 0.7 + angle_score * 0.3, 2)
+
+        return {
+            'valid': valid,
+            'has_ratio': has_ratio,
+            'height_difference_mm': height_diff_mm,
+            'pelvic_tilt_angle': tilt,
+            'score': score,
+            'width_mm': _round(np.abs(lh[0] - rh[0]) * ratio, 2),
+            'has_plumb': ~np.isnan(plumb),
+            'lateral_shift_mm': _round(((lh[0] + rh[0]) / 2 - plumb) * ratio, 2),
+            'status': self._balance_status(height_diff_mm, tilt),
+        }
+
+    @staticmethod
+    def _balance_status(height_diff_mm, angle):
+        abs_angle = np.abs(angle)
+        return np.select(
+            [(height_diff_mm < 5) & (abs_angle < 2), (height_diff_mm < 10) & (abs_angle < 5),
+             (height_diff_mm < 15) & (abs_angle < 10), (height_diff_mm < 25) & (abs_angle < 15)],
+            [0, 1, 2, 3], 4)
+
+    def spinal(self, batch: KeypointBatch, ratio):
+        """analyze_spinal_alignment_advanced."""
+        ratio = np.asarray(ratio, dtype=np.float64)
+        ms, mh = batch.xy('mid_shoulder'), batch.xy('mid_hip')
+        # The scalar path only checks that mid_shoulder is visible
+        valid = batch.present('mid_shoulder') & batch.present('mid_hip') & batch.is_visible('mid_shoulder')
+
+        deviation_px = np.abs(ms[0] - mh[0])
+        deviation_mm = _round(deviation_px * np.where(self._has_ratio(ratio), ratio, 0.26), 2)
+        dy = np.abs(ms[1] - mh[1])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            curvature = np.where(dy > 0, _round(np.degrees(np.arctan(deviation_px / dy)), 2), 0)
+
+        return {
+            'valid': valid,
+            'lateral_deviation_mm': deviation_mm,
+            'curvature_angle': curvature,
+            'score': 100 - np.minimum(deviation_mm * 2, 100),
+            'deviated': deviation_mm >= 10,
+        }
+
+    def head(self, batch: KeypointBatch, ratio):
+        """analyze_head_alignment_advanced."""
+        ratio = np.asarray(ratio, dtype=np.float64)
+        le, re, nose, ms = batch.xy('left_ear'), batch.xy('right_ear'), batch.xy('nose'), batch.xy('mid_shoulder')
+        valid = self._pair(batch, 'left_ear', 'right_ear')
+        has_shoulder = batch.present('mid_shoulder') & batch.is_visible('mid_shoulder')
+        has_nose = has_shoulder & batch.present('nose') & batch.is_visible('nose')
+        has_ratio = self._has_ratio(ratio)
+
+        dx, dy = re[0] - le[0], re[1] - le[1]
+        tilt = np.where(np.abs(dx) < 0.1, 0.0, np.degrees(np.arctan2(np.abs(dy), np.abs(dx))))
+        tilt = _round(np.minimum(30, np.abs(tilt)), 2)
+
+        shift_px = np.abs((le[0] + re[0]) / 2 - ms[0])
+        shift_mm = np.where(has_ratio, shift_px * ratio * self.HEAD_SHIFT_SCALE, shift_px * self.HEAD_SHIFT_SCALE)
+        shift = np.where(has_shoulder, _round(np.minimum(40, shift_mm), 2), 0)
+
+        forward_px = np.abs(nose[1] - ms[1]) * 0.15
+        forward_mm = np.where(has_ratio, forward_px * ratio * self.HEAD_SHIFT_SCALE,
+                              forward_px * self.HEAD_SHIFT_SCALE)
+        forward = np.where(has_nose, _round(np.minimum(80, forward_mm), 2), 0)
+
+        abs_tilt = np.abs(tilt)
+        tilt_score = np.select(
+            [abs_tilt <= 3, abs_tilt <= 10, abs_tilt <= 20],
+            [100, 80 - (abs_tilt - 3) * 3, 50 - (abs_tilt - 10) * 2],
+            np.maximum(0, 30 - (abs_tilt - 20)))
+        shift_score = np.select(
+            [shift <= 10, shift <= 20, shift <= 35],
+            [100, 80 - (shift - 10) * 3, 50 - (shift - 20) * 2],
+            np.maximum(0, 30 - (shift - 35)))
+        score = _round(tilt_score * 0.6 + shift_score * 0.4, 2)
+
+        return {
+            'valid': valid,
+            'tilt_angle': tilt,
+            'shift_mm': shift,
+            'forward_lean_mm': forward,
+            'score': score,
+            'status': np.select([score >= 85, score >= 70, score >= 50, score >= 30], [0, 1, 2, 3], 4),
+        }
+
+    def leg_anterior(self, batch: KeypointBatch, ratio):
+        """analyze_leg_alignment_anterior."""
+        ratio = np.asarray(ratio, dtype=np.float64)
+        ratio = np.where(self._has_ratio(ratio), ratio, 0.26)
+
+        def leg(hip, knee, ankle):
+            valid = np.ones(len(batch), dtype=bool)
+            for name in (hip, knee, ankle):
+                valid &= batch.present(name) & batch.is_visible(name)
+            angle = _angle(batch.xy(hip), batch.xy(knee), batch.xy(ankle))
+            status = np.select([(angle >= 175) & (angle <= 185), angle < 175], [0, 1], 2)
+            return valid, _round(angle, 1), status
+
+        right = leg('right_hip', 'right_knee', 'right_ankle')
+        left = leg('left_hip', 'left_knee', 'left_ankle')
+        knees = self._pair(batch, 'right_knee', 'left_knee')
+        ankles = self._pair(batch, 'right_ankle', 'left_ankle')
+
+        return {
+            'right_valid': right[0], 'right_leg_angle': right[1], 'right_leg_status': right[2],
+            'left_valid': left[0], 'left_leg_angle': left[1], 'left_leg_status': left[2],
+            'knees_valid': knees,
+            'inter_knee_mm': _round(_distance(batch.xy('right_knee'), batch.xy('left_knee')) * ratio, 1),
+            'ankles_valid': ankles,
+            'inter_ankle_mm': _round(_distance(batch.xy('right_ankle'), batch.xy('left_ankle')) * ratio, 1),
+        }
+
+    def leg_lateral(self, batch: KeypointBatch, ratio):
+        """analyze_leg_alignment_lateral."""
+        ratio = np.asarray(ratio, dtype=np.float64)
+        ratio = np.where(self._has_ratio(ratio), ratio, 0.26)
+        names = ('lateral_pelvic_center', 'lateral_knee', 'lateral_ankle')
+        valid = np.ones(len(batch), dtype=bool)
+        for name in names:
+            valid &= batch.present(name) & batch.is_visible(name)
+        e, f, g = (batch.xy(name) for name in names)
+
+        angle = _angle(e, f, g)
+        # Signed distance of the knee from the pelvis-ankle line
+        a_coeff = g[1] - e[1]
+        b_coeff = -(g[0] - e[0])
+        c_coeff = g[0] * e[1] - g[1] * e[0]
+        denom = np.sqrt(a_coeff ** 2 + b_coeff ** 2)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            deviation_px = (a_coeff * f[0] + b_coeff * f[1] + c_coeff) / denom
+
+        return {
+            'valid': valid,
+            'leg_angle': _round(angle, 1),
+            'status': np.select([(angle >= 175) & (angle <= 185), angle < 175], [0, 1], 2),
+            'knee_deviation_mm': np.where(denom > 0, _round(deviation_px * ratio, 1), 0),
+            'height_diff_ef_mm': _round(np.abs(f[1] - e[1]) * ratio, 1),
+            'height_diff_fg_mm': _round(np.abs(g[1] - f[1]) * ratio, 1),
+        }
+
+    def lateral_distances(self, batch: KeypointBatch, ratio):
+        """analyze_lateral_distances."""
+        ratio = np.asarray(ratio, dtype=np.float64)
+        ratio = np.where(~np.isnan(ratio) & (ratio > 0), ratio, 0.5)
+
+        def point(name):
+            name = f'lateral_{name}'
+            return batch.xy(name)[0], batch.present(name) & batch.is_visible(name)
+
+        (ear, has_ear), (sh, has_sh) = point('ear'), point('shoulder')
+        (back, has_back), (front, has_front) = point('pelvic_back'), point('pelvic_front')
+        center, has_center = point('pelvic_center')
+
+        return {
+            'head_shift_mm': np.where(has_ear & has_sh, _round(np.abs(ear - sh) * ratio, 2), 0),
+            'spine_shift_mm': np.where(has_sh & has_center, _round(np.abs(sh - center) * ratio, 2), 0),
+            'pelvic_shift_mm': np.where(has_back & has_front, _round(np.abs(back - front) * ratio, 2), 0),
+        }
+
+    def overall_score(self, component_scores, view_types=None):
+        """calculate_overall_posture_score; `component_scores` maps component name -> (N,) scores."""
+        n = len(next(iter(component_scores.values())))
+        view_types = np.asarray(view_types if view_types is not None else ['unknown'] * n, dtype=object)
+        frontal = np.isin(view_types, ['back', 'front'])
+
+        def weighted(weights):
+            total, total_weight = np.zeros(n), np.zeros(n)
+            for component, weight in weights.items():
+                score = np.asarray(component_scores.get(component, np.zeros(n)), dtype=np.float64)
+                positive = score > 0
+                total = np.where(positive, total + score * weight, total)
+                total_weight = np.where(positive, total_weight + weight, total_weight)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                return np.where(total_weight > 0, total / total_weight, 0.0)
+
+        total = np.where(frontal, weighted({'shoulder': 0.35, 'hip': 0.35, 'spinal': 0.30}),
+                         weighted({'head': 1.0}))
+        total = _round(np.maximum(0, np.minimum(100, total)), 2)
+        assessment = np.select([total >= 90, total >= 80, total >= 70, total >= 60, total >= 50],
+                               [0, 1, 2, 3, 4], 5)
+        return total, assessment
+
+    # --- Whole pipeline ------------------------------------------------------------
+
+    def analyze(self, batch: KeypointBatch, image_heights, image_widths, heights_cm, view_types=None):
+        """
+        The geometry PostureAnalyzerService.analyze_result runs after keypoint
+        extraction, for every image in `batch`. Returns a BatchAnalysis.
+        """
+        image_heights = np.asarray(image_heights, dtype=np.float64)
+        actual_height_mm = np.asarray(heights_cm, dtype=np.float64) * 10
+
+        person_height_px = self.estimate_person_height(batch)
+        person_height_px = np.where(np.isnan(person_height_px), image_heights * 0.7, person_height_px)
+        ratio = self.pixel_to_mm_ratio(image_heights, person_height_px, actual_height_mm)
+        center_x = self.posture_center_x(batch, image_widths)
+
+        sections = {
+            'shoulder': self.shoulder(batch, ratio, center_x),
+            'hip': self.hip(batch, ratio, center_x),
+            'spinal': self.spinal(batch, ratio),
+            'head': self.head(batch, ratio),
+            'lateral_distances': self.lateral_distances(batch, ratio),
+            'leg_anterior': self.leg_anterior(batch, ratio),
+            'leg_lateral': self.leg_lateral(batch, ratio),
+        }
+        scores = {name: np.where(sections[name]['valid'], sections[name]['score'], 0)
+                  for name in ('shoulder', 'hip', 'spinal', 'head')}
+        total, assessment = self.overall_score(scores, view_types)
+
+        return BatchAnalysis(sections, {
+            'conversion_ratio': ratio,
+            'actual_height_mm': np.broadcast_to(actual_height_mm, ratio.shape),
+            'person_height_px': person_height_px,
+            'posture_center_x': center_x,
+            'posture_score': total,
+            'assessment': assessment,
+        })
+
+
+class BatchAnalysis:
+    """Arrays produced by BatchPoseAnalyzer.analyze, convertible to the scalar per-image dicts."""
+
+    def __init__(self, sections, summary):
+        self.sections = sections
+        self.summary = summary
+
+    def __len__(self):
+        return len(self.summary['posture_score'])
+
+    def to_dicts(self):
+        return [self.row(i) for i in range(len(self))]
+
+    def row(self, i):
+        """Image `i` in the format of the scalar `analyze_*` / `calculate_*` methods."""
+        s = self.sections
+        summary = self.summary
+        assessment, recommendation = ASSESSMENTS[summary['assessment'][i]]
+        return {
+            'conversion_ratio': float(summary['conversion_ratio'][i]),
+            'actual_height_mm': float(summary['actual_height_mm'][i]),
+            'person_height_px': float(summary['person_height_px'][i]),
+            'posture_center_x': float(summary['posture_center_x'][i]),
+            'shoulder': self._shoulder(s['shoulder'], i),
+            'hip': self._hip(s['hip'], i),
+            'spinal': self._spinal(s['spinal'], i),
+            'head': self._head(s['head'], i),
+            'lateral_distances': self._lateral_distances(s['lateral_distances'], i),
+            'leg_anterior': self._leg_anterior(s['leg_anterior'], i),
+            'leg_lateral': self._leg_lateral(s['leg_lateral'], i),
+            'posture_score': {
+                'total_score': float(summary['posture_score'][i]),
+                'adjusted_score': float(summary['posture_score'][i]),
+                'assessment': assessment,
+                'recommendation': recommendation
+            },
+        }
+
+    @staticmethod
+    def _shoulder(a, i):
+        result = {
+            'height_difference_mm': 0, 'height_difference_px': 0,
+            'horizontal_distance_mm': 0, 'slope_angle_deg': 0,
+            'asymmetry_score': 0, 'status': 'Not Detected', 'score': 0,
+            'units': dict(SHOULDER_UNITS)
+        }
+        if not a['valid'][i]:
+            return result
+        score = float(a['score'][i])
+        result.update({
+            'height_difference_mm': float(a['height_difference_mm'][i]),
+            'height_difference_px': float(a['height_difference_px'][i]),
+            'slope_angle_deg': float(a['slope_angle_deg'][i]),
+            'asymmetry_score': score,
+            'status': BALANCE_STATUSES[a['status'][i]],
+            'score': score,
+            'shoulder_height_diff_mm': float(a['height_difference_mm'][i]),
+            'width_mm': 0
+        })
+        if a['has_ratio'][i]:
+            result['width_mm'] = float(a['width_mm'][i])
+            result['lateral_shift_mm'] = float(a['lateral_shift_mm'][i]) if a['has_plumb'][i] else 0
+        return result
+
+    @staticmethod
+    def _hip(a, i):
+        result = {
+            'height_difference_mm': 0, 'pelvic_tilt_angle': 0,
+            'asymmetry_score': 0, 'status': 'Not Detected', 'score': 0,
+            'units': dict(HIP_UNITS)
+        }
+        if not a['valid'][i]:
+            return result
+        score = float(a['score'][i])
+        result.update({
+            'height_difference_mm': float(a['height_difference_mm'][i]),
+            'pelvic_tilt_angle': float(a['pelvic_tilt_angle'][i]),
+            'asymmetry_score': score,
+            'status': BALANCE_STATUSES[a['status'][i]],
+            'score': score,
+            'hip_height_diff_mm': float(a['height_difference_mm'][i]),
+            'width_mm': 0
+        })
+        if a['has_ratio'][i]:
+            result['width_mm'] = float(a['width_mm'][i])
+            result['lateral_shift_mm'] = float(a['lateral_shift_mm'][i]) if a['has_plumb'][i] else 0
+        return result
+
+    @staticmethod
+    def _spinal(a, i):
+        result = {
+            'lateral_deviation_mm': 0, 'curvature_angle': 0,
+            'spine_curvature_score': 0, 'status': 'Not Detected', 'score': 0,
+            'units': dict(SPINAL_UNITS)
+        }
+        if a['valid'][i]:
+            result.update({
+                'lateral_deviation_mm': float(a['lateral_deviation_mm'][i]),
+                'curvature_angle': float(a['curvature_angle'][i]),
+                'score': float(a['score'][i]),
+                'status': 'Deviated' if a['deviated'][i] else 'Normal'
+            })
+        return result
+
+    @staticmethod
+    def _head(a, i):
+        result = {
+            'tilt_angle': 0, 'shift_mm': 0, 'forward_lean_mm': 0,
+            'head_alignment_score': 0, 'status': 'Not Detected', 'score': 0,
+            'units': dict(HEAD_UNITS)
+        }
+        if a['valid'][i]:
+            score = float(a['score'][i])
+            result.update({
+                'tilt_angle': float(a['tilt_angle'][i]),
+                'shift_mm': float(a['shift_mm'][i]),
+                'forward_lean_mm': float(a['forward_lean_mm'][i]),
+                'head_alignment_score': score,
+                'status': HEAD_STATUSES[a['status'][i]],
+                'score': score
+            })
+        return result
+
+    @staticmethod
+    def _lateral_distances(a, i):
+        head, spine, pelvic = (float(a[key][i]) for key in ('head_shift_mm', 'spine_shift_mm', 'pelvic_shift_mm'))
+        return {
+            'head_shift_mm': head, 'spine_shift_mm': spine, 'pelvic_shift_mm': pelvic,
+            'ear_to_shoulder_mm': head, 'shoulder_to_pelvic_mm': spine, 'pelvic_width_mm': pelvic
+        }
+
+    @staticmethod
+    def _leg_anterior(a, i):
+        result = {
+            'right_leg_angle': 0, 'left_leg_angle': 0,
+            'right_leg_status': 'Unknown', 'left_leg_status': 'Unknown',
+            'inter_knee_mm': 0, 'inter_ankle_mm': 0,
+            'units': dict(LEG_ANTERIOR_UNITS)
+        }
+        for side in ('right', 'left'):
+            if a[f'{side}_valid'][i]:
+                result[f'{side}_leg_angle'] = float(a[f'{side}_leg_angle'][i])
+                result[f'{side}_leg_status'] = ANTERIOR_LEG_STATUSES[a[f'{side}_leg_status'][i]]
+        if a['knees_valid'][i]:
+            result['inter_knee_mm'] = float(a['inter_knee_mm'][i])
+        if a['ankles_valid'][i]:
+            result['inter_ankle_mm'] = float(a['inter_ankle_mm'][i])
+        return result
+
+    @staticmethod
+    def _leg_lateral(a, i):
+        result = {
+            'leg_angle': 0, 'leg_status': 'Unknown',
+            'knee_deviation_mm': 0,
+            'height_diff_ef_mm': 0, 'height_diff_fg_mm': 0,
+            'units': dict(LEG_LATERAL_UNITS)
+        }
+        if a['valid'][i]:
+            result.update({
+                'leg_angle': float(a['leg_angle'][i]),
+                'leg_status': LATERAL_LEG_STATUSES[a['status'][i]],
+                'knee_deviation_mm': float(a['knee_deviation_mm'][i]),
+                'height_diff_ef_mm': float(a['height_diff_ef_mm'][i]),
+                'height_diff_fg_mm': float(a['height_diff_fg_mm'][i])
+            })
+        return result
@@ -0,0 +1,116 @@
+from typing import Dict, Optional
+
+_FIELDS = ('x', 'y', 'confidence', 'visible')
+
+
+class Keypoint:
+    """
+    One body keypoint: image coordinates, model confidence and visibility.
+
+    Replaces the per-point `{'x', 'y', 'confidence', 'visible'}` dict with a
+    `__slots__` object (no per-instance dict: 64 bytes instead of 232) while
+    keeping dict-style access, so `kp['x']`, `kp.get('visible')`, `'x' in kp` and
+    `kp['y'] = ...` work unchanged. Values are stored as native float/bool, so a
+    keypoint never carries NumPy scalars into JSON.
+    """
+    __slots__ = _FIELDS
+
+    def __init__(self, x, y, confidence=0.0, visible=True):
+        self.x = float(x)
+        self.y = float(y)
+        self.confidence = float(confidence)
+        self.visible = bool(visible)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Keypoint':
+        return cls(data['x'], data['y'], data.get('confidence', 0.0), data.get('visible', True))
+
+    def to_dict(self) -> Dict:
+        return {'x': self.x, 'y': self.y, 'confidence': self.confidence, 'visible': self.visible}
+
+    def to_row(self) -> list:
+        """Compact storage form: [x, y, confidence, visible]."""
+        return [self.x, self.y, self.confidence, self.visible]
+
+    # --- dict compatibility --------------------------------------------------------
+
+    def __getitem__(self, key):
+        if key not in _FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in _FIELDS:
+            raise KeyError(key)
+        setattr(self, key, bool(value) if key == 'visible' else float(value))
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in _FIELDS else default
+
+    def __contains__(self, key):
+        return key in _FIELDS
+
+    def __iter__(self):
+        return iter(_FIELDS)
+
+    def __len__(self):
+        return len(_FIELDS)
+
+    def keys(self):
+        return _FIELDS
+
+    def values(self):
+        return (self.x, self.y, self.confidence, self.visible)
+
+    def items(self):
+        return zip(_FIELDS, self.values())
+
+    def copy(self) -> 'Keypoint':
+        return Keypoint(self.x, self.y, self.confidence, self.visible)
+
+    def __eq__(self, other):
+        if isinstance(other, Keypoint):
+            return self.values() == other.values()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __reduce__(self):
+        # Pickles as four numbers (results cross the inference process pool)
+        return Keypoint, self.values()
+
+    def __repr__(self):
+        return (f"Keypoint(x={self.x:.1f}, y={self.y:.1f}, "
+                f"confidence={self.confidence:.2f}, visible={self.visible})")
+
+
+def keypoints_as_dicts(keypoints: Optional[Dict]) -> Optional[Dict]:
+    """`{name: Keypoint}` as plain JSON-ready dicts (other entries pass through)."""
+    if keypoints is None:
+        return None
+    return {name: kp.to_dict() if isinstance(kp, Keypoint) else kp for name, kp in keypoints.items()}
+
+
+def pack_keypoints(keypoints: Dict) -> Dict:
+    """Storage form of `{name: Keypoint | dict}`: `{name: [x, y, confidence, visible]}`."""
+    packed = {}
+    for name, kp in keypoints.items():
+        if isinstance(kp, dict) and 'x' in kp:
+            kp = Keypoint.from_dict(kp)
+        packed[name] = kp.to_row() if isinstance(kp, Keypoint) else kp
+    return packed
+
+
+def unpack_keypoints(packed: Dict) -> Dict:
+    """Inverse of `pack_keypoints`, as plain dicts; rows saved as dicts are returned as is."""
+    return {
+        name: dict(zip(_FIELDS, row)) if _is_row(row) else row
+        for name, row in packed.items()
+    }
+
+
+def _is_row(value) -> bool:
+    return (isinstance(value, list) and len(value) == len(_FIELDS)
+            and all(isinstance(v, (int, float)) for v in value))
@@ -2,12 +2,16 @@ import math
 import numpy as np
 from scipy.spatial.distance import euclidean
 
+from . import tracing
+from .keypoints import Keypoint
+from .raw_results import RawResult
+
 
 class AdvancedPoseAnalyzer:
     def __init__(self, reference_height_mm=1700):
         self.reference_height_mm = reference_height_mm
         self.pixel_to_mm_ratio = None
-        self.debug_mode = True
+        self.debug_mode = False  # print this analyzer's trace regardless of POSE_TRACE_LEVEL
         # Scaling factors for realistic measurements
         self.HEIGHT_DIFF_SCALE = 1.5  # Scale for shoulder/hip height differences (Adjusted 10x per user request)
         self.LATERAL_DEVIATION_SCALE = 0.12  # Scale for spinal lateral deviation
@@ -32,25 +36,68 @@ class AdvancedPoseAnalyzer:
         self.LATERAL_MAPPING = self.LATERAL_LEFT_MAPPING # Default
         self.keypoint_mapping = self.ANTERIOR_MAPPING
 
-    def _debug_print(self, message):
-        if self.debug_mode:
-            print(f"[DEBUG] {message}")
+    def _trace(self, level, message, *args):
+        """Lazy trace record (see core.tracing); `message % args` is only formatted if printed or collected."""
+        tracing.emit(level, message, *args, echo=self.debug_mode, stacklevel=2)
 
-    def calculate_pixel_to_mm_ratio(self, image_height, person_height_pixels=None, actual_height_mm=None):
+    def compute_pixel_to_mm_ratio(self, image_height, person_height_pixels=None, actual_height_mm=None):
+        """mm per pixel for one image; does not touch the analyzer's state."""
         if actual_height_mm and person_height_pixels and person_height_pixels > 0:
-            ratio = actual_height_mm / person_height_pixels
-            self.pixel_to_mm_ratio = round(ratio, 2)
-            self._debug_print(f"Pixel to MM ratio: {self.pixel_to_mm_ratio} (from actual height)")
+            ratio = round(actual_height_mm / person_height_pixels, 2)
+            self._trace(tracing.DEBUG, "Pixel to MM ratio: %s (from actual height)", ratio)
         else:
             estimated_person_height = image_height * 0.7
             if actual_height_mm:
                 ratio = actual_height_mm / estimated_person_height
             else:
                 ratio = self.reference_height_mm / estimated_person_height
-            self.pixel_to_mm_ratio = round(ratio, 2)
-            self._debug_print(f"Pixel to MM ratio: {self.pixel_to_mm_ratio} (reference)")
+            ratio = round(ratio, 2)
+            self._trace(tracing.DEBUG, "Pixel to MM ratio: %s (reference)", ratio)
+        return ratio
+
+    def calculate_pixel_to_mm_ratio(self, image_height, person_height_pixels=None, actual_height_mm=None):
+        """Compute the ratio and keep it on the analyzer for `analyze_*` calls made without one."""
+        self.pixel_to_mm_ratio = self.compute_pixel_to_mm_ratio(image_height, person_height_pixels, actual_height_mm)
         return self.pixel_to_mm_ratio
 
+    def _ratio(self, pixel_to_mm_ratio):
+        return self.pixel_to_mm_ratio if pixel_to_mm_ratio is None else pixel_to_mm_ratio
+
+    def analyze_keypoints(self, keypoints, image_height, image_width, height_cm):
+        """
+        Full posture geometry for one person's extracted keypoints.
+
+        Stateless: the calibration is computed locally and passed to every
+        component, so one analyzer can serve concurrent threads and batch jobs.
+        """
+        person_height_px = self.estimate_person_height_from_keypoints(keypoints)
+        if person_height_px is None:
+            person_height_px = image_height * 0.7
+
+        actual_height_mm = height_cm * 10
+        ratio = self.compute_pixel_to_mm_ratio(image_height, person_height_px, actual_height_mm)
+        posture_center_x = self.calculate_posture_center_x(keypoints, image_width)
+
+        analysis_results = {
+            'keypoints': keypoints,
+            'conversion_ratio': ratio,
+            'actual_height_mm': actual_height_mm,
+            'person_height_px': person_height_px,
+            'image_height': image_height,
+            'image_width': image_width,
+            'shoulder': self.analyze_shoulder_imbalance_advanced(keypoints, posture_center_x, ratio),
+            'hip': self.analyze_hip_imbalance_advanced(keypoints, posture_center_x, ratio),
+            'spinal': self.analyze_spinal_alignment_advanced(keypoints, ratio),
+            'head': self.analyze_head_alignment_advanced(keypoints, ratio),
+            'lateral_distances': self.analyze_lateral_distances(keypoints, ratio),
+            'leg_anterior': self.analyze_leg_alignment_anterior(keypoints, ratio),
+            'leg_lateral': self.analyze_leg_alignment_lateral(keypoints, ratio),
+            'postural_angles': self.analyze_postural_angles(keypoints),
+            'posture_center_x': posture_center_x
+        }
+        analysis_results['posture_score'] = self.calculate_overall_posture_score(analysis_results)
+        return analysis_results
+
     def _detect_view_type(self, results):
         """
         Rumus 1: View Orientation Detection Logic
@@ -60,24 +107,25 @@ class AdvancedPoseAnalyzer:
         is_lateral = False
         is_right_lateral = None # None=Unknown, True=Right, False=Left
         
-        for result in results:
+        for raw in RawResult.from_results(results):
             # 1. Check Class Names (Explicit YOLO Classification)
-            if hasattr(result, 'boxes') and result.boxes is not None:
-                for cls_idx in result.boxes.cls:
-                    class_name = result.names.get(int(cls_idx.item()), "").lower()
-                    if 'belakang' in class_name or 'back' in class_name:
-                        return 'posterior'
-                    
-                    if any(k in class_name for k in ['lateral', 'samping']):
-                        is_lateral = True
-                        if any(k in class_name for k in ['kanan', 'right']):
-                            is_right_lateral = True
-                        elif any(k in class_name for k in ['kiri', 'left']):
-                            is_right_lateral = False
+            for class_id in raw.class_ids:
+                class_name = raw.names.get(class_id, "").lower()
+                if 'belakang' in class_name or 'back' in class_name:
+                    return 'posterior'
+
+                if any(k in class_name for k in ['lateral', 'samping']):
+                    is_lateral = True
+                    if any(k in class_name for k in ['kanan', 'right']):
+                        is_right_lateral = True
+                    elif any(k in class_name for k in ['kiri', 'left']):
+                        is_right_lateral = False
 
             # 2. Keypoint Analysis (Geometric Heuristics)
-            if hasattr(result, 'keypoints') and result.keypoints is not None and len(result.keypoints.xy) > 0:
-                conf = result.keypoints.conf[0].cpu().numpy() if result.keypoints.conf is not None else np.zeros(17)
+            kp, conf = raw.first_keypoints()
+            if kp is not None:
+                if conf is None:
+                    conf = np.zeros(17)
                 
                 # Model Indices: Right=[0..3], Left=[4..7] (Approx)
                 r_keys_idx = [0, 1, 2, 3] # Ear, Shoulder, Hip, Knee/Ankle
@@ -121,10 +169,12 @@ class AdvancedPoseAnalyzer:
         4. Apply Corrections (Anatomical Rules)
         """
         keypoints_dict = {}
+        # Tensors -> NumPy once; every step below reads the arrays
+        results = RawResult.from_results(results)
         
         # --- Step 1: Detect View ---
         view_type = self._detect_view_type(results)
-        self._debug_print(f"[FORMULA] Detected View: {view_type}")
+        self._trace(tracing.INFO, "[FORMULA] Detected View: %s", view_type)
         
         # --- Step 2: Select Mapping ---
         if view_type == 'lateral_right':
@@ -136,19 +186,14 @@ class AdvancedPoseAnalyzer:
             
         # --- Step 3: Extract Raw Points (with BBox Clipping) ---
         person_bbox = None
-        for result in results:
-             if hasattr(result, 'boxes') and len(result.boxes) > 0:
-                 b = result.boxes.xyxy[0].cpu().numpy()
+        for raw in results:
+             b = raw.person_box
+             if b is not None:
                  person_bbox = (b[0], b[1], b[2], b[3])
                  
-             if hasattr(result, 'keypoints') and result.keypoints is not None:
-                # CRITICAL FIX: Check if we actually have detected keypoints
-                if len(result.keypoints.xy) == 0:
-                    continue
-
-                kp = result.keypoints.xy[0].cpu().numpy()
-                conf = result.keypoints.conf[0].cpu().numpy() if result.keypoints.conf is not None else None
-                
+             # CRITICAL FIX: Check if we actually have detected keypoints
+             kp, conf = raw.first_keypoints()
+             if kp is not None:
                 for name, idx in mapping.items():
                     if idx < len(kp):
                         x, y = kp[idx]
@@ -162,11 +207,7 @@ class AdvancedPoseAnalyzer:
                         # Prefix for lateral
                         key = f"lateral_{name}" if 'lateral' in view_type else name
                         
-                        keypoints_dict[key] = {
-                            'x': float(x), 'y': float(y),
-                            'confidence': float(confidence), 
-                            'visible': bool(confidence > 0.35) # Relaxed visibility, cast to native bool
-                        }
+                        keypoints_dict[key] = Keypoint(x, y, confidence, confidence > 0.35) # Relaxed visibility
 
         # --- Step 4: Apply Corrections (The "Rumus") ---
         # 4a. Geometric Role Assignment (Frontal/Back Logic)
@@ -181,7 +222,7 @@ class AdvancedPoseAnalyzer:
         else:
             self._correct_lateral_points(keypoints_dict, person_bbox, view_type)
             
-        self._debug_print(f"Extracted {len(keypoints_dict)} keypoints")
+        self._trace(tracing.DEBUG, "Extracted %s keypoints", len(keypoints_dict))
         return keypoints_dict
 
     def _correct_lateral_points(self, keypoints_dict, person_bbox, view_type):
@@ -205,9 +246,7 @@ class AdvancedPoseAnalyzer:
              e_y = (pb['y'] + pf['y'])/2 if pf else pb['y']
              
              # Store Center E
-             keypoints_dict['lateral_pelvic_center'] = {
-                 'x': e_x, 'y': e_y, 'confidence': pb['confidence'], 'visible': True
-             }
+             keypoints_dict['lateral_pelvic_center'] = Keypoint(e_x, e_y, pb['confidence'], True)
              
              # 1.5 Apply Separation for C and D (Visibility Fix)
              if pf:
@@ -252,10 +291,10 @@ class AdvancedPoseAnalyzer:
                      # If Ear is significantly to the RIGHT of Hip -> Facing Right (Right Lateral)
                      if ear['x'] < e_x - 10:
                          is_right_lateral = False # Facing Left
-                         self._debug_print("[AUTO] Geometric Correct: Facing Left (Ear < Hip)")
+                         self._trace(tracing.INFO, "[AUTO] Geometric Correct: Facing Left (Ear < Hip)")
                      elif ear['x'] > e_x + 10:
                          is_right_lateral = True # Facing Right
-                         self._debug_print("[AUTO] Geometric Correct: Facing Right (Ear > Hip)")
+                         self._trace(tracing.INFO, "[AUTO] Geometric Correct: Facing Right (Ear > Hip)")
                  
                  # Apply offsets based on confirmed direction
                  if is_right_lateral:
@@ -270,7 +309,7 @@ class AdvancedPoseAnalyzer:
                  pb['y'] = float(e_y - dy)
                  pf['y'] = float(e_y + dy)
                  
-                 self._debug_print(f"[FIX] Applied Pelvic C/D Separation: dy={dy:.1f}px, FacingRight={is_right_lateral}")
+                 self._trace(tracing.INFO, "[FIX] Applied Pelvic C/D Separation: dy=%.1fpx, FacingRight=%s", dy, is_right_lateral)
              
              # 2. Leg Alignment (Reference to Hip E_X)
              if kn:
@@ -279,12 +318,12 @@ class AdvancedPoseAnalyzer:
                  if person_bbox: match_threshold = (person_bbox[2]-person_bbox[0]) * 0.2
                  
                  if abs(kn['x'] - e_x) > match_threshold:
-                      self._debug_print(f"[FIX] Clamping Knee to Hip X")
+                      self._trace(tracing.INFO, "[FIX] Clamping Knee to Hip X")
                       kn['x'] = float(e_x * 0.7 + kn['x'] * 0.3) # Soft clamp
                       
              if ank:
                  if abs(ank['x'] - e_x) > match_threshold * 1.2:
-                      self._debug_print(f"[FIX] Clamping Ankle to Hip X")
+                      self._trace(tracing.INFO, "[FIX] Clamping Ankle to Hip X")
                       ank['x'] = float(e_x * 0.6 + ank['x'] * 0.4)
 
 
@@ -321,26 +360,21 @@ class AdvancedPoseAnalyzer:
                     # Mirror Right to Left
                     dist_from_center = center_x - r_pt['x'] # If Right is Left of Center (Screen Left), dist is +
                     new_x = center_x + dist_from_center
-                    keypoints_dict[left_k] = {
-                        'x': float(new_x), 
-                        'y': float(r_pt['y']), # Assume roughly same height
-                        'confidence': 0.5, # Synthetic confidence
-                        'visible': True
-                    }
-                    self._debug_print(f"[RECONSTRUCTED] {left_k} from {right_k}")
+                    keypoints_dict[left_k] = Keypoint(
+                        new_x,
+                        r_pt['y'], # Assume roughly same height
+                        0.5, # Synthetic confidence
+                        True
+                    )
+                    self._trace(tracing.INFO, "[RECONSTRUCTED] %s from %s", left_k, right_k)
                     
                 # Case 2: Right Missing, Left Exists
                 elif (not r_pt or not r_pt['visible']) and (l_pt and l_pt['visible']):
                     # Mirror Left to Right
                     dist_from_center = l_pt['x'] - center_x
                     new_x = center_x - dist_from_center
-                    keypoints_dict[right_k] = {
-                        'x': float(new_x), 
-                        'y': float(l_pt['y']),
-                        'confidence': 0.5,
-                        'visible': True
-                    }
-                    self._debug_print(f"[RECONSTRUCTED] {right_k} from {left_k}")
+                    keypoints_dict[right_k] = Keypoint(new_x, l_pt['y'], 0.5, True)
+                    self._trace(tracing.INFO, "[RECONSTRUCTED] %s from %s", right_k, left_k)
 
             # 3. Vertical Hierarchy Enforcement (Anatomical Logic)
             # Shoulder < Hip < Knee < Ankle (in Y-coordinates, since 0 is top)
@@ -362,7 +396,7 @@ class AdvancedPoseAnalyzer:
                         # If lower point is ABOVE upper point (smaller Y), push it down
                         if low_pt['y'] < avg_upper_y + 10: # Buffer reduced from 20px to 10px
                             forced_y = avg_upper_y + 30 # Reduced push from 100px to 30px
-                            self._debug_print(f"[ANATOMY FIX] Pushing {low_k} down (was {low_pt['y']:.1f}, now {forced_y:.1f})")
+                            self._trace(tracing.INFO, "[ANATOMY FIX] Pushing %s down (was %.1f, now %.1f)", low_k, low_pt['y'], forced_y)
                             low_pt['y'] = forced_y
                             
         except Exception as e:
@@ -409,7 +443,7 @@ class AdvancedPoseAnalyzer:
                 avg_x = (pt_a['x'] + pt_b['x']) / 2
                 pt_a['x'] = avg_x
                 pt_b['x'] = avg_x
-                self._debug_print("Refined Lateral Head Verticality (Snapping)")
+                self._trace(tracing.INFO, "Refined Lateral Head Verticality (Snapping)")
 
         # 2. ENFORCE KNEE (F) and ANKLE (G) STABILITY
         # Align G (Ankle) to be somewhat below F (Knee) if the deviation is small
@@ -420,7 +454,7 @@ class AdvancedPoseAnalyzer:
         #         avg_x = (pt_f['x'] + pt_g['x']) / 2
         #         pt_f['x'] = avg_x
         #         pt_g['x'] = avg_x
-        #         self._debug_print("Refined Lateral Leg Verticality (Snapping)")
+        #         self._trace(tracing.INFO, "Refined Lateral Leg Verticality (Snapping)")
 
     def _snap_frontal_skeleton(self, keypoints_dict):
         """Align frontal points for symmetry"""
@@ -442,7 +476,7 @@ class AdvancedPoseAnalyzer:
                     avg_x = (t['x'] + b['x']) / 2
                     t['x'] = avg_x
                     b['x'] = avg_x
-                    self._debug_print(f"Refined Frontal Verticality: {top}-{bot}")
+                    self._trace(tracing.INFO, "Refined Frontal Verticality: %s-%s", top, bot)
 
     def _add_lateral_points(self, results, keypoints_dict):
         """Extract lateral-specific points based on side orientation (Left/Right) with BBox clipping"""
@@ -451,75 +485,71 @@ class AdvancedPoseAnalyzer:
         person_bbox = None
         is_right_lateral = False
         
-        for result in results:
-            if hasattr(result, 'boxes') and result.boxes is not None and len(result.boxes) > 0:
+        results = RawResult.from_results(results)
+        for raw in results:
+            if raw.person_box is not None:
                 # Use the first box since we use xy[0] for keypoints
-                person_bbox = result.boxes.xyxy[0].cpu().numpy()
+                person_bbox = raw.person_box
                 
                 # Determine orientation from any lateral classification present
-                for cls_idx in result.boxes.cls:
-                    class_id = int(cls_idx.item())
-                    class_name = result.names.get(class_id, "").lower()
+                for class_id in raw.class_ids:
+                    class_name = raw.names.get(class_id, "").lower()
                     if any(k in class_name for k in ["kanan", "right"]):
                         # mapping = self.LATERAL_RIGHT_MAPPING # Deferred
                         is_right_lateral = True # Explicitly detected
-                        self._debug_print("Detected Right Lateral side from Class Name")
+                        self._trace(tracing.INFO, "Detected Right Lateral side from Class Name")
                         break
                     elif any(k in class_name for k in ["kiri", "left"]):
                         # mapping = self.LATERAL_LEFT_MAPPING # Deferred
                         is_right_lateral = False # Explicitly detected
-                        self._debug_print("Detected Left Lateral side from Class Name")
+                        self._trace(tracing.INFO, "Detected Left Lateral side from Class Name")
                         break
                     else:
                         # Ambiguous class (e.g. Norman, Lordosis) - Will use auto-detect
                         is_right_lateral = None 
                         
-        for result in results:
-            if hasattr(result, 'keypoints') and result.keypoints is not None:
-                keypoints = result.keypoints
-                if len(keypoints.xy) > 0:
-                    kp = keypoints.xy[0].cpu().numpy()
-                    conf = keypoints.conf[0].cpu().numpy() if keypoints.conf is not None else np.zeros(len(kp))
+        for raw in results:
+            kp, conf = raw.first_keypoints()
+            if kp is not None:
+                if conf is None:
+                    conf = np.zeros(len(kp))
+                
+                # AUTO-DETECT SIDE if not explicit
+                if is_right_lateral is None:
+                    # Check confidence of Left vs Right side keypoints
+                    # Model Indices: Right=[0,1,2,3], Left=[4,5,6,7]
+                    left_indices = [4, 5, 6, 7]
+                    right_indices = [0, 1, 2, 3]
                     
-                    # AUTO-DETECT SIDE if not explicit
-                    if is_right_lateral is None:
-                        # Check confidence of Left vs Right side keypoints
-                        # Model Indices: Right=[0,1,2,3], Left=[4,5,6,7]
-                        left_indices = [4, 5, 6, 7]
-                        right_indices = [0, 1, 2, 3]
-                        
-                        avg_left = np.mean([conf[i] for i in left_indices if i < len(conf)])
-                        avg_right = np.mean([conf[i] for i in right_indices if i < len(conf)])
-                        
-                        if avg_right > avg_left:
-                            is_right_lateral = True
-                            self._debug_print(f"Auto-detected Right Lateral (Conf R:{avg_right:.2f} > L:{avg_left:.2f})")
-                        else:
-                            is_right_lateral = False
-                            self._debug_print(f"Auto-detected Left Lateral (Conf L:{avg_left:.2f} > R:{avg_right:.2f})")
+                    avg_left = np.mean([conf[i] for i in left_indices if i < len(conf)])
+                    avg_right = np.mean([conf[i] for i in right_indices if i < len(conf)])
                     
-                    # Apply Mapping
-                    if is_right_lateral:
-                        mapping = self.LATERAL_RIGHT_MAPPING
+                    if avg_right > avg_left:
+                        is_right_lateral = True
+                        self._trace(tracing.INFO, "Auto-detected Right Lateral (Conf R:%.2f > L:%.2f)", avg_right, avg_left)
                     else:
-                        mapping = self.LATERAL_LEFT_MAPPING
-                    for name, idx in mapping.items():
-                        if idx < len(kp):
-                            x, y = kp[idx]
-                            
-                            # CLIP TO BBOX (If available)
-                            # This prevents points from flying far away from the body
-                            if person_bbox is not None:
-                                x = np.clip(x, person_bbox[0], person_bbox[2])
-                                y = np.clip(y, person_bbox[1], person_bbox[3])
-                            
-                            confidence = conf[idx] if conf is not None and idx < len(conf) else 0.0
-                            visible = True # Force visibility for user-calibrated points
-                            keypoints_dict[f'lateral_{name}'] = {
-                                'x': float(x), 'y': float(y),
-                                'confidence': float(confidence), 'visible': visible
-                            }
-        
+                        is_right_lateral = False
+                        self._trace(tracing.INFO, "Auto-detected Left Lateral (Conf L:%.2f > R:%.2f)", avg_left, avg_right)
+                
+                # Apply Mapping
+                if is_right_lateral:
+                    mapping = self.LATERAL_RIGHT_MAPPING
+                else:
+                    mapping = self.LATERAL_LEFT_MAPPING
+                for name, idx in mapping.items():
+                    if idx < len(kp):
+                        x, y = kp[idx]
+                        
+                        # CLIP TO BBOX (If available)
+                        # This prevents points from flying far away from the body
+                        if person_bbox is not None:
+                            x = np.clip(x, person_bbox[0], person_bbox[2])
+                            y = np.clip(y, person_bbox[1], person_bbox[3])
+                        
+                        confidence = conf[idx] if conf is not None and idx < len(conf) else 0.0
+                        visible = True # Force visibility for user-calibrated points
+                        keypoints_dict[f'lateral_{name}'] = Keypoint(x, y, confidence, visible)
+    
         # Apply Medical Alignment (Phase 13/14) if all critical points exist
         pb = keypoints_dict.get('lateral_pelvic_back')
         pf = keypoints_dict.get('lateral_pelvic_front')
@@ -547,7 +577,7 @@ class AdvancedPoseAnalyzer:
                 
                 # Only clamp if it's WAY off (e.g. outlier)
                 if abs(kn['x'] - e_x) > max_dev:
-                     self._debug_print(f"[LATERAL] Knee deviation {abs(kn['x'] - e_x):.1f} > {max_dev:.1f}, clamping to Hip X")
+                     self._trace(tracing.INFO, "[LATERAL] Knee deviation %.1f > %.1f, clamping to Hip X", abs(kn['x'] - e_x), max_dev)
                      # Soft clamp: move halfway
                      kn['x'] = float(e_x * 0.7 + kn['x'] * 0.3)
             
@@ -560,7 +590,7 @@ class AdvancedPoseAnalyzer:
                 
                 # Check alignment with Hip (e_x)
                 if abs(ankle['x'] - e_x) > max_dev:
-                     self._debug_print(f"[LATERAL] Ankle deviation {abs(ankle['x'] - e_x):.1f} > {max_dev:.1f}, clamping to Hip X")
+                     self._trace(tracing.INFO, "[LATERAL] Ankle deviation %.1f > %.1f, clamping to Hip X", abs(ankle['x'] - e_x), max_dev)
                      ankle['x'] = float(e_x * 0.6 + ankle['x'] * 0.4)
             
             # 2. Enforce 30-degree slant (Miring) for C-D line
@@ -587,7 +617,7 @@ class AdvancedPoseAnalyzer:
                  if 0.05 * p_width < orig_width < 0.20 * p_width:
                      width = orig_width
                      trust_original = True
-                     self._debug_print(f"Trusting original pelvic width: {width:.1f}px")
+                     self._trace(tracing.INFO, "Trusting original pelvic width: %.1fpx", width)
             
             # E center stays at shoulder X (already calculated above)
 
@@ -622,11 +652,9 @@ class AdvancedPoseAnalyzer:
             pf['y'] = e_y + dy + pelvic_y_offset
             
             # Update E in dict
-            keypoints_dict['lateral_pelvic_center'] = {
-                'x': float(e_x), 'y': float(e_y),
-                'confidence': min(pb['confidence'], pf['confidence']),
-                'visible': True
-            }
+            keypoints_dict['lateral_pelvic_center'] = Keypoint(
+                e_x, e_y, min(pb['confidence'], pf['confidence']), True
+            )
             
             # VERTICAL OFFSET: Push F (knee) and G (ankle) down to correct positions
             # The model detection tends to be slightly above the actual joint
@@ -645,7 +673,7 @@ class AdvancedPoseAnalyzer:
                 
                 if kn:
                     kn['y'] = float(kn['y'] + knee_offset)
-                    self._debug_print(f"[LATERAL] Knee pushed down by {knee_offset:.1f}px")
+                    self._trace(tracing.INFO, "[LATERAL] Knee pushed down by %.1fpx", knee_offset)
                 
                 if ankle:
                     ankle['y'] = float(ankle['y'] + ankle_offset)
@@ -653,7 +681,7 @@ class AdvancedPoseAnalyzer:
                     bbox_width = person_bbox[2] - person_bbox[0]
                     ankle_x_offset = bbox_width * 0.05  # 5% to the right
                     ankle['x'] = float(shoulder_x + ankle_x_offset)
-                    self._debug_print(f"🔧 LATERAL: Ankle adjusted to ({ankle['x']:.1f}, {ankle['y']:.1f})")
+                    self._trace(tracing.INFO, "🔧 LATERAL: Ankle adjusted to (%.1f, %.1f)", ankle['x'], ankle['y'])
             
             # Re-clip ALL lateral points to BBox with strict inner margin
             if person_bbox is not None:
@@ -672,46 +700,46 @@ class AdvancedPoseAnalyzer:
                         pt['x'] = float(np.clip(pt['x'], person_bbox[0]+pad_x, person_bbox[2]-pad_x))
                         pt['y'] = float(np.clip(pt['y'], person_bbox[1]+pad_y, person_bbox[3]-pad_y))
                         if pt['x'] != old_x:
-                            self._debug_print(f"🔧 LATERAL CLAMP: {key} x={old_x:.1f} -> {pt['x']:.1f}")
+                            self._trace(tracing.INFO, "🔧 LATERAL CLAMP: %s x=%.1f -> %.1f", key, old_x, pt['x'])
             
-            self._debug_print(f"Universal Medical Alignment applied (Right={is_right_lateral}, Width={width:.1f}px)")
+            self._trace(tracing.INFO, "Universal Medical Alignment applied (Right=%s, Width=%.1fpx)", is_right_lateral, width)
             return
             
         # Default Midpoint Calculation (Fallback if points missing)
         if pb and pf:
             if pb['visible'] and pf['visible']:
-                keypoints_dict['lateral_pelvic_center'] = {
-                    'x': (pb['x'] + pf['x']) / 2,
-                    'y': (pb['y'] + pf['y']) / 2,
-                    'confidence': min(pb['confidence'], pf['confidence']),
-                    'visible': True
-                }
-                self._debug_print(f"Calculated Pelvic Center (E): {keypoints_dict['lateral_pelvic_center']}")
+                keypoints_dict['lateral_pelvic_center'] = Keypoint(
+                    (pb['x'] + pf['x']) / 2,
+                    (pb['y'] + pf['y']) / 2,
+                    min(pb['confidence'], pf['confidence']),
+                    True
+                )
+                self._trace(tracing.DEBUG, "Calculated Pelvic Center (E): %s", keypoints_dict['lateral_pelvic_center'])
 
     def _add_midpoints(self, keypoints_dict):
         if keypoints_dict.get('left_shoulder') and keypoints_dict.get('right_shoulder'):
             ls = keypoints_dict['left_shoulder']
             rs = keypoints_dict['right_shoulder']
             if ls['visible'] and rs['visible']:
-                keypoints_dict['mid_shoulder'] = {
-                    'x': (ls['x'] + rs['x']) / 2,
-                    'y': (ls['y'] + rs['y']) / 2,
-                    'confidence': min(ls['confidence'], rs['confidence']),
-                    'visible': True
-                }
-                self._debug_print(f"Mid shoulder: ({keypoints_dict['mid_shoulder']['x']:.1f}, {keypoints_dict['mid_shoulder']['y']:.1f})")
+                keypoints_dict['mid_shoulder'] = Keypoint(
+                    (ls['x'] + rs['x']) / 2,
+                    (ls['y'] + rs['y']) / 2,
+                    min(ls['confidence'], rs['confidence']),
+                    True
+                )
+                self._trace(tracing.DEBUG, "Mid shoulder: (%.1f, %.1f)", keypoints_dict['mid_shoulder']['x'], keypoints_dict['mid_shoulder']['y'])
 
         if keypoints_dict.get('left_hip') and keypoints_dict.get('right_hip'):
             lh = keypoints_dict['left_hip']
             rh = keypoints_dict['right_hip']
             if lh['visible'] and rh['visible']:
-                keypoints_dict['mid_hip'] = {
-                    'x': (lh['x'] + rh['x']) / 2,
-                    'y': (lh['y'] + rh['y']) / 2,
-                    'confidence': min(lh['confidence'], rh['confidence']),
-                    'visible': True
-                }
-                self._debug_print(f"Mid hip: ({keypoints_dict['mid_hip']['x']:.1f}, {keypoints_dict['mid_hip']['y']:.1f})")
+                keypoints_dict['mid_hip'] = Keypoint(
+                    (lh['x'] + rh['x']) / 2,
+                    (lh['y'] + rh['y']) / 2,
+                    min(lh['confidence'], rh['confidence']),
+                    True
+                )
+                self._trace(tracing.DEBUG, "Mid hip: (%.1f, %.1f)", keypoints_dict['mid_hip']['x'], keypoints_dict['mid_hip']['y'])
 
     def estimate_person_height_from_keypoints(self, keypoints_dict):
         head_points = []
@@ -736,7 +764,7 @@ class AdvancedPoseAnalyzer:
             min_head_y = min(head_points)
             max_ankle_y = max(ankle_points)
             height_px = max_ankle_y - min_head_y
-            self._debug_print(f"Person height in pixels (head-ankle): {height_px:.1f}")
+            self._trace(tracing.DEBUG, "Person height in pixels (head-ankle): %.1f", height_px)
             return height_px if height_px > 100 else None
         
         # Fallback to shoulder-ankle height
@@ -750,7 +778,7 @@ class AdvancedPoseAnalyzer:
             max_ankle_y = max(ankle_points)
             # Add ~25% for head height if using shoulder
             height_px = (max_ankle_y - min_sh_y) * 1.25 
-            self._debug_print(f"Person height in pixels (shoulder-ankle scaled): {height_px:.1f}")
+            self._trace(tracing.DEBUG, "Person height in pixels (shoulder-ankle scaled): %.1f", height_px)
             return height_px if height_px > 100 else None
             
         return None
@@ -771,7 +799,7 @@ class AdvancedPoseAnalyzer:
         # If no anchor points, use all visible points
         if not x_coords:
             for kp in keypoints_dict.values():
-                if isinstance(kp, dict) and kp.get('visible') and 'x' in kp:
+                if isinstance(kp, (Keypoint, dict)) and kp.get('visible') and 'x' in kp:
                     x_coords.append(kp['x'])
         
         if x_coords:
@@ -807,7 +835,8 @@ class AdvancedPoseAnalyzer:
         angle = math.degrees(math.atan2(abs(dy), abs(dx)))
         return abs(angle)
 
-    def analyze_shoulder_imbalance_advanced(self, keypoints, plumb_line_x=None):
+    def analyze_shoulder_imbalance_advanced(self, keypoints, plumb_line_x=None, pixel_to_mm_ratio=None):
+        pixel_to_mm_ratio = self._ratio(pixel_to_mm_ratio)
         left_shoulder = keypoints.get('left_shoulder')
         right_shoulder = keypoints.get('right_shoulder')
 
@@ -823,8 +852,8 @@ class AdvancedPoseAnalyzer:
             results['height_difference_px'] = round(height_diff_px, 2)
 
             # Apply realistic scaling for height difference
-            if self.pixel_to_mm_ratio:
-                height_mm = height_diff_px * self.pixel_to_mm_ratio * self.HEIGHT_DIFF_SCALE
+            if pixel_to_mm_ratio:
+                height_mm = height_diff_px * pixel_to_mm_ratio * self.HEIGHT_DIFF_SCALE
             else:
                 height_mm = height_diff_px * self.HEIGHT_DIFF_SCALE
 
@@ -835,9 +864,9 @@ class AdvancedPoseAnalyzer:
             slope_angle = self.calculate_slope_angle(left_shoulder, right_shoulder)
             results['slope_angle_deg'] = round(min(slope_angle, 30), 2)
 
-            self._debug_print(f"Shoulder Analysis:")
-            self._debug_print(f"  Height diff: {results['height_difference_mm']} mm")
-            self._debug_print(f"  Slope angle: {results['slope_angle_deg']}°")
+            self._trace(tracing.DEBUG, "Shoulder Analysis:")
+            self._trace(tracing.DEBUG, "  Height diff: %s mm", results['height_difference_mm'])
+            self._trace(tracing.DEBUG, "  Slope angle: %s°", results['slope_angle_deg'])
 
             if results['height_difference_mm'] <= 5:
                 height_score = 100
@@ -863,16 +892,16 @@ class AdvancedPoseAnalyzer:
 
             # Calculate Shoulder Shift (Horizontal A to B)
             results['width_mm'] = 0
-            if self.pixel_to_mm_ratio:
+            if pixel_to_mm_ratio:
                 dist_px = abs(left_shoulder['x'] - right_shoulder['x'])
-                results['width_mm'] = round(dist_px * self.pixel_to_mm_ratio, 2)
+                results['width_mm'] = round(dist_px * pixel_to_mm_ratio, 2)
                 
                 # Calculate Lateral Shift (Displacement from center)
                 results['lateral_shift_mm'] = 0
                 if plumb_line_x is not None:
                     mid_x = (left_shoulder['x'] + right_shoulder['x']) / 2
                     shift_px = mid_x - plumb_line_x
-                    results['lateral_shift_mm'] = round(shift_px * self.pixel_to_mm_ratio, 2)
+                    results['lateral_shift_mm'] = round(shift_px * pixel_to_mm_ratio, 2)
 
             if results['height_difference_mm'] < 5 and abs(results['slope_angle_deg']) < 2:
                 results['status'] = 'Very Balanced'
@@ -885,11 +914,12 @@ class AdvancedPoseAnalyzer:
             else:
                 results['status'] = 'Very Unbalanced'
 
-            self._debug_print(f"  Score: {results['score']}, Status: {results['status']}")
+            self._trace(tracing.DEBUG, "  Score: %s, Status: %s", results['score'], results['status'])
 
         return results
 
-    def analyze_hip_imbalance_advanced(self, keypoints, plumb_line_x=None):
+    def analyze_hip_imbalance_advanced(self, keypoints, plumb_line_x=None, pixel_to_mm_ratio=None):
+        pixel_to_mm_ratio = self._ratio(pixel_to_mm_ratio)
         left_hip = keypoints.get('left_hip')
         right_hip = keypoints.get('right_hip')
 
@@ -903,8 +933,8 @@ class AdvancedPoseAnalyzer:
             height_diff_px = abs(left_hip['y'] - right_hip['y'])
 
             # Apply realistic scaling for height difference
-            if self.pixel_to_mm_ratio:
-                height_mm = height_diff_px * self.pixel_to_mm_ratio * self.HEIGHT_DIFF_SCALE
+            if pixel_to_mm_ratio:
+                height_mm = height_diff_px * pixel_to_mm_ratio * self.HEIGHT_DIFF_SCALE
             else:
                 height_mm = height_diff_px * self.HEIGHT_DIFF_SCALE
 
@@ -915,9 +945,9 @@ class AdvancedPoseAnalyzer:
             pelvic_tilt = self.calculate_slope_angle(left_hip, right_hip)
             results['pelvic_tilt_angle'] = round(min(pelvic_tilt, 30), 2)
 
-            self._debug_print(f"Hip Analysis:")
-            self._debug_print(f"  Height diff: {results['height_difference_mm']} mm")
-            self._debug_print(f"  Pelvic tilt: {results['pelvic_tilt_angle']}°")
+            self._trace(tracing.DEBUG, "Hip Analysis:")
+            self._trace(tracing.DEBUG, "  Height diff: %s mm", results['height_difference_mm'])
+            self._trace(tracing.DEBUG, "  Pelvic tilt: %s°", results['pelvic_tilt_angle'])
 
             if results['height_difference_mm'] <= 5:
                 height_score = 100
@@ -943,16 +973,16 @@ class AdvancedPoseAnalyzer:
 
             # Calculate Pelvic Shift (Horizontal C to D)
             results['width_mm'] = 0
-            if self.pixel_to_mm_ratio:
+            if pixel_to_mm_ratio:
                 dist_px = abs(left_hip['x'] - right_hip['x'])
-                results['width_mm'] = round(dist_px * self.pixel_to_mm_ratio, 2)
+                results['width_mm'] = round(dist_px * pixel_to_mm_ratio, 2)
                 
                 # Calculate Lateral Shift (Displacement from center)
                 results['lateral_shift_mm'] = 0
                 if plumb_line_x is not None:
                     mid_x = (left_hip['x'] + right_hip['x']) / 2
                     shift_px = mid_x - plumb_line_x
-                    results['lateral_shift_mm'] = round(shift_px * self.pixel_to_mm_ratio, 2)
+                    results['lateral_shift_mm'] = round(shift_px * pixel_to_mm_ratio, 2)
 
             if results['height_difference_mm'] < 5 and abs(results['pelvic_tilt_angle']) < 2:
                 results['status'] = 'Very Balanced'
@@ -965,11 +995,12 @@ class AdvancedPoseAnalyzer:
             else:
                 results['status'] = 'Very Unbalanced'
 
-            self._debug_print(f"  Score: {results['score']}, Status: {results['status']}")
+            self._trace(tracing.DEBUG, "  Score: %s, Status: %s", results['score'], results['status'])
 
         return results
 
-    def analyze_spinal_alignment_advanced(self, keypoints):
+    def analyze_spinal_alignment_advanced(self, keypoints, pixel_to_mm_ratio=None):
+        pixel_to_mm_ratio = self._ratio(pixel_to_mm_ratio)
         mid_shoulder = keypoints.get('mid_shoulder')
         mid_hip = keypoints.get('mid_hip')
 
@@ -981,7 +1012,7 @@ class AdvancedPoseAnalyzer:
 
         if mid_shoulder and mid_hip and mid_shoulder['visible']:
             deviation_px = abs(mid_shoulder['x'] - mid_hip['x'])
-            results['lateral_deviation_mm'] = round(deviation_px * (self.pixel_to_mm_ratio or 0.26), 2)
+            results['lateral_deviation_mm'] = round(deviation_px * (pixel_to_mm_ratio or 0.26), 2)
             
             # Simple angle calc
             dy = abs(mid_shoulder['y'] - mid_hip['y'])
@@ -994,13 +1025,14 @@ class AdvancedPoseAnalyzer:
 
         return results
 
-    def analyze_leg_alignment_anterior(self, keypoints):
+    def analyze_leg_alignment_anterior(self, keypoints, pixel_to_mm_ratio=None):
         """
         Analyze Leg Alignment for Anterior/Posterior views.
         Right Leg: C (Right Hip) -> E (Right Knee) -> G (Right Ankle)
         Left Leg: D (Left Hip) -> F (Left Knee) -> H (Left Ankle)
         Returns angles for both legs and inter-point distances.
         """
+        pixel_to_mm_ratio = self._ratio(pixel_to_mm_ratio)
         results = {
             'right_leg_angle': 0, 'left_leg_angle': 0,
             'right_leg_status': 'Unknown', 'left_leg_status': 'Unknown',
@@ -1046,7 +1078,7 @@ class AdvancedPoseAnalyzer:
                 results['left_leg_status'] = 'Varus (O)'
 
         # Inter-knee and Inter-ankle distances
-        ratio = self.pixel_to_mm_ratio if self.pixel_to_mm_ratio else 0.26
+        ratio = pixel_to_mm_ratio if pixel_to_mm_ratio else 0.26
         if e and f and e['visible'] and f['visible']:
             dist_px = self._distance(e, f)
             results['inter_knee_mm'] = round(dist_px * ratio, 1)
@@ -1055,10 +1087,10 @@ class AdvancedPoseAnalyzer:
             dist_px = self._distance(g, h)
             results['inter_ankle_mm'] = round(dist_px * ratio, 1)
 
-        self._debug_print(f"Leg Alignment (Ant): R={results['right_leg_angle']}°, L={results['left_leg_angle']}°")
+        self._trace(tracing.DEBUG, "Leg Alignment (Ant): R=%s°, L=%s°", results['right_leg_angle'], results['left_leg_angle'])
         return results
 
-    def analyze_leg_alignment_lateral(self, keypoints):
+    def analyze_leg_alignment_lateral(self, keypoints, pixel_to_mm_ratio=None):
         """
         Analyze Leg Alignment for Lateral views.
         Leg Alignment: E (Pelvic Center) -> F (Knee) -> G (Ankle)
@@ -1067,6 +1099,7 @@ class AdvancedPoseAnalyzer:
         - Knee deviation (horizontal distance of F from E-G line)
         - Height differences for segment visualization
         """
+        pixel_to_mm_ratio = self._ratio(pixel_to_mm_ratio)
         results = {
             'leg_angle': 0, 'leg_status': 'Unknown',
             'knee_deviation_mm': 0,
@@ -1104,7 +1137,7 @@ class AdvancedPoseAnalyzer:
                 # This depends on which side the person is facing.
                 # For simplicity, we'll use the absolute angle first, then logic.
                 
-                ratio = self.pixel_to_mm_ratio if self.pixel_to_mm_ratio else 0.26
+                ratio = pixel_to_mm_ratio if pixel_to_mm_ratio else 0.26
                 results['knee_deviation_mm'] = round(deviation_px * ratio, 1)
 
             # Classification
@@ -1119,16 +1152,17 @@ class AdvancedPoseAnalyzer:
             dy_ef_px = abs(f['y'] - e['y'])
             dy_fg_px = abs(g['y'] - f['y'])
             
-            ratio = self.pixel_to_mm_ratio if self.pixel_to_mm_ratio else 0.26
+            ratio = pixel_to_mm_ratio if pixel_to_mm_ratio else 0.26
             results['height_diff_ef_mm'] = round(dy_ef_px * ratio, 1)
             results['height_diff_fg_mm'] = round(dy_fg_px * ratio, 1)
 
-        self._debug_print(f"Leg Alignment (Lat): Angle={results['leg_angle']}°, Dev={results['knee_deviation_mm']}mm")
+        self._trace(tracing.DEBUG, "Leg Alignment (Lat): Angle=%s°, Dev=%smm", results['leg_angle'], results['knee_deviation_mm'])
         return results
 
 
 
-    def analyze_head_alignment_advanced(self, keypoints):
+    def analyze_head_alignment_advanced(self, keypoints, pixel_to_mm_ratio=None):
+        pixel_to_mm_ratio = self._ratio(pixel_to_mm_ratio)
         left_ear = keypoints.get('left_ear')
         right_ear = keypoints.get('right_ear')
         nose = keypoints.get('nose')
@@ -1159,8 +1193,8 @@ class AdvancedPoseAnalyzer:
                 shift_px = abs(head_center_x - mid_shoulder['x'])
 
                 # Apply realistic scaling for head shift
-                if self.pixel_to_mm_ratio:
-                    shift_mm = shift_px * self.pixel_to_mm_ratio * self.HEAD_SHIFT_SCALE
+                if pixel_to_mm_ratio:
+                    shift_mm = shift_px * pixel_to_mm_ratio * self.HEAD_SHIFT_SCALE
                 else:
                     shift_mm = shift_px * self.HEAD_SHIFT_SCALE
 
@@ -1171,18 +1205,18 @@ class AdvancedPoseAnalyzer:
                     forward_px = abs(nose['y'] - mid_shoulder['y']) * 0.15
 
                     # Apply realistic scaling for forward lean
-                    if self.pixel_to_mm_ratio:
-                        forward_mm = forward_px * self.pixel_to_mm_ratio * self.HEAD_SHIFT_SCALE
+                    if pixel_to_mm_ratio:
+                        forward_mm = forward_px * pixel_to_mm_ratio * self.HEAD_SHIFT_SCALE
                     else:
                         forward_mm = forward_px * self.HEAD_SHIFT_SCALE
 
                     # Cap at maximum realistic value (80mm)
                     results['forward_lean_mm'] = round(min(80, forward_mm), 2)
 
-            self._debug_print(f"Head Analysis:")
-            self._debug_print(f"  Tilt angle: {results['tilt_angle']}°")
-            self._debug_print(f"  Shift: {results['shift_mm']} mm")
-            self._debug_print(f"  Forward lean: {results['forward_lean_mm']} mm")
+            self._trace(tracing.DEBUG, "Head Analysis:")
+            self._trace(tracing.DEBUG, "  Tilt angle: %s°", results['tilt_angle'])
+            self._trace(tracing.DEBUG, "  Shift: %s mm", results['shift_mm'])
+            self._trace(tracing.DEBUG, "  Forward lean: %s mm", results['forward_lean_mm'])
 
             abs_tilt = abs(results['tilt_angle'])
             if abs_tilt <= 3:
@@ -1217,7 +1251,7 @@ class AdvancedPoseAnalyzer:
             else:
                 results['status'] = 'Critical Misalignment'
 
-            self._debug_print(f"  Score: {results['score']}, Status: {results['status']}")
+            self._trace(tracing.DEBUG, "  Score: %s, Status: %s", results['score'], results['status'])
 
         return results
 
@@ -1341,8 +1375,9 @@ class AdvancedPoseAnalyzer:
             'debug_info': debug_info
         }
 
-    def analyze_lateral_distances(self, keypoints):
+    def analyze_lateral_distances(self, keypoints, pixel_to_mm_ratio=None):
         """Calculate distances for side view: Ear-Shoulder, Shoulder-Pelvic, PelvicBack-PelvicFront"""
+        pixel_to_mm_ratio = self._ratio(pixel_to_mm_ratio)
         results = {
             'head_shift_mm': 0,
             'spine_shift_mm': 0,
@@ -1353,7 +1388,7 @@ class AdvancedPoseAnalyzer:
         }
         
         # Ensure we have a valid ratio
-        ratio = self.pixel_to_mm_ratio if self.pixel_to_mm_ratio and self.pixel_to_mm_ratio > 0 else 0.5
+        ratio = pixel_to_mm_ratio if pixel_to_mm_ratio and pixel_to_mm_ratio > 0 else 0.5
             
         def get_pt(name):
             # Prefer lateral_ prefix, fallback to standard keys
@@ -1441,7 +1476,7 @@ class AdvancedPoseAnalyzer:
         total_score = max(0, min(100, total_score))
         total_score = round(total_score, 2)
 
-        self._debug_print(f"Overall Posture Score: {total_score}")
+        self._trace(tracing.DEBUG, "Overall Posture Score: %s", total_score)
 
         if total_score >= 90:
             assessment = 'Excellent'
@@ -1475,9 +1510,9 @@ class AdvancedPoseAnalyzer:
         """
         try:
             person_bbox = None
-            for result in results:
-                if hasattr(result, 'boxes') and result.boxes is not None and len(result.boxes) > 0:
-                    b = result.boxes.xyxy[0].cpu().numpy()
+            for raw in RawResult.from_results(results):
+                b = raw.person_box
+                if b is not None:
                     person_bbox = (b[0], b[1], b[2], b[3])
                     break
             
@@ -1493,10 +1528,10 @@ class AdvancedPoseAnalyzer:
                             out_of_bounds.append(f"{k} ({x:.1f}, {y:.1f})")
                 
                 if out_of_bounds:
-                    self._debug_print(f"⚠️ WARNING: {len(out_of_bounds)} keypoints outside BBox: {', '.join(out_of_bounds)}")
+                    self._trace(tracing.INFO, "⚠️ WARNING: %s keypoints outside BBox: %s", len(out_of_bounds), ', '.join(out_of_bounds))
                     keypoints_dict['debug_warnings'] = out_of_bounds
                 else:
-                    self._debug_print("✅ All keypoints within BBox limits")
+                    self._trace(tracing.DEBUG, "✅ All keypoints within BBox limits")
                     
         except Exception as e:
             print(f"Bounds check error: {e}")
@@ -1508,9 +1543,9 @@ class AdvancedPoseAnalyzer:
         """
         try:
             person_bbox = None
-            for result in results:
-                if hasattr(result, 'boxes') and result.boxes is not None and len(result.boxes) > 0:
-                    b = result.boxes.xyxy[0].cpu().numpy()
+            for raw in RawResult.from_results(results):
+                b = raw.person_box
+                if b is not None:
                     person_bbox = (b[0], b[1], b[2], b[3])
                     break
             
@@ -1541,10 +1576,10 @@ class AdvancedPoseAnalyzer:
                             pt['x'] = float(new_x)
                             pt['y'] = float(new_y)
                             clamped_count += 1
-                            self._debug_print(f"   -> Clamped {k}: ({orig_x:.1f},{orig_y:.1f}) -> ({new_x:.1f},{new_y:.1f})")
+                            self._trace(tracing.INFO, "   -> Clamped %s: (%.1f,%.1f) -> (%.1f,%.1f)", k, orig_x, orig_y, new_x, new_y)
                 
                 if clamped_count > 0:
-                    self._debug_print(f"[CLAMPED] {clamped_count} keypoints to INNER BBox boundaries")
+                    self._trace(tracing.INFO, "[CLAMPED] %s keypoints to INNER BBox boundaries", clamped_count)
                     
         except Exception as e:
             print(f"Clamping error: {e}")
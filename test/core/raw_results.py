@@ -0,0 +1,228 @@
+import numpy as np
+
+
+class _ArrayTensor:
+    """
+    Minimal stand-in for a torch tensor backed by a NumPy array.
+
+    Supports the subset the analyzers use on Ultralytics results:
+    `.cpu()`, `.numpy()`, `.item()`, `len()`, indexing and iteration.
+    """
+    __slots__ = ('_data',)
+
+    def __init__(self, data):
+        self._data = np.asarray(data)
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return self._data
+
+    def item(self):
+        return self._data.item()
+
+    @property
+    def shape(self):
+        return self._data.shape
+
+    def __len__(self):
+        return len(self._data)
+
+    def __getitem__(self, idx):
+        return _ArrayTensor(self._data[idx])
+
+    def __iter__(self):
+        return (_ArrayTensor(row) for row in self._data)
+
+
+class _Boxes:
+    __slots__ = ('xyxy', 'conf', 'cls')
+
+    def __init__(self, xyxy, conf, cls):
+        self.xyxy = _ArrayTensor(xyxy)
+        self.conf = _ArrayTensor(conf)
+        self.cls = _ArrayTensor(cls)
+
+    def __len__(self):
+        return len(self.xyxy)
+
+
+class _Keypoints:
+    __slots__ = ('xy', 'conf')
+
+    def __init__(self, xy, conf):
+        self.xy = _ArrayTensor(xy)
+        self.conf = _ArrayTensor(conf) if conf is not None else None
+
+
+class RawResult:
+    """
+    Plain-NumPy snapshot of one Ultralytics `Results` entry (boxes + keypoints).
+
+    It is picklable and cheap to store, and it quacks like a `Results` object,
+    so it can be fed back to `AdvancedPoseAnalyzer.extract_keypoints_from_results`
+    and `PostureAnalyzerService._get_detections` without running the model again.
+    """
+
+    def __init__(self, boxes_xyxy, boxes_conf, boxes_cls, keypoints_xy=None, keypoints_conf=None,
+                 names=None, orig_shape=None):
+        self.boxes_xyxy = np.asarray(boxes_xyxy, dtype=np.float32).reshape(-1, 4)
+        self.boxes_conf = np.asarray(boxes_conf, dtype=np.float32).reshape(-1)
+        self.boxes_cls = np.asarray(boxes_cls, dtype=np.float32).reshape(-1)
+        self.keypoints_xy = None if keypoints_xy is None else np.asarray(keypoints_xy, dtype=np.float32)
+        self.keypoints_conf = None if keypoints_conf is None else np.asarray(keypoints_conf, dtype=np.float32)
+        self.names = dict(names or {})
+        self.orig_shape = tuple(orig_shape) if orig_shape is not None else None
+
+    @classmethod
+    def from_result(cls, result) -> 'RawResult':
+        if isinstance(result, RawResult):
+            return result
+
+        boxes = getattr(result, 'boxes', None)
+        if boxes is not None and len(boxes) > 0:
+            xyxy = boxes.xyxy.cpu().numpy()
+            conf = boxes.conf.cpu().numpy()
+            cls_ = boxes.cls.cpu().numpy()
+        else:
+            xyxy, conf, cls_ = np.zeros((0, 4)), np.zeros(0), np.zeros(0)
+
+        kp_xy = kp_conf = None
+        keypoints = getattr(result, 'keypoints', None)
+        if keypoints is not None:
+            kp_xy = keypoints.xy.cpu().numpy()
+            kp_conf = keypoints.conf.cpu().numpy() if keypoints.conf is not None else None
+
+        return cls(xyxy, conf, cls_, kp_xy, kp_conf,
+                   names=getattr(result, 'names', None),
+                   orig_shape=getattr(result, 'orig_shape', None))
+
+    @classmethod
+    def from_results(cls, results) -> list:
+        """Normalize a model output list once; entries that are already RawResults pass through."""
+        return [cls.from_result(result) for result in results]
+
+    # --- Array accessors -----------------------------------------------------------
+
+    @property
+    def person_box(self):
+        """First detection's (x1, y1, x2, y2), the box the first keypoint set belongs to; None if empty."""
+        return self.boxes_xyxy[0] if len(self.boxes_xyxy) > 0 else None
+
+    @property
+    def class_ids(self) -> list:
+        return self.boxes_cls.astype(np.int64).tolist()
+
+    def first_keypoints(self):
+        """(xy, conf) of the first detected person, conf None if the model gave none; (None, None) if no keypoints."""
+        if self.keypoints_xy is None or len(self.keypoints_xy) == 0:
+            return None, None
+        conf = self.keypoints_conf[0] if self.keypoints_conf is not None else None
+        return self.keypoints_xy[0], conf
+
+    # --- Results-compatible view -------------------------------------------------
+
+    @property
+    def boxes(self):
+        return _Boxes(self.boxes_xyxy, self.boxes_conf, self.boxes_cls)
+
+    @property
+    def keypoints(self):
+        if self.keypoints_xy is None:
+            return None
+        return _Keypoints(self.keypoints_xy, self.keypoints_conf)
+
+    def filter(self, confidence_threshold: float) -> 'RawResult':
+        """
+        Drop detections (and their keypoints) whose box confidence is below the threshold.
+
+        NMS never lets a lower-scored box suppress a higher-scored one, so filtering
+        a result produced at a low floor gives the same detections as running the
+        model at the higher threshold directly.
+        """
+        keep = self.boxes_conf >= confidence_threshold
+        if keep.all():
+            return self
+        return self.select(keep)
+
+    def select(self, keep) -> 'RawResult':
+        """Detections at `keep` (boolean mask or index array), with their keypoint sets."""
+        # Pose results carry one keypoint set per box, in the same order
+        keypoints_xy, keypoints_conf = self.keypoints_xy, self.keypoints_conf
+        if keypoints_xy is not None and len(keypoints_xy) == len(self.boxes_xyxy):
+            keypoints_xy = keypoints_xy[keep]
+            if keypoints_conf is not None:
+                keypoints_conf = keypoints_conf[keep]
+
+        return RawResult(self.boxes_xyxy[keep], self.boxes_conf[keep], self.boxes_cls[keep],
+                         keypoints_xy, keypoints_conf, names=self.names, orig_shape=self.orig_shape)
+
+    def people(self) -> list:
+        """
+        One single-detection RawResult per detected person, left to right.
+
+        Each one reads like a photo of that person alone, so the single-person
+        keypoint extraction and geometry run on it unchanged.
+        """
+        order = np.argsort(self.boxes_xyxy[:, 0], kind='stable')
+        return [self.select(order[i:i + 1]) for i in range(len(order))]
+
+    def rescale(self, shape) -> 'RawResult':
+        """
+        Map boxes and keypoints to an image of `shape` (height, width).
+
+        Used when inference ran on a downscaled decode: coordinates are scaled
+        back to the original photo so mm measurements do not change.
+        """
+        shape = tuple(int(v) for v in shape[:2])
+        if self.orig_shape is None or tuple(self.orig_shape[:2]) == shape:
+            return self
+
+        sy = shape[0] / self.orig_shape[0]
+        sx = shape[1] / self.orig_shape[1]
+        keypoints_xy = None
+        if self.keypoints_xy is not None:
+            keypoints_xy = self.keypoints_xy * np.array([sx, sy], dtype=np.float32)
+
+        return RawResult(self.boxes_xyxy * np.array([sx, sy, sx, sy], dtype=np.float32),
+                         self.boxes_conf, self.boxes_cls, keypoints_xy, self.keypoints_conf,
+                         names=self.names, orig_shape=shape)
+
+    # --- Storage -----------------------------------------------------------------
+
+    @property
+    def nbytes(self) -> int:
+        total = self.boxes_xyxy.nbytes + self.boxes_conf.nbytes + self.boxes_cls.nbytes
+        if self.keypoints_xy is not None:
+            total += self.keypoints_xy.nbytes
+        if self.keypoints_conf is not None:
+            total += self.keypoints_conf.nbytes
+        return total
+
+    def to_arrays(self) -> dict:
+        arrays = {
+            'boxes_xyxy': self.boxes_xyxy,
+            'boxes_conf': self.boxes_conf,
+            'boxes_cls': self.boxes_cls,
+            'names_ids': np.array(list(self.names.keys()), dtype=np.int64),
+            'names_values': np.array(list(self.names.values()), dtype=str),
+        }
+        if self.keypoints_xy is not None:
+            arrays['keypoints_xy'] = self.keypoints_xy
+        if self.keypoints_conf is not None:
+            arrays['keypoints_conf'] = self.keypoints_conf
+        if self.orig_shape is not None:
+            arrays['orig_shape'] = np.array(self.orig_shape, dtype=np.int64)
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays) -> 'RawResult':
+        names = {int(k): str(v) for k, v in zip(arrays['names_ids'], arrays['names_values'])}
+        return cls(
+            arrays['boxes_xyxy'], arrays['boxes_conf'], arrays['boxes_cls'],
+            arrays['keypoints_xy'] if 'keypoints_xy' in arrays else None,
+            arrays['keypoints_conf'] if 'keypoints_conf' in arrays else None,
+            names=names,
+            orig_shape=tuple(arrays['orig_shape']) if 'orig_shape' in arrays else None
+        )
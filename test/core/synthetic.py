@@ -0,0 +1,75 @@
+"""
+Synthetic Kuro-model detections, shared by the stub backend, the analyzer
+benchmark and the batch-engine parity test.
+"""
+import numpy as np
+
+from .pose_analyzer import AdvancedPoseAnalyzer
+from .raw_results import RawResult
+
+NAMES = {0: 'Normal-Depan', 1: 'Kyphosis-Belakang', 2: 'Kyphosis-Kiri', 3: 'Lordosis-Kanan'}
+FRONTAL_CLASSES = (0, 1)
+LATERAL_CLASSES = (2, 3)
+
+# Model keypoint layouts as (x, y) fractions of the person box, see AdvancedPoseAnalyzer mappings.
+# Frontal: the subject's right side is on the image's left.
+FRONTAL_TEMPLATE = np.array([
+    [0.30, 0.20], [0.38, 0.50], [0.40, 0.72], [0.40, 0.95],  # right shoulder, hip, knee, ankle
+    [0.70, 0.20], [0.62, 0.50], [0.60, 0.72], [0.60, 0.95],  # left shoulder, hip, knee, ankle
+])
+LATERAL_LEFT_TEMPLATE = np.array([
+    [0.50, 0.08], [0.50, 0.20], [0.50, 0.50], [0.52, 0.95],  # ear, shoulder, hip, ankle
+    [0.45, 0.50], [0.48, 0.60], [0.50, 0.80], [0.51, 0.72],  # unused, unused, unused, knee
+])
+LATERAL_RIGHT_TEMPLATE = np.array([
+    [0.50, 0.08], [0.50, 0.20], [0.50, 0.50], [0.51, 0.72],  # ear, shoulder, hip, knee
+    [0.52, 0.95], [0.48, 0.60], [0.50, 0.80], [0.45, 0.50],  # ankle, unused...
+])
+
+
+def synthetic_result(rng, lateral: bool) -> RawResult:
+    """One RawResult with a single person in a random-sized photo."""
+    h, w = int(rng.integers(720, 4000)), int(rng.integers(540, 3000))
+    box_w, box_h = w * rng.uniform(0.25, 0.5), h * rng.uniform(0.7, 0.9)
+    x1, y1 = rng.uniform(0, w - box_w), rng.uniform(0, h - box_h)
+
+    if lateral:
+        cls = int(rng.choice(LATERAL_CLASSES))
+        template = LATERAL_LEFT_TEMPLATE if 'kiri' in NAMES[cls].lower() else LATERAL_RIGHT_TEMPLATE
+    else:
+        cls = int(rng.choice(FRONTAL_CLASSES))
+        template = FRONTAL_TEMPLATE
+
+    points = template + rng.normal(0, [0.01, 0.004], template.shape)
+    keypoints = points * [box_w, box_h] + [x1, y1]
+    return RawResult([[x1, y1, x1 + box_w, y1 + box_h]], [rng.uniform(0.5, 0.95)], [cls],
+                     keypoints[None], rng.uniform(0.3, 0.99, (1, len(template))),
+                     names=NAMES, orig_shape=(h, w))
+
+
+def reference_geometry(analyzer: AdvancedPoseAnalyzer, keypoints, image_h, image_w, height_cm=170):
+    """
+    The geometry and scoring PostureAnalyzerService.analyze_result runs after keypoint
+    extraction, one call per stage, in the layout of BatchAnalysis.to_dicts().
+    """
+    person_height_px = analyzer.estimate_person_height_from_keypoints(keypoints)
+    if person_height_px is None:
+        person_height_px = image_h * 0.7
+    actual_height_mm = height_cm * 10
+    analyzer.calculate_pixel_to_mm_ratio(image_h, person_height_px, actual_height_mm)
+    center_x = analyzer.calculate_posture_center_x(keypoints, image_w)
+    analysis = {
+        'conversion_ratio': analyzer.pixel_to_mm_ratio,
+        'actual_height_mm': actual_height_mm,
+        'person_height_px': person_height_px,
+        'posture_center_x': center_x,
+        'shoulder': analyzer.analyze_shoulder_imbalance_advanced(keypoints, plumb_line_x=center_x),
+        'hip': analyzer.analyze_hip_imbalance_advanced(keypoints, plumb_line_x=center_x),
+        'spinal': analyzer.analyze_spinal_alignment_advanced(keypoints),
+        'head': analyzer.analyze_head_alignment_advanced(keypoints),
+        'lateral_distances': analyzer.analyze_lateral_distances(keypoints),
+        'leg_anterior': analyzer.analyze_leg_alignment_anterior(keypoints),
+        'leg_lateral': analyzer.analyze_leg_alignment_lateral(keypoints),
+    }
+    analysis['posture_score'] = analyzer.calculate_overall_posture_score(analysis)
+    return analysis
@@ -0,0 +1,87 @@
+import os
+import sys
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional
+
+# INFO: corrections applied to the keypoints (snaps, clamps, offsets, reconstructions).
+# DEBUG: everything, including intermediate measurements.
+OFF, INFO, DEBUG = 0, 1, 2
+LEVEL_NAMES = {OFF: 'off', INFO: 'info', DEBUG: 'debug'}
+
+
+def parse_level(value) -> int:
+    """'off' / 'info' / 'debug' (or 0-2) to a level; anything else is OFF."""
+    if isinstance(value, int):
+        return max(OFF, min(DEBUG, value))
+    return {name: level for level, name in LEVEL_NAMES.items()}.get(str(value).strip().lower(), OFF)
+
+
+# Printed to stdout. OFF in production: a disabled trace call is one comparison
+# and one context-variable lookup, and its message is never formatted.
+_stdout_level = parse_level(os.getenv('POSE_TRACE_LEVEL', 'off'))
+_current: ContextVar[Optional['Trace']] = ContextVar('pose_trace', default=None)
+
+
+class Trace:
+    """Trace records collected for one request by `collect()`."""
+
+    def __init__(self, level: int = INFO):
+        self.level = level
+        self.events: List[Dict] = []
+        self._started = time.perf_counter()
+
+    def add(self, level: int, step: str, message: str):
+        self.events.append({
+            't_ms': round((time.perf_counter() - self._started) * 1000, 3),
+            'level': LEVEL_NAMES[level],
+            'step': step,
+            'message': message
+        })
+
+    def to_list(self) -> List[Dict]:
+        return list(self.events)
+
+
+def set_stdout_level(level):
+    global _stdout_level
+    _stdout_level = parse_level(level)
+
+
+def enabled(level: int = DEBUG) -> bool:
+    """True if a record at `level` would be printed or collected."""
+    if level <= _stdout_level:
+        return True
+    trace = _current.get()
+    return trace is not None and level <= trace.level
+
+
+def emit(level: int, message: str, *args, echo: bool = False, stacklevel: int = 1):
+    """
+    Record `message % args` if anyone listens at `level`.
+
+    `echo` prints regardless of POSE_TRACE_LEVEL. Collected records carry the
+    name of the calling function (`stacklevel` frames up) as their 'step'.
+    """
+    trace = _current.get()
+    collect = trace is not None and level <= trace.level
+    show = echo or level <= _stdout_level
+    if not (collect or show):
+        return
+    text = message % args if args else message
+    if show:
+        print(f"[{LEVEL_NAMES[level].upper()}] {text}")
+    if collect:
+        trace.add(level, sys._getframe(stacklevel).f_code.co_name, text)
+
+
+@contextmanager
+def collect(level: int = INFO) -> Iterator[Trace]:
+    """Collect the trace records emitted in this context (thread/task local)."""
+    trace = Trace(level)
+    token = _current.set(trace)
+    try:
+        yield trace
+    finally:
+        _current.reset(token)
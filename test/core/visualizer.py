@@ -1,6 +1,8 @@
 import cv2
 import numpy as np
 
+from .raw_results import RawResult
+
 
 def visualize_angles_and_imbalance(image, results, analysis_results=None, detections=None):
     if len(image.shape) == 3:
@@ -11,25 +13,22 @@ def visualize_angles_and_imbalance(image, results, analysis_results=None, detect
     else:
         img_rgb = cv2.cvtColor(image, cv2.COLOR_GRAY2RGB)
 
-    for result in results:
-        if hasattr(result, 'keypoints') and result.keypoints is not None:
-            keypoints = result.keypoints
-            if len(keypoints.xy) > 0:
-                kp = keypoints.xy[0].cpu().numpy()
-
-                skeleton_pairs = [(5, 6), (5, 11), (6, 12), (11, 12),
-                                 (5, 7), (7, 9), (6, 8), (8, 10),
-                                 (11, 13), (13, 15), (12, 14), (14, 16)]
+    for raw in RawResult.from_results(results):
+        kp, _ = raw.first_keypoints()
+        if kp is not None:
+            skeleton_pairs = [(5, 6), (5, 11), (6, 12), (11, 12),
+                             (5, 7), (7, 9), (6, 8), (8, 10),
+                             (11, 13), (13, 15), (12, 14), (14, 16)]
 
-                for start_idx, end_idx in skeleton_pairs:
-                    if start_idx < len(kp) and end_idx < len(kp):
-                        start_pt = (int(kp[start_idx][0]), int(kp[start_idx][1]))
-                        end_pt = (int(kp[end_idx][0]), int(kp[end_idx][1]))
-                        cv2.line(img_rgb, start_pt, end_pt, (255, 255, 0), 2)
+            for start_idx, end_idx in skeleton_pairs:
+                if start_idx < len(kp) and end_idx < len(kp):
+                    start_pt = (int(kp[start_idx][0]), int(kp[start_idx][1]))
+                    end_pt = (int(kp[end_idx][0]), int(kp[end_idx][1]))
+                    cv2.line(img_rgb, start_pt, end_pt, (255, 255, 0), 2)
 
-                for i, (x, y) in enumerate(kp[:17]):
-                    cv2.circle(img_rgb, (int(x), int(y)), 6, (255, 0, 0), -1)
-                    cv2.circle(img_rgb, (int(x), int(y)), 8, (255, 255, 255), 1)
+            for i, (x, y) in enumerate(kp[:17]):
+                cv2.circle(img_rgb, (int(x), int(y)), 6, (255, 0, 0), -1)
+                cv2.circle(img_rgb, (int(x), int(y)), 8, (255, 255, 255), 1)
 
     if analysis_results and 'keypoints' in analysis_results:
         keypoints_dict = analysis_results['keypoints']
@@ -148,11 +147,16 @@ def visualize_just_imbalance(image, analysis_results):
     return img_copy
 
 
-def visualize_skeleton_custom(image, keypoints_dict):
+def visualize_skeleton_custom(image, keypoints_dict, bgr=False, scale=1.0):
     """
     Draw skeleton using the PROCESSED keypoints dict (with snapped/adjusted points).
     This ensures the visualization matches the analysis logic.
+    Colors are RGB; pass bgr=True to draw on a BGR image (e.g. straight from cv2.imdecode).
+    `scale` maps keypoint coordinates onto the image when it is a resized copy of the photo.
     """
+    def color_of(rgb):
+        return rgb[::-1] if bgr else rgb
+
     # Work on a copy
     img_vis = image.copy()
     if len(img_vis.shape) == 2:
@@ -187,23 +191,23 @@ def visualize_skeleton_custom(image, keypoints_dict):
         pt2 = keypoints_dict.get(end_k)
         
         if pt1 and pt2 and pt1.get('visible') and pt2.get('visible'):
-            p1 = (int(pt1['x']), int(pt1['y']))
-            p2 = (int(pt2['x']), int(pt2['y']))
+            p1 = (int(pt1['x'] * scale), int(pt1['y'] * scale))
+            p2 = (int(pt2['x'] * scale), int(pt2['y'] * scale))
             
             # Color: Cyan for Lateral, Magenta/Cyan mix for Frontal to match user style
             color = (255, 255, 0) # Cyan-ish default
             if 'lateral' in start_k:
                  color = (255, 0, 255) # Magenta for lateral
             
-            cv2.line(img_vis, p1, p2, color, 2)
+            cv2.line(img_vis, p1, p2, color_of(color), 2)
             
     # 3. DRAW POINTS
     for k, pt in keypoints_dict.items():
         if pt and pt.get('visible') and 'x' in pt:
-            x, y = int(pt['x']), int(pt['y'])
+            x, y = int(pt['x'] * scale), int(pt['y'] * scale)
             
             # Color: Green dots
-            cv2.circle(img_vis, (x, y), 5, (0, 255, 0), -1)
+            cv2.circle(img_vis, (x, y), 5, color_of((0, 255, 0)), -1)
             
             # Label specific points for debug? (Optional)
             if k in ['left_knee', 'lateral_knee']:
@@ -215,7 +219,7 @@ def visualize_skeleton_custom(image, keypoints_dict):
         y_off = 30
         for w in warnings:
             cv2.putText(img_vis, f"OUT OF BOUNDS: {w}", (10, y_off), 
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 255), 2)
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, color_of((0, 0, 255)), 2)
             y_off += 25
             
     return img_vis
@@ -9,7 +9,6 @@ from datetime import datetime
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import io
-import base64
 
 class ResultsScreen(ttk.Frame):
     def __init__(self, parent, app):
@@ -1125,14 +1124,22 @@ class ResultsScreen(ttk.Frame):
 
         # USE PRE-GENERATED SKELETON IMAGE IF AVAILABLE (ULTRALYTICS PLOT)
         # SKIP for lateral view - Ultralytics shows all 17 COCO points which are ambiguous on side view
-        skeleton_img_b64 = self.analysis_data.get('skeleton_image')
-        if skeleton_img_b64 and not self._is_lateral():
+        # Fetched from the API artifact store on first display, then kept with the analysis
+        skeleton_img_bytes = None
+        if self.analysis_data.get('skeleton_image_url') and not self._is_lateral():
+            skeleton_img_bytes = self.analysis_data.get('skeleton_image_bytes')
+            if skeleton_img_bytes is None:
+                skeleton_img_bytes = self.app.api_client.get_artifact(self.analysis_data['skeleton_image_url'])
+                self.analysis_data['skeleton_image_bytes'] = skeleton_img_bytes
+        if skeleton_img_bytes and not self._is_lateral():
             try:
-                img_data = base64.b64decode(skeleton_img_b64)
-                nparr = np.frombuffer(img_data, np.uint8)
+                nparr = np.frombuffer(skeleton_img_bytes, np.uint8)
                 # Ultralytics plot() returns BGR
                 decoded_img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
                 if decoded_img is not None:
+                    # The API renders at most SKELETON_IMAGE_MAX_SIDE; overlays below use photo coordinates
+                    if decoded_img.shape[:2] != (h, w):
+                        decoded_img = cv2.resize(decoded_img, (w, h), interpolation=cv2.INTER_LINEAR)
                     # Convert BGR to RGB for internal processing
                     img_vis = cv2.cvtColor(decoded_img, cv2.COLOR_BGR2RGB)
                     h, w, _ = img_vis.shape
@@ -1483,7 +1490,7 @@ class ResultsScreen(ttk.Frame):
                 pt = (int(k['x']), int(k['y']))
                 if is_in_bbox(pt, person_bbox):
                     # Point Circle - HANDLED BY ULTRALYTICS PLOT
-                    if not skeleton_img_b64:
+                    if not skeleton_img_bytes:
                         cv2.circle(img_vis, pt, 7, (255, 255, 255), -1, cv2.LINE_AA)
                         cv2.circle(img_vis, pt, 4, (255, 100, 0) if 'lateral' in kp_name else (0, 100, 255), -1, cv2.LINE_AA)
                     
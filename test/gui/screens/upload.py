@@ -896,7 +896,12 @@ class UploadScreen(ttk.Frame):
             'height_cm': height_cm
         }
 
-        threading.Thread(target=self._analyze_thread, args=(patient_data,), daemon=True).start()
+        if self.analysis_mode == 'batch' and self.auto_run_var.get():
+            # Auto-run: send the rest of the folder in one streaming request, results land as they finish
+            remaining = self.batch_images[self.current_batch_index:]
+            threading.Thread(target=self._analyze_batch_stream_thread, args=(patient_data, remaining), daemon=True).start()
+        else:
+            threading.Thread(target=self._analyze_thread, args=(patient_data,), daemon=True).start()
 
     def _analyze_thread(self, patient_data):
         try:
@@ -912,41 +917,7 @@ class UploadScreen(ttk.Frame):
                 raise Exception(response.get('message', 'API analysis failed'))
             
             data = response.get('data', {})
-            
-            # 2. Local image processing to match GUI expectations
-            img = cv2.imread(self.image_path, cv2.IMREAD_COLOR)
-            if img is None:
-                raise ValueError(f"Failed to load image from {self.image_path}")
-                
-            img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-            
-            # 3. Map API response to local analysis_results format
-            analysis_results = {
-                'analysis_id': data.get('analysis_id'),
-                'keypoints': data.get('keypoints'),  # API should return this if saved
-                'shoulder': data.get('shoulder'),
-                'hip': data.get('hip'),
-                'spinal': data.get('spinal'),
-                'head': data.get('head'),
-                'posture_score': data.get('posture_score'),
-                'postural_angles': data.get('postural_angles'),
-                'detections': data.get('detections'),
-                'conversion_ratio': data.get('conversion_ratio'),
-                'mm_per_pixel': data.get('conversion_ratio'), # Map to what ResultsScreen expects
-                'actual_height_mm': data.get('actual_height_mm'),
-                'image_height': img.shape[0],
-                'image_width': img.shape[1],
-                'image': img,
-                'image_rgb': img_rgb,
-                'image_path': self.image_path,
-                'analysis_type': 'full_analysis',
-                'view_type': (data.get('detections', {}).get('all_detections', []) or [{}])[0].get('classification', 'unknown'),
-                'confidence_threshold': self.confidence_threshold
-            }
-
-            # Fallback view type determination if not clear from API
-            if analysis_results['view_type'] == 'unknown':
-                 analysis_results['view_type'] = self._determine_view_type(data.get('detections'))
+            analysis_results = self._build_analysis_results(self.image_path, data)
 
             self.parent.after(0, lambda: self._analysis_complete(analysis_results))
 
@@ -956,6 +927,88 @@ class UploadScreen(ttk.Frame):
             self.parent.after(0, lambda err=str(e): self._analysis_error(err))
 
 
+    def _build_analysis_results(self, image_path, data):
+        """Map one API AnalysisResult onto the analysis_results dict the results screen expects."""
+        # Local image processing to match GUI expectations
+        img = cv2.imread(image_path, cv2.IMREAD_COLOR)
+        if img is None:
+            raise ValueError(f"Failed to load image from {image_path}")
+            
+        img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+        
+        # Map API response to local analysis_results format
+        analysis_results = {
+            'analysis_id': data.get('analysis_id'),
+            'keypoints': data.get('keypoints'),  # API should return this if saved
+            'shoulder': data.get('shoulder'),
+            'hip': data.get('hip'),
+            'spinal': data.get('spinal'),
+            'head': data.get('head'),
+            'posture_score': data.get('posture_score'),
+            'postural_angles': data.get('postural_angles'),
+            'detections': data.get('detections'),
+            'conversion_ratio': data.get('conversion_ratio'),
+            'mm_per_pixel': data.get('conversion_ratio'), # Map to what ResultsScreen expects
+            'actual_height_mm': data.get('actual_height_mm'),
+            'skeleton_image_url': data.get('skeleton_image_url'),
+            'image_height': img.shape[0],
+            'image_width': img.shape[1],
+            'image': img,
+            'image_rgb': img_rgb,
+            'image_path': image_path,
+            'analysis_type': 'full_analysis',
+            'view_type': (data.get('detections', {}).get('all_detections', []) or [{}])[0].get('classification', 'unknown'),
+            'confidence_threshold': self.confidence_threshold
+        }
+
+        # Fallback view type determination if not clear from API
+        if analysis_results['view_type'] == 'unknown':
+             analysis_results['view_type'] = self._determine_view_type(data.get('detections'))
+
+        return analysis_results
+
+    def _analyze_batch_stream_thread(self, patient_data, image_paths):
+        try:
+            for line in self.api_client.analyze_batch_stream(
+                image_paths,
+                patient_data['name'],
+                patient_data['height_cm'],
+                self.confidence_threshold
+            ):
+                if line.get('type') == 'result':
+                    analysis_results = self._build_analysis_results(image_paths[line['index']], line['data'])
+                    self.parent.after(0, lambda r=analysis_results: self._batch_stream_progress(r))
+                elif line.get('type') == 'error':
+                    print(f"Error analyzing {line.get('filename')}: {line.get('error')}")
+                    self.parent.after(0, lambda: self._batch_stream_progress(None))
+
+            self.parent.after(0, self._batch_stream_complete)
+
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            self.parent.after(0, lambda err=str(e): self._analysis_error(err))
+
+    def _batch_stream_progress(self, analysis_results):
+        self.current_batch_index += 1
+        if analysis_results is not None:
+            self.batch_results_list.append(analysis_results)
+            self.current_keypoints = analysis_results.get('keypoints')
+            self.image_path = analysis_results['image_path']
+            self._display_preview(self.image_path)
+        self.status_label.config(text=f"🔄 Streaming results {self.current_batch_index}/{len(self.batch_images)}...")
+
+    def _batch_stream_complete(self):
+        self.analyzing = False
+        self.analyze_button.config(state=tk.NORMAL, text="🔍 ANALYZE POSTURE")
+        if not self.batch_results_list:
+            self._analysis_error("No image in the batch could be analyzed")
+            return
+
+        self.status_label.config(text=f"✅ Batch Complete: {len(self.batch_results_list)}/{len(self.batch_images)} images processed!")
+        messagebox.showinfo("Batch Complete", f"✅ {len(self.batch_results_list)} of {len(self.batch_images)} images analyzed!")
+        self.app.show_results_screen(self.batch_results_list)
+
     def _determine_view_type(self, detections):
         """Determine view type based on detected class names"""
         if not detections or 'all_detections' not in detections:
@@ -10,7 +10,8 @@ class ApiClient:
 
     def health_check(self) -> bool:
         try:
-            response = requests.get(f"{self.base_url}/health", timeout=5)
+            # /ready answers from the server's cached status and is 503 until the model is warm
+            response = requests.get(f"{self.base_url}/ready", timeout=2)
             return response.status_code == 200
         except:
             return False
@@ -53,6 +54,102 @@ class ApiClient:
                 files['image'][1].close()
             raise e
 
+    def analyze_batch_stream(self, image_paths, patient_name: str, height_cm: float, confidence_threshold: float = 0.25):
+        """Analyze several images in one request, yielding each NDJSON line as a dict as soon as it arrives.
+
+        Lines have `type` 'result' (with `index` into `image_paths` and `data`), 'error', and a final 'summary'.
+        """
+        url = f"{self.base_url}/api/analysis/batch-analyze/stream"
+        files = [
+            ('images', (os.path.basename(path), open(path, 'rb'), 'image/jpeg'))
+            for path in image_paths
+        ]
+        data = {
+            'patient_name': patient_name,
+            'height_cm': height_cm,
+            'confidence_threshold': confidence_threshold
+        }
+
+        try:
+            with requests.post(url, files=files, data=data, stream=True) as response:
+                if response.status_code != 200:
+                    raise Exception(f"API Error ({response.status_code}): {response.text}")
+                for line in response.iter_lines():
+                    if line:
+                        yield json.loads(line)
+        finally:
+            for _, (_, f, _) in files:
+                f.close()
+
+    def submit_batch_job(self, image_paths, patient_name: str, height_cm: float, confidence_threshold: float = 0.25):
+        """Upload several images as one background job; returns the job status dict (with `job_id`)."""
+        url = f"{self.base_url}/api/analysis/jobs"
+        files = [
+            ('images', (os.path.basename(path), open(path, 'rb'), 'image/jpeg'))
+            for path in image_paths
+        ]
+        data = {
+            'patient_name': patient_name,
+            'height_cm': height_cm,
+            'confidence_threshold': confidence_threshold
+        }
+
+        try:
+            response = requests.post(url, files=files, data=data)
+            if response.status_code == 202:
+                return response.json()
+            raise Exception(f"API Error ({response.status_code}): {response.text}")
+        finally:
+            for _, (_, f, _) in files:
+                f.close()
+
+    def analyze_session(self, view_paths, patient_name: str, height_cm: float, confidence_threshold: float = 0.25):
+        """Analyze the views of one assessment in one request.
+
+        `view_paths` maps 'front', 'back', 'left' and/or 'right' to image paths. Returns the
+        session dict: `session_id`, combined `summary` and one analysis per view under `views`.
+        """
+        url = f"{self.base_url}/api/analysis/sessions"
+        files = {
+            view: (os.path.basename(path), open(path, 'rb'), 'image/jpeg')
+            for view, path in view_paths.items()
+        }
+        data = {
+            'patient_name': patient_name,
+            'height_cm': height_cm,
+            'confidence_threshold': confidence_threshold
+        }
+
+        try:
+            response = requests.post(url, files=files, data=data)
+            if response.status_code == 200:
+                return response.json()
+            raise Exception(f"API Error ({response.status_code}): {response.text}")
+        finally:
+            for _, f, _ in files.values():
+                f.close()
+
+    def get_batch_job_results(self, job_id: str, after: int = -1, wait: float = 10):
+        """Results recorded after position `after`; waits up to `wait` seconds for new ones.
+
+        Pass the returned `next_after` on the next call until `job['status']` is 'completed' or 'failed'.
+        """
+        url = f"{self.base_url}/api/analysis/jobs/{job_id}/results"
+        response = requests.get(url, params={'after': after, 'wait': wait}, timeout=wait + 10)
+        if response.status_code == 200:
+            return response.json()
+        raise Exception(f"API Error ({response.status_code}): {response.text}")
+
+    def get_artifact(self, url: str):
+        """Download a rendered artifact (e.g. `skeleton_image_url` from an analysis) as raw bytes."""
+        try:
+            response = requests.get(f"{self.base_url}{url}", timeout=10)
+            if response.status_code == 200:
+                return response.content
+            return None
+        except:
+            return None
+
     def get_patients(self):
         try:
             response = requests.get(f"{self.base_url}/api/patients/")
@@ -0,0 +1,99 @@
+"""
+Benchmark: per-image inference loop vs. batched inference.
+
+Runs the same folder of images through PostureAnalyzerService twice:
+  1. the legacy path (one forward pass per image, as /batch-analyze used to do)
+  2. the batched path (`analyze_images`, chunks of --batch-size)
+
+Usage:
+    python scripts/bench_batch_inference.py path/to/images --batch-size 8 --repeat 3
+"""
+import argparse
+import glob
+import os
+import statistics
+import sys
+import time
+
+import cv2
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from api.services.analyzer import PostureAnalyzerService
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+
+def load_images(folder, limit=None):
+    paths = sorted(
+        p for p in glob.glob(os.path.join(folder, '*'))
+        if p.lower().endswith(IMAGE_EXTENSIONS)
+    )
+    if limit:
+        paths = paths[:limit]
+
+    images = []
+    for path in paths:
+        img = cv2.imread(path)
+        if img is not None:
+            images.append(img)
+    return images
+
+
+def run_per_image(service, images, conf):
+    for img in images:
+        # Same predict path (and INFERENCE_IMGSZ) as the batched run, one image per forward pass
+        results = service.predict_batch([img], service.inference_conf(conf), batch_size=1)
+        service.analyze_result(img, results, "benchmark", 170, conf)
+
+
+def run_batched(service, images, conf, batch_size):
+    service.analyze_images(images, "benchmark", 170, conf, batch_size=batch_size)
+
+
+def time_runs(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-image and batched YOLO inference")
+    parser.add_argument("folder", help="Folder containing test images")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--conf", type=float, default=0.25)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--limit", type=int, default=None, help="Use only the first N images")
+    args = parser.parse_args()
+
+    images = load_images(args.folder, args.limit)
+    if not images:
+        print(f"No images found in {args.folder}")
+        sys.exit(1)
+
+    service = PostureAnalyzerService()
+    if not service.is_model_loaded():
+        print("Model not loaded, check MODEL_PATH")
+        sys.exit(1)
+
+    # Warm-up so the first timed run does not pay for lazy initialisation
+    run_per_image(service, images[:1], args.conf)
+
+    per_image = time_runs(lambda: run_per_image(service, images, args.conf), args.repeat)
+    batched = time_runs(lambda: run_batched(service, images, args.conf, args.batch_size), args.repeat)
+
+    n = len(images)
+    per_image_med = statistics.median(per_image)
+    batched_med = statistics.median(batched)
+
+    print(f"Images: {n} | batch size: {args.batch_size} | repeats: {args.repeat}")
+    print(f"{'Mode':<12}{'median s':>12}{'ms/image':>12}{'images/s':>12}")
+    for name, med in (("per-image", per_image_med), ("batched", batched_med)):
+        print(f"{name:<12}{med:>12.3f}{med / n * 1000:>12.1f}{n / med:>12.1f}")
+    print(f"Speedup: {per_image_med / batched_med:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+"""
+Micro-benchmark: AdvancedPoseAnalyzer geometry and scoring, without the model.
+
+Builds thousands of synthetic frontal and lateral detections (seeded, so runs are
+comparable) and times every analyzer stage the API runs per image:
+view detection, keypoint extraction, lateral point extraction, each `analyze_*`
+method, the overall score, and the whole geometry pass, both on a fresh
+AdvancedPoseAnalyzer per image and on one shared stateless analyzer
+(`analyze_keypoints`, as PostureAnalyzerService does).
+
+Reports per-call latency (p50 / p99) and throughput per stage. With --baseline,
+compares p50 (the best per-pass median) against a previous --save run and exits
+with status 1 when a stage is slower by more than --max-regression and by more
+than --min-delta-us. Stages timed on fewer than --min-samples calls are only
+reported, and a suspect stage is measured again before it can fail the run.
+Baselines are only comparable on the same machine; run on an otherwise idle box.
+
+Usage:
+    python scripts/bench_pose_analyzer.py --count 2000
+    python scripts/bench_pose_analyzer.py --save bench_pose_baseline.json
+    python scripts/bench_pose_analyzer.py --baseline bench_pose_baseline.json --max-regression 0.2
+"""
+import argparse
+import contextlib
+import gc
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from core import AdvancedPoseAnalyzer
+from core.synthetic import reference_geometry, synthetic_result
+
+
+def geometry(analyzer, keypoints, image_h, image_w, height_cm=170):
+    """Everything analyze_keypoints computes, one stage call at a time on `analyzer`."""
+    analysis = reference_geometry(analyzer, keypoints, image_h, image_w, height_cm)
+    analysis['postural_angles'] = analyzer.analyze_postural_angles(keypoints)
+    return analysis
+
+
+def build_inputs(count, seed):
+    """Frontal and lateral inputs, each with a prepared analyzer, keypoints and analysis."""
+    rng = np.random.default_rng(seed)
+    inputs = {'frontal': [], 'lateral': []}
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for view in inputs:
+            for _ in range(count):
+                raw = synthetic_result(rng, lateral=(view == 'lateral'))
+                analyzer = AdvancedPoseAnalyzer()
+                if view == 'lateral':
+                    keypoints = {}
+                    analyzer._add_lateral_points([raw], keypoints)
+                else:
+                    keypoints = analyzer.extract_keypoints_from_results([raw])
+                image_h, image_w = raw.orig_shape
+                analysis = geometry(analyzer, keypoints, image_h, image_w)
+                inputs[view].append({
+                    'results': [raw], 'analyzer': analyzer, 'keypoints': keypoints,
+                    'image_h': image_h, 'image_w': image_w, 'analysis': analysis
+                })
+    return inputs
+
+
+def cases():
+    """(stage, view, fn) triples; `fn(item)` runs one call on a prepared input."""
+    def each_view(stage, fn, views=('frontal', 'lateral')):
+        return [(stage, view, fn) for view in views]
+
+    def fresh_pipeline(item):
+        analyzer = AdvancedPoseAnalyzer()
+        analyzer.debug_mode = item['analyzer'].debug_mode
+        keypoints = analyzer.extract_keypoints_from_results(item['results'])
+        geometry(analyzer, keypoints, item['image_h'], item['image_w'])
+
+    shared = AdvancedPoseAnalyzer()
+
+    def shared_pipeline(item):
+        shared.debug_mode = item['analyzer'].debug_mode
+        keypoints = shared.extract_keypoints_from_results(item['results'])
+        shared.analyze_keypoints(keypoints, item['image_h'], item['image_w'], 170)
+
+    plumb = lambda item: item['analysis']['posture_center_x']
+    return (
+        each_view('AdvancedPoseAnalyzer()', lambda item: AdvancedPoseAnalyzer(), ('frontal',))
+        + each_view('_detect_view_type', lambda item: item['analyzer']._detect_view_type(item['results']))
+        + each_view('extract_keypoints_from_results',
+                    lambda item: item['analyzer'].extract_keypoints_from_results(item['results']))
+        + each_view('_add_lateral_points',
+                    lambda item: item['analyzer']._add_lateral_points(item['results'], {}), ('lateral',))
+        + each_view('analyze_shoulder_imbalance_advanced',
+                    lambda item: item['analyzer'].analyze_shoulder_imbalance_advanced(item['keypoints'], plumb(item)))
+        + each_view('analyze_hip_imbalance_advanced',
+                    lambda item: item['analyzer'].analyze_hip_imbalance_advanced(item['keypoints'], plumb(item)))
+        + each_view('analyze_spinal_alignment_advanced',
+                    lambda item: item['analyzer'].analyze_spinal_alignment_advanced(item['keypoints']))
+        + each_view('analyze_head_alignment_advanced',
+                    lambda item: item['analyzer'].analyze_head_alignment_advanced(item['keypoints']))
+        + each_view('analyze_leg_alignment_anterior',
+                    lambda item: item['analyzer'].analyze_leg_alignment_anterior(item['keypoints']))
+        + each_view('analyze_leg_alignment_lateral',
+                    lambda item: item['analyzer'].analyze_leg_alignment_lateral(item['keypoints']))
+        + each_view('analyze_lateral_distances',
+                    lambda item: item['analyzer'].analyze_lateral_distances(item['keypoints']))
+        + each_view('analyze_postural_angles',
+                    lambda item: item['analyzer'].analyze_postural_angles(item['keypoints']))
+        + each_view('calculate_overall_posture_score',
+                    lambda item: item['analyzer'].calculate_overall_posture_score(item['analysis']))
+        + each_view('full geometry (fresh analyzer)', fresh_pipeline)
+        + each_view('full geometry (shared analyzer)', shared_pipeline)
+    )
+
+
+def run_case(fn, items, repeat):
+    """Per-call latencies (us) over `repeat` passes over `items`.
+
+    p50 is the best pass's median (the least disturbed by other load on the
+    machine, which is what baseline comparisons need); p99 spans all passes.
+    """
+    latencies, pass_medians, best_total = [], [], None
+    for _ in range(repeat):
+        pass_latencies = []
+        gc.disable()  # like timeit: keep collector pauses out of the numbers
+        try:
+            total_start = time.perf_counter()
+            for item in items:
+                start = time.perf_counter_ns()
+                fn(item)
+                pass_latencies.append((time.perf_counter_ns() - start) / 1000)
+            total = time.perf_counter() - total_start
+        finally:
+            gc.enable()
+        best_total = total if best_total is None else min(best_total, total)
+        pass_medians.append(float(np.median(pass_latencies)))
+        latencies.extend(pass_latencies)
+
+    arr = np.asarray(latencies)
+    return {
+        'calls': len(items),
+        'samples': len(latencies),
+        'p50_us': round(min(pass_medians), 2),
+        'p99_us': round(float(np.percentile(arr, 99)), 2),
+        'mean_us': round(float(arr.mean()), 2),
+        'calls_per_s': round(len(items) / best_total, 1)
+    }
+
+
+def compare(report, baseline, max_regression, min_delta_us, min_samples, remeasure=None, confirm_runs=3):
+    """
+    Return the (key, ratio) pairs of stages slower than the baseline by more than
+    `max_regression` and by more than `min_delta_us` microseconds.
+
+    Only stages timed on at least `min_samples` calls on both sides can fail. A
+    stage over both thresholds is measured again with `remeasure(key)`, up to
+    `confirm_runs` times, and fails only if its best p50 stays over them.
+    """
+    regressions = []
+    print(f"\nAgainst baseline (fail above +{max_regression:.0%} and +{min_delta_us:.0f} us, "
+          f"min {min_samples} samples):")
+    for key, stats in report['results'].items():
+        before = baseline.get('results', {}).get(key)
+        if not before or not before['p50_us']:
+            continue
+        p50 = stats['p50_us']
+        before_samples = before.get('samples', before['calls'] * baseline.get('repeat', 1))
+
+        def over(value):
+            return value / before['p50_us'] > 1 + max_regression and value - before['p50_us'] > min_delta_us
+
+        flag = ''
+        if over(p50):
+            if min(stats['samples'], before_samples) < min_samples:
+                flag = '  (slower, too few samples to fail)'
+            else:
+                for _ in range(confirm_runs if remeasure is not None else 0):
+                    p50 = min(p50, remeasure(key))
+                    if not over(p50):
+                        break
+                if over(p50):
+                    regressions.append((key, p50 / before['p50_us']))
+                    flag = '  REGRESSION'
+                else:
+                    flag = '  (noise, not confirmed)'
+        ratio = p50 / before['p50_us']
+        print(f"  {key:<52}{before['p50_us']:>10.1f} -> {p50:>8.1f} us  ({ratio - 1:+.0%}){flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark AdvancedPoseAnalyzer geometry and scoring")
+    parser.add_argument("--count", type=int, default=2000, help="Synthetic inputs per view (frontal, lateral)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", default=None, help="Run only stages whose name contains this text")
+    parser.add_argument("--with-debug", action="store_true",
+                        help="Print the analyzer's trace (debug_mode, sent to /dev/null)")
+    parser.add_argument("--save", default=None, help="Write results to this JSON file (use as a baseline)")
+    parser.add_argument("--baseline", default=None, help="Compare against a JSON file written by --save")
+    parser.add_argument("--max-regression", type=float, default=0.25,
+                        help="Allowed p50 slowdown vs. baseline before failing (0.25 = 25%%)")
+    parser.add_argument("--min-delta-us", type=float, default=25.0,
+                        help="A stage must also be this many microseconds slower to fail (noise floor)")
+    parser.add_argument("--min-samples", type=int, default=5000,
+                        help="Timed calls (count x repeat) a stage needs on both sides before it can fail")
+    parser.add_argument("--confirm-runs", type=int, default=3,
+                        help="Re-measurements of a suspect stage before it is reported as a regression")
+    args = parser.parse_args()
+
+    inputs = build_inputs(args.count, args.seed)
+    for items in inputs.values():
+        for item in items:
+            item['analyzer'].debug_mode = args.with_debug
+
+    report = {
+        'count': args.count, 'repeat': args.repeat, 'seed': args.seed,
+        'debug': args.with_debug, 'results': {}
+    }
+    print(f"Inputs: {args.count} frontal + {args.count} lateral | repeats: {args.repeat} | "
+          f"debug prints: {'on' if args.with_debug else 'off'}")
+    print(f"{'Stage':<44}{'view':<9}{'p50 us':>10}{'p99 us':>10}{'calls/s':>12}")
+
+    runs = {}
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for stage, view, fn in cases():
+            if args.only and args.only not in stage:
+                continue
+            key = f"{stage} [{view}]"
+            runs[key] = (fn, inputs[view])
+            stats = run_case(fn, inputs[view], args.repeat)
+            report['results'][key] = stats
+            print(f"{stage:<44}{view:<9}{stats['p50_us']:>10.1f}{stats['p99_us']:>10.1f}"
+                  f"{stats['calls_per_s']:>12.0f}", file=sys.__stdout__)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nSaved to {args.save}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        def remeasure(key):
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                return run_case(*runs[key], args.repeat * 2)['p50_us']
+
+        regressions = compare(report, baseline, args.max_regression, args.min_delta_us, args.min_samples, remeasure,
+                              args.confirm_runs)
+        if regressions:
+            print(f"\n{len(regressions)} stage(s) regressed beyond {args.max_regression:.0%}")
+            sys.exit(1)
+        print("\nNo regressions")
+
+
+if __name__ == "__main__":
+    main()
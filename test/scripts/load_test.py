@@ -0,0 +1,347 @@
+"""
+HTTP load test for a running API server.
+
+Starts --concurrency worker threads that each send requests back-to-back for
+--duration seconds (or until --requests have been sent). Every request is
+picked at random from a weighted mix of:
+  analyze           POST /api/analysis/analyze           (one image)
+  batch             POST /api/analysis/batch-analyze     (--batch-size images)
+  login             POST /auth/login
+  patients          GET  /api/patients/
+  patient_analyses  GET  /api/patients/{id}/analyses
+
+Reports throughput, p50/p95/p99 latency and error rate per operation and
+overall, and can write them as JSON (--json) to compare releases with --baseline.
+
+The server is used as-is. To measure everything but the model, start it with
+INFERENCE_BACKEND=stub (and STUB_LATENCY_MS to simulate inference time).
+Repeated images are served from the inference cache; start the server with
+INFERENCE_CACHE_MEMORY_MB=0 and INFERENCE_CACHE_DISK_MB=0 to measure cold
+inference, or pass a --images folder with enough distinct photos.
+
+Usage:
+    python scripts/load_test.py --concurrency 8 --duration 30
+    python scripts/load_test.py --mix analyze=1 --requests 500 --json release-1.4.json
+    python scripts/load_test.py --images path/to/photos --baseline release-1.3.json --max-regression 0.2
+"""
+import argparse
+import glob
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+
+import cv2
+import numpy as np
+import requests
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+DEFAULT_MIX = "analyze=6,batch=1,login=1,patients=1,patient_analyses=1"
+PASSWORD = "loadtest-password"
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"Unknown operation '{name}'. Available: {', '.join(OPERATIONS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def load_images(folder, limit, pool_size, seed):
+    """JPEG/PNG bytes from `folder`, or `pool_size` synthetic photos (distinct, so not cache hits of each other)."""
+    if folder:
+        paths = sorted(p for p in glob.glob(os.path.join(folder, '*')) if p.lower().endswith(IMAGE_EXTENSIONS))
+        images = []
+        for path in paths[:limit] if limit else paths:
+            with open(path, 'rb') as f:
+                images.append((os.path.basename(path), f.read()))
+        return images
+
+    rng = np.random.default_rng(seed)
+    images = []
+    for i in range(pool_size):
+        base = np.linspace(40, 220, 960, dtype=np.float32)[:, None, None]
+        img = np.clip(base + rng.normal(0, 25, (960, 1280, 3)), 0, 255).astype(np.uint8)
+        ok, buf = cv2.imencode('.jpg', img, [cv2.IMWRITE_JPEG_QUALITY, 90])
+        images.append((f"synthetic_{i:03d}.jpg", buf.tobytes()))
+    return images
+
+
+# --- Operations ------------------------------------------------------------------
+# Each takes (session, context, rng) and returns the response.
+
+def op_analyze(session, ctx, rng):
+    name, data = rng.choice(ctx['images'])
+    return session.post(f"{ctx['url']}/api/analysis/analyze",
+                        files={'image': (name, data, 'image/jpeg')},
+                        data={'patient_name': ctx['patient_name'], 'height_cm': ctx['height_cm']},
+                        timeout=ctx['timeout'])
+
+
+def op_batch(session, ctx, rng):
+    chosen = [rng.choice(ctx['images']) for _ in range(ctx['batch_size'])]
+    return session.post(f"{ctx['url']}/api/analysis/batch-analyze",
+                        files=[('images', (name, data, 'image/jpeg')) for name, data in chosen],
+                        data={'patient_name': ctx['patient_name'], 'height_cm': ctx['height_cm']},
+                        timeout=ctx['timeout'])
+
+
+def op_login(session, ctx, rng):
+    return session.post(f"{ctx['url']}/auth/login",
+                        json={'username': ctx['patient_name'], 'password': PASSWORD},
+                        timeout=ctx['timeout'])
+
+
+def op_patients(session, ctx, rng):
+    return session.get(f"{ctx['url']}/api/patients/", params={'limit': 50}, timeout=ctx['timeout'])
+
+
+def op_patient_analyses(session, ctx, rng):
+    return session.get(f"{ctx['url']}/api/patients/{ctx['patient_id']}/analyses",
+                       params={'limit': 50}, timeout=ctx['timeout'])
+
+
+OPERATIONS = {
+    'analyze': op_analyze,
+    'batch': op_batch,
+    'login': op_login,
+    'patients': op_patients,
+    'patient_analyses': op_patient_analyses,
+}
+
+
+# --- Setup -----------------------------------------------------------------------
+
+def wait_until_ready(url, timeout):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if requests.get(f"{url}/ready", timeout=2).status_code == 200:
+                return True
+        except requests.RequestException:
+            pass
+        time.sleep(1)
+    return False
+
+
+def ensure_patient(url, name, height_cm):
+    """Create the load-test patient (with a password, for /auth/login) and return its id."""
+    response = requests.post(f"{url}/api/patients/",
+                             json={'name': name, 'height_cm': height_cm, 'password': PASSWORD}, timeout=10)
+    if response.status_code == 200:
+        return response.json()['id']
+
+    for patient in requests.get(f"{url}/api/patients/", params={'limit': 1000}, timeout=10).json():
+        if patient['name'] == name:
+            return patient['id']
+    raise RuntimeError(f"Cannot create or find patient '{name}': {response.status_code} {response.text}")
+
+
+# --- Run -------------------------------------------------------------------------
+
+def worker(index, ctx, mix, deadline, budget, records, lock, seed):
+    rng = random.Random(seed + index)
+    names, weights = list(mix), list(mix.values())
+    session = requests.Session()
+
+    while time.perf_counter() < deadline:
+        with lock:
+            if budget['remaining'] <= 0:
+                break
+            budget['remaining'] -= 1
+
+        op = rng.choices(names, weights)[0]
+        started = time.perf_counter()
+        try:
+            response = OPERATIONS[op](session, ctx, rng)
+            status = response.status_code
+            error = None if status < 400 else f"HTTP {status}"
+        except requests.RequestException as e:
+            status, error = None, type(e).__name__
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        with lock:
+            records.append((op, started, elapsed_ms, status, error))
+
+
+def summarize(latencies_ms, errors, wall_seconds, statuses):
+    arr = np.asarray(latencies_ms) if latencies_ms else np.zeros(1)
+    count = len(latencies_ms)
+    return {
+        'requests': count,
+        'errors': errors,
+        'error_rate': round(errors / count, 4) if count else 0,
+        'throughput_rps': round(count / wall_seconds, 2) if wall_seconds else 0,
+        'p50_ms': round(float(np.percentile(arr, 50)), 2),
+        'p95_ms': round(float(np.percentile(arr, 95)), 2),
+        'p99_ms': round(float(np.percentile(arr, 99)), 2),
+        'mean_ms': round(float(arr.mean()), 2),
+        'max_ms': round(float(arr.max()), 2),
+        'status_codes': {str(k): v for k, v in sorted(statuses.items(), key=lambda kv: str(kv[0]))}
+    }
+
+
+def build_report(records, wall_seconds, warmup_until):
+    """Per-operation and overall stats; requests started during warm-up are left out."""
+    by_op = defaultdict(lambda: {'latencies': [], 'errors': 0, 'statuses': Counter(), 'samples': Counter()})
+    overall = {'latencies': [], 'errors': 0, 'statuses': Counter()}
+
+    for op, started, elapsed_ms, status, error in records:
+        if started < warmup_until:
+            continue
+        for bucket in (by_op[op], overall):
+            bucket['latencies'].append(elapsed_ms)
+            bucket['statuses'][status if status is not None else 'exception'] += 1
+            if error:
+                bucket['errors'] += 1
+        if error:
+            by_op[op]['samples'][error] += 1
+
+    operations = {}
+    for op, bucket in sorted(by_op.items()):
+        operations[op] = summarize(bucket['latencies'], bucket['errors'], wall_seconds, bucket['statuses'])
+        if bucket['samples']:
+            operations[op]['error_kinds'] = dict(bucket['samples'])
+    return operations, summarize(overall['latencies'], overall['errors'], wall_seconds, overall['statuses'])
+
+
+def print_report(operations, overall):
+    print(f"\n{'Operation':<18}{'requests':>9}{'err %':>8}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for name, stats in list(operations.items()) + [('TOTAL', overall)]:
+        print(f"{name:<18}{stats['requests']:>9}{stats['error_rate'] * 100:>8.1f}{stats['throughput_rps']:>9.1f}"
+              f"{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}{stats['p99_ms']:>9.1f}")
+    for name, stats in operations.items():
+        if stats.get('error_kinds'):
+            print(f"  {name} errors: {stats['error_kinds']}")
+
+
+def compare(report, baseline, max_regression):
+    """Print p95/throughput deltas per operation; return operations whose p95 regressed too far."""
+    regressions = []
+    print(f"\nAgainst baseline '{baseline.get('label')}' (fail above +{max_regression:.0%} p95):")
+    current = dict(report['operations'], TOTAL=report['overall'])
+    previous = dict(baseline.get('operations', {}), TOTAL=baseline.get('overall', {}))
+    for name, stats in current.items():
+        before = previous.get(name)
+        if not before or not before.get('p95_ms'):
+            continue
+        ratio = stats['p95_ms'] / before['p95_ms']
+        flag = ''
+        if ratio > 1 + max_regression:
+            regressions.append(name)
+            flag = '  REGRESSION'
+        print(f"  {name:<18} p95 {before['p95_ms']:>8.1f} -> {stats['p95_ms']:>8.1f} ms ({ratio - 1:+.0%})"
+              f"   req/s {before['throughput_rps']:>7.1f} -> {stats['throughput_rps']:>7.1f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the posture analysis API")
+    parser.add_argument("--url", default=os.getenv("API_BASE_URL", "http://127.0.0.1:8000"))
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to run (after warm-up)")
+    parser.add_argument("--requests", type=int, default=None, help="Stop after this many requests")
+    parser.add_argument("--warmup", type=float, default=3, help="Seconds of traffic excluded from the stats")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f"Weighted operations (default: {DEFAULT_MIX})")
+    parser.add_argument("--images", default=None, help="Folder of photos to upload (default: synthetic)")
+    parser.add_argument("--limit", type=int, default=None, help="Use only the first N photos from --images")
+    parser.add_argument("--image-pool", type=int, default=16, help="Number of synthetic photos")
+    parser.add_argument("--batch-size", type=int, default=4, help="Images per batch-analyze request")
+    parser.add_argument("--patient", default="loadtest", help="Patient the analyses are stored under")
+    parser.add_argument("--height-cm", type=float, default=170)
+    parser.add_argument("--timeout", type=float, default=120, help="Per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--label", default=None, help="Release/build label stored in the JSON output")
+    parser.add_argument("--json", default=None, help="Write results to this file")
+    parser.add_argument("--baseline", default=None, help="Compare against a JSON file from an earlier run")
+    parser.add_argument("--max-regression", type=float, default=0.25,
+                        help="Allowed p95 slowdown vs. baseline before failing (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    url = args.url.rstrip('/')
+    print(f"Waiting for {url}/ready ...")
+    if not wait_until_ready(url, 120):
+        print("Server is not ready (is it running and is the model loaded?)")
+        sys.exit(1)
+
+    images = load_images(args.images, args.limit, args.image_pool, args.seed)
+    if not images and ({'analyze', 'batch'} & set(args.mix)):
+        print(f"No images found in {args.images}")
+        sys.exit(1)
+
+    ctx = {
+        'url': url,
+        'images': images,
+        'batch_size': args.batch_size,
+        'patient_name': args.patient,
+        'height_cm': args.height_cm,
+        'patient_id': ensure_patient(url, args.patient, args.height_cm),
+        'timeout': args.timeout,
+    }
+    health = requests.get(f"{url}/health", timeout=10).json()
+
+    records, lock = [], threading.Lock()
+    budget = {'remaining': args.requests if args.requests else float('inf')}
+    if args.requests:
+        # A request budget is measured in full; no warm-up cut
+        args.warmup = 0
+    started = time.perf_counter()
+    warmup_until = started + args.warmup
+    deadline = warmup_until + args.duration if not args.requests else float('inf')
+
+    print(f"Running {args.concurrency} workers, mix {args.mix}, "
+          f"{f'{args.requests} requests' if args.requests else f'{args.warmup:g}s warm-up + {args.duration:g}s'}, "
+          f"{len(images)} images")
+    threads = [
+        threading.Thread(target=worker, args=(i, ctx, args.mix, deadline, budget, records, lock, args.seed))
+        for i in range(args.concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall_seconds = time.perf_counter() - max(warmup_until, started)
+
+    operations, overall = build_report(records, wall_seconds, warmup_until)
+    print_report(operations, overall)
+
+    report = {
+        'label': args.label,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'url': url,
+        'server': {'model_state': health.get('model_state'), 'model_load_seconds': health.get('model_load_seconds')},
+        'config': {
+            'concurrency': args.concurrency, 'duration': args.duration, 'requests': args.requests,
+            'warmup': args.warmup, 'mix': args.mix, 'images': len(images),
+            'image_source': args.images or 'synthetic', 'batch_size': args.batch_size, 'seed': args.seed
+        },
+        'wall_seconds': round(wall_seconds, 3),
+        'operations': operations,
+        'overall': overall
+    }
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nSaved to {args.json}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.max_regression)
+        if regressions:
+            print(f"\np95 regressed beyond {args.max_regression:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+        print("\nNo regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Latency / accuracy regression report: full-precision vs. INT8 pose model.
+
+For every image in the folder both models are run and compared on:
+  - per-keypoint pixel error (raw model keypoints, by model index)
+  - change in posture_score.total_score after the full AdvancedPoseAnalyzer pipeline
+  - top detection class agreement
+  - inference latency percentiles (p50 / p90 / p99)
+
+Usage:
+    python scripts/quantization_report.py path/to/validation_images
+    python scripts/quantization_report.py imgs --reference onnx --candidate onnx-int8 --json report.json
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from api.services.backends import create_backend
+from core import AdvancedPoseAnalyzer
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+
+def percentiles(values_ms):
+    if not values_ms:
+        return {}
+    arr = np.asarray(values_ms)
+    return {
+        'p50_ms': round(float(np.percentile(arr, 50)), 2),
+        'p90_ms': round(float(np.percentile(arr, 90)), 2),
+        'p99_ms': round(float(np.percentile(arr, 99)), 2),
+        'mean_ms': round(float(arr.mean()), 2)
+    }
+
+
+def timed_predict(model, img, conf):
+    start = time.perf_counter()
+    results = model(img, conf=conf, verbose=False, device='cpu')
+    return results, (time.perf_counter() - start) * 1000
+
+
+def raw_keypoints(results):
+    for result in results:
+        if result.keypoints is not None and len(result.keypoints.xy) > 0:
+            return result.keypoints.xy[0].cpu().numpy()
+    return None
+
+
+def top_class(results):
+    for result in results:
+        if result.boxes is not None and len(result.boxes) > 0:
+            return result.names.get(int(result.boxes.cls[0].item()))
+    return None
+
+
+def posture_score(analyzer, img, results, height_cm):
+    """posture_score.total_score as PostureAnalyzerService.analyze_result computes it (geometry only)."""
+    keypoints = analyzer.extract_keypoints_from_results(results)
+    image_h, image_w = img.shape[:2]
+    return analyzer.analyze_keypoints(keypoints, image_h, image_w, height_cm)['posture_score']['total_score']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare full-precision and INT8 pose models")
+    parser.add_argument("folder", help="Folder of validation images")
+    parser.add_argument("--model", default=os.getenv("MODEL_PATH", "models/best.pt"))
+    parser.add_argument("--reference", default="torch", help="Reference backend (default: torch)")
+    parser.add_argument("--candidate", default="onnx-int8", help="Candidate backend (default: onnx-int8)")
+    parser.add_argument("--conf", type=float, default=0.25)
+    parser.add_argument("--height-cm", type=float, default=170)
+    parser.add_argument("--json", dest="json_path", default=None, help="Also write the report as JSON")
+    args = parser.parse_args()
+
+    paths = sorted(
+        p for p in glob.glob(os.path.join(args.folder, '**', '*'), recursive=True)
+        if p.lower().endswith(IMAGE_EXTENSIONS)
+    )
+    if not paths:
+        print(f"No images found in {args.folder}")
+        sys.exit(1)
+
+    reference = create_backend(args.reference, args.model).load()
+    candidate = create_backend(args.candidate, args.model).load()
+    analyzer = AdvancedPoseAnalyzer()
+
+    # Warm-up both runtimes on the first image
+    first = cv2.imread(paths[0])
+    timed_predict(reference, first, args.conf)
+    timed_predict(candidate, first, args.conf)
+
+    ref_latency, cand_latency = [], []
+    kp_errors = {}
+    score_deltas = []
+    class_matches = 0
+    compared = 0
+
+    for path in paths:
+        img = cv2.imread(path)
+        if img is None:
+            continue
+
+        ref_results, ref_ms = timed_predict(reference, img, args.conf)
+        cand_results, cand_ms = timed_predict(candidate, img, args.conf)
+        ref_latency.append(ref_ms)
+        cand_latency.append(cand_ms)
+
+        ref_kp = raw_keypoints(ref_results)
+        cand_kp = raw_keypoints(cand_results)
+        if ref_kp is None or cand_kp is None:
+            print(f"[SKIP] {os.path.basename(path)}: no person detected by one of the models")
+            continue
+
+        compared += 1
+        for idx in range(min(len(ref_kp), len(cand_kp))):
+            kp_errors.setdefault(idx, []).append(float(np.linalg.norm(ref_kp[idx] - cand_kp[idx])))
+
+        if top_class(ref_results) == top_class(cand_results):
+            class_matches += 1
+
+        ref_score = posture_score(analyzer, img, ref_results, args.height_cm)
+        cand_score = posture_score(analyzer, img, cand_results, args.height_cm)
+        score_deltas.append(cand_score - ref_score)
+
+    report = {
+        'reference': args.reference,
+        'candidate': args.candidate,
+        'images': len(ref_latency),
+        'compared': compared,
+        'latency': {
+            args.reference: percentiles(ref_latency),
+            args.candidate: percentiles(cand_latency)
+        },
+        'keypoint_error_px': {
+            str(idx): {
+                'mean': round(float(np.mean(errs)), 2),
+                'p95': round(float(np.percentile(errs, 95)), 2),
+                'max': round(float(np.max(errs)), 2)
+            }
+            for idx, errs in sorted(kp_errors.items())
+        },
+        'posture_score_delta': {
+            'mean_abs': round(float(np.mean(np.abs(score_deltas))), 2) if score_deltas else 0,
+            'max_abs': round(float(np.max(np.abs(score_deltas))), 2) if score_deltas else 0
+        },
+        'top_class_agreement': round(class_matches / compared, 3) if compared else 0
+    }
+
+    print(f"\n=== {args.reference} vs {args.candidate} on {report['images']} images ({compared} compared) ===")
+    print(f"\nLatency (ms)       {'p50':>8}{'p90':>8}{'p99':>8}{'mean':>8}")
+    for name, stats in report['latency'].items():
+        print(f"{name:<18} {stats['p50_ms']:>8}{stats['p90_ms']:>8}{stats['p99_ms']:>8}{stats['mean_ms']:>8}")
+    ref_p50 = report['latency'][args.reference].get('p50_ms')
+    cand_p50 = report['latency'][args.candidate].get('p50_ms')
+    if ref_p50 and cand_p50:
+        print(f"Speedup (p50): {ref_p50 / cand_p50:.2f}x")
+
+    print(f"\nKeypoint error (px) {'mean':>8}{'p95':>8}{'max':>8}")
+    for idx, stats in report['keypoint_error_px'].items():
+        print(f"  kp[{idx}]{'':<12}{stats['mean']:>8}{stats['p95']:>8}{stats['max']:>8}")
+
+    print(f"\nPosture score |delta|: mean {report['posture_score_delta']['mean_abs']}, "
+          f"max {report['posture_score_delta']['max_abs']}")
+    print(f"Top class agreement: {report['top_class_agreement'] * 100:.1f}%")
+
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Produce an INT8 copy of the pose model for CPU inference.
+
+Steps:
+  1. export models/best.pt to ONNX (reuses models/best.onnx if present)
+  2. statically quantize it with ONNX Runtime, calibrating activations on a
+     folder of representative clinic photos (50-200 images is usually enough)
+  3. write models/best-int8.onnx (loadable with INFERENCE_BACKEND=onnx-int8)
+
+Usage:
+    python scripts/quantize_model.py path/to/calibration_images --limit 100
+
+Then compare against the fp32 model before switching:
+    python scripts/quantization_report.py path/to/validation_images
+"""
+import argparse
+import glob
+import os
+import sys
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from api.services.backends import OnnxBackend, OnnxInt8Backend
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+
+def letterbox(img, size):
+    """Resize keeping aspect ratio and pad to size x size, as Ultralytics does before inference."""
+    h, w = img.shape[:2]
+    scale = min(size / h, size / w)
+    new_w, new_h = int(round(w * scale)), int(round(h * scale))
+    resized = cv2.resize(img, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+
+    canvas = np.full((size, size, 3), 114, dtype=np.uint8)
+    top = (size - new_h) // 2
+    left = (size - new_w) // 2
+    canvas[top:top + new_h, left:left + new_w] = resized
+    return canvas
+
+
+def preprocess(img, size):
+    """BGR uint8 image -> 1x3xHxW float32 RGB tensor in [0, 1]."""
+    boxed = letterbox(img, size)
+    rgb = cv2.cvtColor(boxed, cv2.COLOR_BGR2RGB)
+    return np.ascontiguousarray(rgb.transpose(2, 0, 1)[None], dtype=np.float32) / 255.0
+
+
+class FolderCalibrationReader:
+    """Feeds calibration images one at a time to ONNX Runtime's quantizer."""
+
+    def __init__(self, folder, input_name, size, limit=None):
+        paths = sorted(
+            p for p in glob.glob(os.path.join(folder, '**', '*'), recursive=True)
+            if p.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        if limit:
+            paths = paths[:limit]
+        if not paths:
+            raise ValueError(f"No calibration images found in {folder}")
+
+        self.paths = paths
+        self.input_name = input_name
+        self.size = size
+        self._iter = iter(self.paths)
+
+    def get_next(self):
+        for path in self._iter:
+            img = cv2.imread(path)
+            if img is not None:
+                return {self.input_name: preprocess(img, self.size)}
+        return None
+
+    def rewind(self):
+        self._iter = iter(self.paths)
+
+
+def copy_metadata(src_path, dst_path):
+    """Carry the Ultralytics metadata (class names, kpt_shape, imgsz) over to the quantized model."""
+    import onnx
+
+    src = onnx.load(src_path)
+    dst = onnx.load(dst_path)
+    existing = {p.key for p in dst.metadata_props}
+    for prop in src.metadata_props:
+        if prop.key not in existing:
+            dst.metadata_props.append(prop)
+    onnx.save(dst, dst_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Quantize the pose model to INT8 with ONNX Runtime")
+    parser.add_argument("calibration_dir", help="Folder with representative images")
+    parser.add_argument("--model", default=os.getenv("MODEL_PATH", "models/best.pt"))
+    parser.add_argument("--output", default=None, help="Output path (default: <model>-int8.onnx)")
+    parser.add_argument("--limit", type=int, default=200, help="Max calibration images")
+    parser.add_argument("--per-tensor", action="store_true", help="Per-tensor instead of per-channel weights")
+    args = parser.parse_args()
+
+    from onnxruntime import InferenceSession
+    from onnxruntime.quantization import CalibrationMethod, QuantFormat, QuantType, quantize_static
+
+    fp32_backend = OnnxBackend(args.model)
+    fp32_path = fp32_backend.exported_path()
+    if not os.path.exists(fp32_path):
+        print(f"Exporting {args.model} to ONNX...")
+        fp32_path = fp32_backend.export()
+
+    output_path = args.output or OnnxInt8Backend(args.model).exported_path()
+
+    session = InferenceSession(fp32_path, providers=["CPUExecutionProvider"])
+    input_name = session.get_inputs()[0].name
+    reader = FolderCalibrationReader(args.calibration_dir, input_name, fp32_backend.imgsz, args.limit)
+    print(f"Calibrating on {len(reader.paths)} images at {fp32_backend.imgsz}px...")
+
+    quantize_static(
+        fp32_path,
+        output_path,
+        reader,
+        quant_format=QuantFormat.QDQ,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        per_channel=not args.per_tensor,
+        calibrate_method=CalibrationMethod.MinMax,
+    )
+    copy_metadata(fp32_path, output_path)
+
+    fp32_mb = os.path.getsize(fp32_path) / 1e6
+    int8_mb = os.path.getsize(output_path) / 1e6
+    print(f"Saved INT8 model to {output_path} ({int8_mb:.1f} MB, fp32 was {fp32_mb:.1f} MB)")
+    print("Next: python scripts/quantization_report.py <validation_images_dir>")
+
+
+if __name__ == "__main__":
+    main()
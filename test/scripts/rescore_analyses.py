@@ -0,0 +1,90 @@
+"""
+Re-score stored analyses from their saved keypoints with BatchPoseAnalyzer.
+
+Reads analyses that have an image size stored (rows saved before image sizes were
+recorded are skipped), loads their keypoints through DatabaseService.get_keypoints
+and reruns the geometry and scoring in chunks, without the model or the images.
+Use it after a change to the scoring rules to see, and with --write apply, the
+effect on existing results.
+
+Only the calibration and the shoulder / hip / spinal / head sections and
+posture_score are rewritten. Postural angles come from the keypoints alone and
+are not re-computed (BatchPoseAnalyzer does not produce them); detections and
+the skeleton image are left as stored.
+
+Usage:
+    python scripts/rescore_analyses.py                # report score changes only
+    python scripts/rescore_analyses.py --write        # store the new scores
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from api.services.database import DatabaseService
+from core import BatchPoseAnalyzer, KeypointBatch
+
+
+def load_chunk(db: DatabaseService, offset: int, size: int):
+    """(analysis, keypoints) pairs for one page of re-scorable analyses, and the page length."""
+    analyses = db.list_rescorable_analyses(limit=size, offset=offset)
+    pairs = []
+    for analysis in analyses:
+        keypoints = db.get_keypoints(analysis['id'])
+        if keypoints and analysis.get('actual_height_mm'):
+            pairs.append((analysis, keypoints))
+    return pairs, len(analyses)
+
+
+def rescore(engine: BatchPoseAnalyzer, pairs):
+    """New per-analysis dicts, in the layout PostureAnalyzerService stores."""
+    batch = KeypointBatch.from_dicts([keypoints for _, keypoints in pairs])
+    return engine.analyze(
+        batch,
+        [a['image_height'] for a, _ in pairs],
+        [a['image_width'] for a, _ in pairs],
+        [a['actual_height_mm'] / 10 for a, _ in pairs]
+    ).to_dicts()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-score stored analyses from their keypoints")
+    parser.add_argument("--chunk", type=int, default=500, help="Analyses per vectorized batch")
+    parser.add_argument("--tolerance", type=float, default=0.01,
+                        help="Total score change up to which an analysis counts as unchanged")
+    parser.add_argument("--write", action="store_true", help="Store the new scores (default: report only)")
+    args = parser.parse_args()
+
+    db = DatabaseService()
+    engine = BatchPoseAnalyzer()
+    rescored = changed = skipped = 0
+    offset = 0
+    while True:
+        pairs, page_len = load_chunk(db, offset, args.chunk)
+        if page_len == 0:
+            break
+        offset += page_len
+        skipped += page_len - len(pairs)
+        if not pairs:
+            continue
+
+        for (analysis, _), result in zip(pairs, rescore(engine, pairs)):
+            rescored += 1
+            before = (analysis.get('posture_score') or {}).get('total_score')
+            after = result['posture_score']['total_score']
+            if before is None or abs(after - before) > args.tolerance:
+                changed += 1
+                print(f"  {analysis['id']}  {before} -> {after}  ({result['posture_score']['assessment']})")
+            if args.write:
+                db.update_analysis_scores(analysis['id'], result)
+
+    print(f"\nRe-scored {rescored} analyses: {changed} changed, "
+          f"{skipped} skipped (no keypoints or height stored)")
+    if args.write:
+        print("New scores written.")
+    elif changed:
+        print("Report only; pass --write to store the new scores.")
+
+
+if __name__ == "__main__":
+    main()
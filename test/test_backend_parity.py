@@ -0,0 +1,73 @@
+import glob
+import os
+import sys
+
+import cv2
+import pytest
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+
+from api.services.backends import create_backend
+from core import AdvancedPoseAnalyzer
+from core.keypoints import keypoints_as_dicts
+
+MODEL_PATH = os.getenv("MODEL_PATH", "models/best.pt")
+IMAGES_DIR = os.getenv("PARITY_IMAGES_DIR", os.path.join(os.path.dirname(__file__), "results"))
+BACKENDS = [b for b in os.getenv("PARITY_BACKENDS", "onnx").split(",") if b]
+
+# Max allowed keypoint drift between runtimes, in pixels
+KEYPOINT_TOLERANCE_PX = float(os.getenv("PARITY_TOLERANCE_PX", 3.0))
+
+
+def _parity_images():
+    paths = sorted(glob.glob(os.path.join(IMAGES_DIR, "**", "*.png"), recursive=True) +
+                   glob.glob(os.path.join(IMAGES_DIR, "**", "*.jpg"), recursive=True))
+    return [p for p in paths if not os.path.basename(p).startswith("graph_")][:10]
+
+
+def _run(model, img):
+    results = model(img, conf=0.25, verbose=False, device='cpu')
+    keypoints = keypoints_as_dicts(AdvancedPoseAnalyzer().extract_keypoints_from_results(results))
+    classes = [model.names[int(c)] for r in results for c in r.boxes.cls.cpu().numpy()]
+    return keypoints, classes
+
+
+@pytest.mark.parametrize("backend_name", BACKENDS)
+def test_backend_keypoint_parity(backend_name):
+    if not os.path.exists(MODEL_PATH):
+        pytest.skip(f"No model weights at {MODEL_PATH}")
+    pytest.importorskip("ultralytics")
+
+    images = _parity_images()
+    if not images:
+        pytest.skip(f"No parity images under {IMAGES_DIR}")
+
+    reference = create_backend("torch", MODEL_PATH).load()
+    candidate = create_backend(backend_name, MODEL_PATH).load()
+
+    compared = 0
+    for path in images:
+        img = cv2.imread(path)
+        ref_kp, ref_classes = _run(reference, img)
+        cand_kp, cand_classes = _run(candidate, img)
+
+        assert cand_classes[:1] == ref_classes[:1], f"{path}: top class differs"
+        assert set(cand_kp) == set(ref_kp), f"{path}: keypoint names differ"
+
+        for name, ref_pt in ref_kp.items():
+            if not isinstance(ref_pt, dict) or 'x' not in ref_pt:
+                continue
+            cand_pt = cand_kp[name]
+            drift = max(abs(cand_pt['x'] - ref_pt['x']), abs(cand_pt['y'] - ref_pt['y']))
+            assert drift <= KEYPOINT_TOLERANCE_PX, \
+                f"{path}: {name} drifted {drift:.2f}px on {backend_name}"
+            compared += 1
+
+    assert compared > 0, "No keypoints were compared"
+
+
+if __name__ == "__main__":
+    for name in BACKENDS:
+        test_backend_keypoint_parity(name)
+    print("Backend parity OK")
@@ -0,0 +1,119 @@
+import contextlib
+import json
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+
+from core import AdvancedPoseAnalyzer, BatchPoseAnalyzer, KeypointBatch
+from core.batch_engine import KEYPOINT_NAMES
+from core.keypoints import pack_keypoints, unpack_keypoints
+from core.synthetic import reference_geometry, synthetic_result
+
+
+def _quiet():
+    return contextlib.redirect_stdout(open(os.devnull, 'w'))
+
+
+def _scalar(keypoints, image_h, image_w, height_cm):
+    return reference_geometry(AdvancedPoseAnalyzer(), keypoints, image_h, image_w, height_cm)
+
+
+def _model_keypoints(rng, count):
+    """Keypoint dicts from the real extraction path on synthetic detections."""
+    items = []
+    with _quiet():
+        for i in range(count):
+            raw = synthetic_result(rng, lateral=i % 2 == 1)
+            analyzer = AdvancedPoseAnalyzer()
+            if i % 2 == 1:
+                keypoints = {}
+                analyzer._add_lateral_points([raw], keypoints)
+            else:
+                keypoints = analyzer.extract_keypoints_from_results([raw])
+            h, w = raw.orig_shape
+            items.append((_as_stored(keypoints), h, w))
+    return items
+
+
+def _as_stored(keypoints):
+    """Keypoints as they come back from the database (plain dicts)."""
+    return unpack_keypoints(json.loads(json.dumps(pack_keypoints(keypoints))))
+
+
+def _random_keypoints(rng, count):
+    """Arbitrary dicts: any keypoint may be missing or invisible, coordinates anywhere."""
+    items = []
+    for _ in range(count):
+        h, w = int(rng.integers(300, 3000)), int(rng.integers(300, 3000))
+        keypoints = {}
+        for name in KEYPOINT_NAMES:
+            if rng.random() < 0.15:
+                continue
+            keypoints[name] = {
+                'x': float(rng.uniform(0, w)), 'y': float(rng.uniform(0, h)),
+                'confidence': float(rng.uniform(0, 1)), 'visible': bool(rng.random() < 0.8)
+            }
+        items.append((keypoints, h, w))
+    return items
+
+
+def _assert_parity(items, heights_cm):
+    batch = KeypointBatch.from_dicts([kp for kp, _, _ in items])
+    result = BatchPoseAnalyzer().analyze(batch, [h for _, h, _ in items], [w for _, _, w in items], heights_cm)
+    vectorized = result.to_dicts()
+
+    assert len(vectorized) == len(items)
+    for i, (keypoints, h, w) in enumerate(items):
+        expected = _scalar(keypoints, h, w, heights_cm[i])
+        assert list(vectorized[i]) == list(expected)
+        for section, values in expected.items():
+            assert vectorized[i][section] == values, f"image {i}: {section} differs"
+            if isinstance(values, dict):
+                assert list(vectorized[i][section]) == list(values), f"image {i}: {section} keys differ"
+
+
+def test_parity_on_extracted_keypoints():
+    rng = np.random.default_rng(0)
+    items = _model_keypoints(rng, 200)
+    _assert_parity(items, rng.uniform(140, 200, len(items)).tolist())
+
+
+def test_parity_on_random_keypoints():
+    rng = np.random.default_rng(1)
+    items = _random_keypoints(rng, 500)
+    _assert_parity(items, rng.uniform(140, 200, len(items)).tolist())
+
+
+@pytest.mark.parametrize("height_cm", [0, 170])
+def test_parity_edge_cases(height_cm):
+    point = lambda x, y, visible=True: {'x': x, 'y': y, 'confidence': 0.9, 'visible': visible}
+    items = [
+        ({}, 1000, 800),
+        # Vertical shoulders (dx == 0), level hips, tiny person (height estimate rejected)
+        ({'left_shoulder': point(400, 100), 'right_shoulder': point(400, 140),
+          'left_hip': point(380, 160), 'right_hip': point(420, 160)}, 1000, 800),
+        # Only invisible anchors: posture center falls back to the other visible points
+        ({'left_shoulder': point(100, 100, False), 'right_knee': point(300, 700),
+          'left_ear': point(310, 50), 'right_ear': point(310.05, 60)}, 1200, 900),
+        # Straight lateral leg and a knee on the pelvis-ankle line
+        ({'lateral_pelvic_center': point(500, 500), 'lateral_knee': point(500, 700),
+          'lateral_ankle': point(500, 900), 'lateral_shoulder': point(500, 200)}, 1000, 1000),
+    ]
+    _assert_parity(items, [height_cm] * len(items))
+
+
+def test_keypoint_batch_layout():
+    batch = KeypointBatch.from_dicts([
+        {'nose': {'x': 1.0, 'y': 2.0, 'confidence': 0.5, 'visible': False}},
+        {},
+    ])
+    assert batch.points.shape == (2, len(KEYPOINT_NAMES), 3)
+    k = KEYPOINT_NAMES.index('nose')
+    assert batch.points[0, k].tolist() == [1.0, 2.0, 0.5]
+    assert not batch.visible[0, k]
+    assert np.isnan(batch.points[1]).all()